@@ -3,6 +3,9 @@ import logging
 import click
 
 from server.server import A2AServer
+from server.sqlite_task_store import SqliteTaskStore
+from server.scheduler import PriorityScheduler
+from server.push_notifications import PushNotificationDispatcher
 from models.agent import AgentCard, AgentCapabilities, AgentSkill
 from agents.ai_educator.task_manager import AIEducatorTaskManager
 from agents.ai_educator.agent import SimpleAIExplainer
@@ -14,7 +17,19 @@ logger = logging.getLogger(__name__)
 @click.option("--host", default="localhost", help="Host to bind AI Educator server to")
 @click.option("--port", default=10001, help="Port for AI Educator server")
 @click.option("--aixpert-url", default="http://localhost:10000", help="URL of AIXpert agent")
-def main(host: str, port: int, aixpert_url: str):
+@click.option("--task-db", default=None, help="SQLite file to persist tasks in (default: in memory)")
+@click.option("--concept-cache-size", default=10000, help="Max explanations in the concept cache (0 disables it)")
+@click.option("--max-inflight", default=64, help="Max tasks this agent runs at once (0 disables admission control)")
+@click.option("--queue-size", default=256, help="Max tasks waiting per priority before new ones are rejected as busy")
+@click.option("--batch-concurrency", default=16, help="Max calls of one JSON-RPC batch request running at once")
+@click.option("--processes", default=1, help="Worker processes sharing the port (more than 1 requires --task-db)")
+@click.option("--session-db", default=None, help="ADK session database (SQLAlchemy URL or SQLite path) shared by all processes")
+@click.option("--debug", is_flag=True, help="Print every incoming JSON-RPC payload")
+@click.option("--push-allow-host", "push_allow_hosts", multiple=True, help="Webhook host accepted even if it is not public, e.g. localhost (repeatable)")
+@click.option("--async-workers", default=0, help="Background workers for tasks sent with metadata {\"async\": true} (0 disables async mode)")
+def main(host: str, port: int, aixpert_url: str, task_db: str, concept_cache_size: int,
+         async_workers: int, max_inflight: int, queue_size: int, batch_concurrency: int,
+         processes: int, session_db: str, debug: bool, push_allow_hosts: tuple):
     """
     Launches the Simple AI Explainer A2A server.
     
@@ -28,7 +43,7 @@ def main(host: str, port: int, aixpert_url: str):
     print(f"Connected to AIXpert at {aixpert_url}")
     print("📚 Specializes in: Concept → Example → Conclusion structure with analogies\n")
 
-    capabilities = AgentCapabilities(streaming=False)
+    capabilities = AgentCapabilities(streaming=True, pushNotifications=True)
 
     skill = AgentSkill(
         id="simple_ai_teaching",
@@ -62,16 +77,29 @@ def main(host: str, port: int, aixpert_url: str):
         skills=[skill]
     )
 
-    simple_ai_explainer = SimpleAIExplainer(aixpert_url=aixpert_url)
-    task_manager = AIEducatorTaskManager(agent=simple_ai_explainer)
+    simple_ai_explainer = SimpleAIExplainer(
+        aixpert_url=aixpert_url,
+        concept_cache_size=concept_cache_size,
+        session_db=session_db
+    )
+    task_manager = AIEducatorTaskManager(
+        agent=simple_ai_explainer,
+        # Worker processes must not cache tasks: another process may change them
+        task_store=SqliteTaskStore(task_db, cache_size=0 if processes > 1 else 1024) if task_db else None,
+        async_workers=async_workers,
+        push_notifier=PushNotificationDispatcher(allowed_hosts=push_allow_hosts)
+    )
 
     server = A2AServer(
         host=host,
         port=port,
         agent_card=agent_card,
-        task_manager=task_manager
+        task_manager=task_manager,
+        scheduler=PriorityScheduler(max_inflight, queue_size) if max_inflight > 0 else None,
+        batch_concurrency=batch_concurrency,
+        debug=debug
     )
-    server.start()
+    server.start(workers=processes)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -2,18 +2,22 @@
 import logging
 import uuid
 from datetime import datetime
+from contextlib import aclosing
 from dotenv import load_dotenv
 
 load_dotenv()
 
 from google.adk.agents.llm_agent import LlmAgent
-from google.adk.sessions import InMemorySessionService
 from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
 from google.adk.artifacts import InMemoryArtifactService
 from google.adk.runners import Runner
 from google.genai import types
 
 from agents.host_agent.agent_connect import AgentConnector
+from utilities.concept_cache import ConceptCache
+from utilities.single_flight import SingleFlight
+from utilities.cache import normalize_query
+from utilities.sessions import build_session_service
 
 logger = logging.getLogger(__name__)
 
@@ -30,23 +34,39 @@ class SimpleAIExplainer:
 
     SUPPORTED_CONTENT_TYPES = ["text", "text/plain"]
 
-    def __init__(self, aixpert_url: str = "http://localhost:10000"):
+    def __init__(
+        self,
+        aixpert_url: str = "http://localhost:10000",
+        concept_cache_size: int = 10_000,
+        session_db: str | None = None,
+    ):
         """
         Initialize the Simple AI Explainer.
         
         Args:
             aixpert_url: URL of the AIXpert agent for direct consultation
+            concept_cache_size: Max explanations kept in the concept cache (0 disables it)
+            session_db: Shared ADK session database (URL or SQLite path); None keeps
+                sessions in this process's memory
         """
         self._agent = self._build_agent()
         self._user_id = "ai_educator_user"
+
+        # Reuses Concept → Example → Conclusion answers across differently worded questions
+        self.concept_cache = (
+            ConceptCache(capacity=concept_cache_size) if concept_cache_size > 0 else None
+        )
         
         self.aixpert_connector = AgentConnector("AIXpertAgent", aixpert_url)
+
+        # Identical concurrent consultations share one AIXpert call
+        self._aixpert_inflight = SingleFlight()
         
         self._runner = Runner(
             app_name=self._agent.name,
             agent=self._agent,
             artifact_service=InMemoryArtifactService(),
-            session_service=InMemorySessionService(),
+            session_service=build_session_service(session_db),
             memory_service=InMemoryMemoryService(),
         )
         
@@ -103,6 +123,9 @@ class SimpleAIExplainer:
     async def _consult_aixpert(self, question: str, session_id: str) -> str:
         """
         Directly consult AIXpert for technical information.
+
+        Concurrent consultations about the same (normalized) question share
+        a single AIXpert call.
         
         Args:
             question: Technical question to ask AIXpert
@@ -111,11 +134,18 @@ class SimpleAIExplainer:
         Returns:
             AIXpert's response or error message
         """
+        return await self._aixpert_inflight.do(
+            normalize_query(question),
+            lambda: self._ask_aixpert(question, session_id)
+        )
+
+    async def _ask_aixpert(self, question: str, session_id: str) -> str:
+        """Send one consultation to AIXpert."""
         try:
             logger.info(f"Consulting AIXpert: {question}")
             task = await self.aixpert_connector.send_task(question, session_id)
             
-            if task.history and len(task.history) > 1:
+            if task.history and task.history[-1].role == "agent":
                 response = task.history[-1].parts[0].text
                 logger.info(f"AIXpert consultation successful: {len(response)} chars")
                 return response
@@ -126,6 +156,16 @@ class SimpleAIExplainer:
             logger.error(f"Error consulting AIXpert: {e}")
             return f"I'm having trouble reaching my AI expert colleague at the moment: {str(e)}"
 
+    @staticmethod
+    def _is_structured(text: str) -> bool:
+        """True if the text follows the Concept → Example → Conclusion format."""
+        return "🧠 CONCEPT:" in text and "🌍 EXAMPLE:" in text and "✅ CONCLUSION:" in text
+
+    def _remember_explanation(self, query: str, explanation: str):
+        """Cache structured explanations so questions about the same concept can reuse them."""
+        if self.concept_cache is not None and self._is_structured(explanation):
+            self.concept_cache.set(query, explanation)
+
     async def invoke(self, query: str, session_id: str) -> str:
         """
         Process user query with intelligent learning assistance.
@@ -138,13 +178,20 @@ class SimpleAIExplainer:
         
         is_ai_question = any(keyword in query.lower() for keyword in ai_keywords)
         
+        if is_ai_question and self.concept_cache is not None:
+            cached = self.concept_cache.get(query)
+            if cached is not None:
+                logger.info("Concept cache hit, reusing a previous explanation")
+                return cached
+
         expert_knowledge = ""
         if is_ai_question:
             logger.info("Detected AI question, consulting AIXpert...")
             expert_knowledge = await self._consult_aixpert(query, session_id)
             
-            if "🧠 CONCEPT:" in expert_knowledge and "🌍 EXAMPLE:" in expert_knowledge and "✅ CONCLUSION:" in expert_knowledge:
+            if self._is_structured(expert_knowledge):
                 logger.info("AIXpert already provided structured response, using it directly")
+                self._remember_explanation(query, expert_knowledge)
                 return expert_knowledge
             
             enhanced_query = f"""The user asked: "{query}"
@@ -186,12 +233,14 @@ class SimpleAIExplainer:
         )
 
         last_event = None
-        async for event in self._runner.run_async(
+        # aclosing(): if this task is canceled, the ADK run is closed right away
+        async with aclosing(self._runner.run_async(
             user_id=self._user_id,
             session_id=session.id,
             new_message=content
-        ):
-            last_event = event
+        )) as events:
+            async for event in events:
+                last_event = event
 
         if not last_event or not last_event.content or not last_event.content.parts:
             logger.warning("No response from Simple AI Explainer")
@@ -199,4 +248,6 @@ class SimpleAIExplainer:
 
         response = "\n".join([p.text for p in last_event.content.parts if p.text])
         logger.info(f"Simple AI Explainer generated response: {len(response)} chars")
+        if is_ai_question:
+            self._remember_explanation(query, response)
         return response
\ No newline at end of file
@@ -2,8 +2,7 @@
 import logging
 
 from server.task_manager import InMemoryTaskManager
-from models.request import SendTaskRequest, SendTaskResponse
-from models.task import Message, TaskStatus, TaskState, TextPart
+from models.request import SendTaskRequest
 from agents.ai_educator.agent import SimpleAIExplainer
 
 logger = logging.getLogger(__name__)
@@ -20,32 +19,33 @@ class AIEducatorTaskManager(InMemoryTaskManager):
     - Using analogies to make complex concepts simple
     """
     
-    def __init__(self, agent: SimpleAIExplainer):
+    def __init__(self, agent: SimpleAIExplainer, **kwargs):
         """
         Initialize with Simple AI Explainer agent.
         
         Args:
             agent: The Simple AI Explainer instance
+            **kwargs: Task store limits forwarded to InMemoryTaskManager
+                (max_tasks, completed_ttl, max_bytes, lock_stripes)
         """
-        super().__init__()
+        super().__init__(**kwargs)
         self.agent = agent
 
     def _get_user_text(self, request: SendTaskRequest) -> str:
         """Extract user text from the request."""
         return request.params.message.parts[0].text
 
-    async def on_send_task(self, request: SendTaskRequest) -> SendTaskResponse:
+    async def process_task(self, request: SendTaskRequest) -> str:
         """
         Handle educational task with structured analogical explanation:
         
-        1. Store the incoming AI concept question
-        2. Process with Simple AI Explainer (may consult AIXpert)
-        3. Return structured Concept → Example → Conclusion response
+        1. Process the AI concept question with Simple AI Explainer (may consult AIXpert)
+        2. Return the structured Concept → Example → Conclusion response
+
+        Storing the task and the reply is done by InMemoryTaskManager.on_send_task().
         """
         logger.info(f"Simple AI Explainer received concept question: {request.params.id}")
 
-        task = await self.upsert_task(request.params)
-
         user_text = self._get_user_text(request)
         logger.info(f"Processing concept explanation request: '{user_text[:100]}...'")
 
@@ -63,13 +63,4 @@ class AIEducatorTaskManager(InMemoryTaskManager):
                 "Could you try asking your question again? I love breaking down complex AI topics into simple analogies! 🎓"
             )
 
-        reply_message = Message(
-            role="agent",
-            parts=[TextPart(text=analogical_response)]
-        )
-
-        async with self.lock:
-            task.status = TaskStatus(state=TaskState.COMPLETED)
-            task.history.append(reply_message)
-
-        return SendTaskResponse(id=request.id, result=task)
\ No newline at end of file
+        return analogical_response
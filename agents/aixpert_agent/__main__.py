@@ -1,5 +1,8 @@
 #agents.aixpert_agent.__main__.py
 from server.server import A2AServer
+from server.sqlite_task_store import SqliteTaskStore
+from server.scheduler import PriorityScheduler
+from server.push_notifications import PushNotificationDispatcher
 
 from models.agent import AgentCard, AgentCapabilities, AgentSkill
 
@@ -16,9 +19,22 @@ logger = logging.getLogger(__name__)
 @click.command()
 @click.option("--host", default="localhost", help="Host to bind the server to")
 @click.option("--port", default=10000, help="Port number for the server")
-def main(host, port):
+@click.option("--max-workers", default=16, help="Threads available for GEAI completions")
+@click.option("--max-concurrency", default=None, type=int, help="Max GEAI completions in flight (defaults to --max-workers)")
+@click.option("--task-db", default=None, help="SQLite file to persist tasks in (default: in memory)")
+@click.option("--cache-size", default=1024, help="Max answers kept in the answer cache (0 disables it)")
+@click.option("--cache-ttl", default=3600.0, help="Seconds a cached answer stays valid")
+@click.option("--max-inflight", default=64, help="Max tasks this agent runs at once (0 disables admission control)")
+@click.option("--queue-size", default=256, help="Max tasks waiting per priority before new ones are rejected as busy")
+@click.option("--batch-concurrency", default=16, help="Max calls of one JSON-RPC batch request running at once")
+@click.option("--processes", default=1, help="Worker processes sharing the port (more than 1 requires --task-db)")
+@click.option("--debug", is_flag=True, help="Print every incoming JSON-RPC payload")
+@click.option("--push-allow-host", "push_allow_hosts", multiple=True, help="Webhook host accepted even if it is not public, e.g. localhost (repeatable)")
+@click.option("--async-workers", default=0, help="Background workers for tasks sent with metadata {\"async\": true} (0 disables async mode)")
+def main(host, port, max_workers, max_concurrency, task_db, cache_size, cache_ttl, async_workers,
+         max_inflight, queue_size, batch_concurrency, processes, debug, push_allow_hosts):
 
-    capabilities = AgentCapabilities(streaming=False)
+    capabilities = AgentCapabilities(streaming=True, pushNotifications=True)
 
     skill = AgentSkill(
         id="ai_expert",
@@ -43,10 +59,24 @@ def main(host, port):
         host=host,
         port=port,
         agent_card=agent_card,
-        task_manager=AgentTaskManager(agent=AIXpertAgent())
+        task_manager=AgentTaskManager(
+            agent=AIXpertAgent(
+                max_workers=max_workers,
+                max_concurrency=max_concurrency,
+                cache_size=cache_size,
+                cache_ttl=cache_ttl
+            ),
+            # Worker processes must not cache tasks: another process may change them
+            task_store=SqliteTaskStore(task_db, cache_size=0 if processes > 1 else 1024) if task_db else None,
+            async_workers=async_workers,
+            push_notifier=PushNotificationDispatcher(allowed_hosts=push_allow_hosts)
+        ),
+        scheduler=PriorityScheduler(max_inflight, queue_size) if max_inflight > 0 else None,
+        batch_concurrency=batch_concurrency,
+        debug=debug
     )
 
-    server.start()
+    server.start(workers=processes)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,59 +1,218 @@
 #agents.aixpert_agent.agent.py
+import time
+import asyncio
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
+from pygeai.chat.clients import ChatClient
 from pygeai.chat.managers import ChatManager
 from pygeai.core.models import ChatMessageList, ChatMessage, LlmSettings
 
+from utilities.cache import TTLCache, normalize_query
+from utilities.single_flight import SingleFlight
+
 
 logger = logging.getLogger(__name__)
 
 class AIXpertAgent:
     SUPPORTED_CONTENT_TYPES = ["text", "text/plain"]
 
-    def __init__(self):
+    def __init__(self, max_workers: int = 16, max_concurrency: int | None = None, stream_buffer: int = 32,
+                 cache_size: int = 1024, cache_ttl: float | None = 3600.0):
         """
         👷 Initialize the AIXpertAgent:
-        - Creates the ChatManager for your existing AIXpert agent
+        - Creates the ChatManager (and a streaming ChatClient) for your existing AIXpert agent
         - Sets up LLM settings for consistent responses
+        - Creates a dedicated thread pool for the blocking pygeai calls
+        - Creates an exact-match answer cache for repeated questions
+        - Coalesces identical questions that arrive while one is in flight
+
+        Args:
+            max_workers: Size of the thread pool that runs GEAI completions
+            max_concurrency: Max completions in flight at once (defaults to max_workers);
+                extra requests wait in a queue without blocking the event loop
+            stream_buffer: Max streamed chunks read ahead of a slow consumer
+            cache_size: Max answers kept in the cache (0 disables caching)
+            cache_ttl: Seconds a cached answer stays valid
         """
         self.agent_name = "AIXpert"
         self.chat_manager = ChatManager()
+        self.chat_client = ChatClient()
+        self.stream_buffer = stream_buffer
         
         self.llm_settings = LlmSettings(
             temperature=0.2,
             max_tokens=10000
         )
+
+        # Answers keyed by normalized question + LLM settings (see _cache_key)
+        self.cache = TTLCache(max_entries=cache_size, ttl=cache_ttl) if cache_size > 0 else None
+
+        # Identical concurrent questions share one GEAI call
+        self.inflight = SingleFlight()
+
+        self.max_concurrency = max_concurrency or max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="aixpert-geai"
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        # Queue-wait metrics for the completion pool
+        self.metrics = {
+            "in_flight": 0,
+            "waiting": 0,
+            "completed": 0,
+            "total_wait_seconds": 0.0,
+            "max_wait_seconds": 0.0,
+        }
         
-        logger.info(f"Initialized {self.agent_name} agent with pygeai ChatManager")
+        logger.info(
+            f"Initialized {self.agent_name} agent with pygeai ChatManager "
+            f"({max_workers} workers, concurrency limit {self.max_concurrency})"
+        )
+
+    async def _acquire_slot(self):
+        """Wait for a free concurrency slot, recording how long that wait took."""
+        queued_at = time.perf_counter()
+        self.metrics["waiting"] += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.metrics["waiting"] -= 1
+
+        wait = time.perf_counter() - queued_at
+        self.metrics["total_wait_seconds"] += wait
+        self.metrics["max_wait_seconds"] = max(self.metrics["max_wait_seconds"], wait)
+        self.metrics["in_flight"] += 1
+
+    def _release_slot(self, _future=None):
+        """Give a concurrency slot back (also used as a future's done-callback)."""
+        self.metrics["in_flight"] -= 1
+        self.metrics["completed"] += 1
+        self._semaphore.release()
+
+    async def _start_blocking(self, fn, *args) -> asyncio.Future:
+        """
+        Start a blocking pygeai call on the dedicated thread pool once a
+        concurrency slot is free. The slot is released when the call has
+        actually finished: a pool thread can't be interrupted, so it stays
+        busy even if nobody awaits the result anymore.
+        """
+        await self._acquire_slot()
+        try:
+            future = asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        except BaseException:
+            self._release_slot()
+            raise
+        future.add_done_callback(self._release_slot)
+        return future
+
+    async def _run_blocking(self, fn, *args):
+        """Run a blocking pygeai call on the thread pool and return its result."""
+        future = await self._start_blocking(fn, *args)
+        # shield(): if we are cancelled, the call still runs (and holds its slot) until it returns
+        return await asyncio.shield(future)
+
+    def _chat_completion(self, query: str):
+        """Blocking GEAI completion; only ever called from the thread pool."""
+        messages = ChatMessageList(messages=[
+            ChatMessage(role="user", content=query)
+        ])
+
+        return self.chat_manager.chat_completion(
+            model=f"saia:agent:{self.agent_name}",
+            messages=messages,
+            llm_settings=self.llm_settings
+        )
+
+    def _stream_completion(self, query: str):
+        """Blocking GEAI streaming completion; yields text deltas as they arrive."""
+        return self.chat_client.chat_completion(
+            model=f"saia:agent:{self.agent_name}",
+            messages=[{"role": "user", "content": query}],
+            stream=True,
+            temperature=self.llm_settings.temperature,
+            max_tokens=self.llm_settings.max_tokens
+        )
+
+    def _produce_chunks(self, query: str, loop, queue: asyncio.Queue,
+                        credits: threading.Semaphore, stop: threading.Event, done):
+        """
+        Runs on the thread pool: reads the GEAI stream and hands each delta to
+        the event loop. A chunk is only read once the consumer has freed a
+        credit (back-pressure), and reading stops as soon as `stop` is set.
+        """
+        chunks = None
+        try:
+            chunks = self._stream_completion(query)
+            for chunk in chunks:
+                if not chunk:
+                    continue
+                while not credits.acquire(timeout=0.1):
+                    if stop.is_set():
+                        return
+                if stop.is_set():
+                    return
+                loop.call_soon_threadsafe(queue.put_nowait, chunk)
+        except Exception as e:
+            if not stop.is_set():
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+        finally:
+            if chunks is not None and hasattr(chunks, "close"):
+                chunks.close()
+            if not stop.is_set():
+                loop.call_soon_threadsafe(queue.put_nowait, done)
+
+    def _cache_key(self, query: str) -> tuple:
+        """Cache key: normalized question plus everything that changes the answer."""
+        return (
+            normalize_query(query),
+            self.agent_name,
+            self.llm_settings.temperature,
+            self.llm_settings.max_tokens,
+        )
+
+    def _cached_answer(self, query: str, use_cache: bool) -> str | None:
+        if self.cache is None or not use_cache:
+            return None
+        return self.cache.get(self._cache_key(query))
+
+    def _remember_answer(self, query: str, answer: str):
+        if self.cache is not None and answer:
+            self.cache.set(self._cache_key(query), answer)
 
-    async def invoke(self, query: str, session_id: str) -> str:
+    async def invoke(self, query: str, session_id: str, use_cache: bool = True) -> str:
         """
         📥 Handle a user query and return a response string using your existing AIXpert agent.
 
         Args:
             query (str): What the user asked (e.g., "What is LoRA in fine tuning?")
             session_id (str): Helps group messages into a session (for future session management)
+            use_cache (bool): Set to False to skip the answer cache and always ask GEAI
 
         Returns:
             str: Agent's reply (expert answer on AI topic from your AIXpert agent)
         """
-        
+        cached = self._cached_answer(query, use_cache)
+        if cached is not None:
+            logger.info(f"Answer cache hit for {self.agent_name}: {query}")
+            return cached
+
+        return await self.inflight.do(self._cache_key(query), lambda: self._answer(query))
+
+    async def _answer(self, query: str) -> str:
+        """Ask GEAI for an answer (shared by all concurrent identical questions)."""
         try:
             logger.info(f"Processing query with {self.agent_name}: {query}")
-            
-            messages = ChatMessageList(messages=[
-                ChatMessage(role="user", content=query)
-            ])
-            
-            response = self.chat_manager.chat_completion(
-                model=f"saia:agent:{self.agent_name}",
-                messages=messages,
-                llm_settings=self.llm_settings
-            )
+
+            response = await self._run_blocking(self._chat_completion, query)
             
             if hasattr(response, 'choices') and response.choices:
                 answer = response.choices[0].message.content
                 logger.info(f"Successfully received response from {self.agent_name}")
+                self._remember_answer(query, answer)
                 return answer
             else:
                 logger.error(f"Error in {self.agent_name} response: {response}")
@@ -64,23 +223,68 @@ class AIXpertAgent:
             return f"I apologize, but I encountered an error: {str(e)}. Please try again."
 
 
-    async def stream(self, query: str, session_id: str):
+    async def stream(self, query: str, session_id: str, use_cache: bool = True):
         """
-        🌀 Simulates a "streaming" agent that returns AI expert responses.
-        This uses your existing AIXpert agent and yields the response.
+        🌀 Streams the AIXpert answer token by token from the GEAI backend.
+
+        Partial text is yielded as soon as the backend produces it. At most
+        `stream_buffer` chunks are read ahead of the consumer, and if the
+        consumer stops iterating (e.g., the client disconnects) the backend
+        stream is abandoned; its concurrency slot is released once the
+        producer thread has returned. Cached answers
+        are returned at once as a single final chunk.
 
         Yields:
-            dict: Response payload with the AI expert answer
+            dict: {"is_task_complete": False, "content": <delta>} for each partial chunk,
+                  then {"is_task_complete": True, "content": <full answer>}
         """
+        cached = self._cached_answer(query, use_cache)
+        if cached is not None:
+            logger.info(f"Answer cache hit for {self.agent_name}: {query}")
+            yield {
+                "is_task_complete": True,
+                "content": cached
+            }
+            return
+
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        credits = threading.Semaphore(self.stream_buffer)
+        stop = threading.Event()
+        done = object()
+        parts: list[str] = []
+
         try:
-            response_text = await self.invoke(query, session_id)
-            
+            await self._start_blocking(
+                self._produce_chunks, query, loop, queue, credits, stop, done
+            )
+            logger.info(f"Streaming query with {self.agent_name}: {query}")
+
+            while True:
+                item = await queue.get()
+                if item is done:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                credits.release()
+                parts.append(item)
+                yield {
+                    "is_task_complete": False,
+                    "content": item
+                }
+
+            answer = "".join(parts)
+            self._remember_answer(query, answer)
             yield {
                 "is_task_complete": True,
-                "content": response_text
+                "content": answer
             }
         except Exception as e:
+            logger.error(f"Exception in {self.agent_name} stream: {str(e)}")
             yield {
                 "is_task_complete": True,
                 "content": f"Error processing your AI question: {str(e)}"
-            }
\ No newline at end of file
+            }
+        finally:
+            # Consumer finished or went away: tell the producer thread to stop reading
+            stop.set()
@@ -1,12 +1,19 @@
 #agents.aixpert_agent.task_manager.py
+import asyncio
 import logging
+from typing import AsyncIterable
 
 from server.task_manager import InMemoryTaskManager
+from server.task_store import TERMINAL_STATES
+from server.push_notifications import InvalidWebhookError
 
 from agents.aixpert_agent.agent import AIXpertAgent
 
-from models.request import SendTaskRequest, SendTaskResponse
-from models.task import Message, Task, TextPart, TaskStatus, TaskState
+from models.request import SendTaskRequest
+from models.request import SendTaskStreamingRequest, SendTaskStreamingResponse
+from models.task import Message, TextPart, TaskStatus, TaskState
+from models.task import Artifact, TaskStatusUpdateEvent, TaskArtifactUpdateEvent
+from models.json_rpc import InvalidParamsError
 
 
 logger = logging.getLogger(__name__)
@@ -17,12 +24,13 @@ class AgentTaskManager(InMemoryTaskManager):
     This class connects your existing AIXpert agent (using pygeai) to the task system.
 
     - It "inherits" all the logic from InMemoryTaskManager
-    - It overrides the part where we handle a new task (on_send_task)
+    - It implements the part where a new task is answered (process_task)
+    - It relays the agent's stream() chunks for tasks/sendSubscribe
     - It uses your existing AIXpert agent to generate expert AI responses
     """
 
-    def __init__(self, agent: AIXpertAgent):
-        super().__init__()
+    def __init__(self, agent: AIXpertAgent, **kwargs):
+        super().__init__(**kwargs)     # kwargs: task store limits (max_tasks, completed_ttl, ...)
         self.agent = agent
 
     def _get_user_query(self, request: SendTaskRequest) -> str:
@@ -39,33 +47,143 @@ class AgentTaskManager(InMemoryTaskManager):
         """
         return request.params.message.parts[0].text
 
-    async def on_send_task(self, request: SendTaskRequest) -> SendTaskResponse:
+    def _use_cache(self, request: SendTaskRequest | SendTaskStreamingRequest) -> bool:
         """
-        This is the heart of the task manager.
-
-        It does the following:
-        1. Save the task into memory (or update it)
-        2. Ask the AIXpert agent for an expert AI response
-        3. Format that reply as a message
-        4. Save the agent's reply into the task history
-        5. Return the updated task to the caller
+        Callers can skip the answer cache by sending
+        `"metadata": {"bypassCache": true}` with the task.
         """
+        metadata = request.params.metadata or {}
+        return not metadata.get("bypassCache", False)
 
-        logger.info(f"Processing new AI query: {request.params.id}")
+    async def process_task(self, request: SendTaskRequest) -> str:
+        """
+        This is the heart of the task manager: ask the AIXpert agent for an
+        expert AI response to the user's query.
 
-        task = await self.upsert_task(request.params)
+        InMemoryTaskManager.on_send_task() saves the task, stores the reply
+        in its history and returns it to the caller (or, in async mode, runs
+        this on a background worker).
+        """
 
-        query = self._get_user_query(request)
+        logger.info(f"Processing new AI query: {request.params.id}")
 
-        result_text = await self.agent.invoke(query, request.params.sessionId)
+        query = self._get_user_query(request)
 
-        agent_message = Message(
-            role="agent",
-            parts=[TextPart(text=result_text)]
+        return await self.agent.invoke(
+            query, request.params.sessionId, use_cache=self._use_cache(request)
         )
 
-        async with self.lock:
-            task.status = TaskStatus(state=TaskState.COMPLETED)
-            task.history.append(agent_message)
+    async def on_send_task_subscribe(
+        self, request: SendTaskStreamingRequest
+    ) -> AsyncIterable[SendTaskStreamingResponse]:
+        """
+        Streaming version of on_send_task.
+
+        1. Save the task and report it as "working"
+        2. Relay every partial chunk from the agent as an artifact update
+        3. Save the full reply and send the final "completed" status event
 
-        return SendTaskResponse(id=request.id, result=task)
\ No newline at end of file
+        The agent's stream is read by a separate asyncio task registered for
+        the task ID, so `tasks/cancel` can stop it; the stream then ends with
+        a final "canceled" status event. If the agent fails, the task is
+        marked "failed" (and a final "failed" event is sent); if the client
+        disconnects mid-stream, the agent is stopped and the task canceled.
+        """
+
+        logger.info(f"Streaming new AI query: {request.params.id}")
+
+        try:
+            task = await self.upsert_task(request.params)
+        except InvalidWebhookError as e:
+            yield SendTaskStreamingResponse(id=request.id, error=InvalidParamsError(message=str(e)))
+            return
+
+        task = await self.update_task(task.id, TaskState.WORKING)
+
+        yield SendTaskStreamingResponse(
+            id=request.id,
+            result=TaskStatusUpdateEvent(id=task.id, status=task.status)
+        )
+
+        query = self._get_user_query(request)
+        chunks: asyncio.Queue[dict | None] = asyncio.Queue()
+
+        async def relay():
+            try:
+                async for chunk in self.agent.stream(
+                    query, request.params.sessionId, use_cache=self._use_cache(request)
+                ):
+                    chunks.put_nowait(chunk)
+            finally:
+                chunks.put_nowait(None)    # End of stream: finished, failed or canceled
+
+        runner = self._start_runner(task.id, relay())
+        finished = False                   # The task's final state has been recorded
+        try:
+            while (chunk := await chunks.get()) is not None:
+                if not chunk["is_task_complete"]:
+                    yield SendTaskStreamingResponse(
+                        id=request.id,
+                        result=TaskArtifactUpdateEvent(
+                            id=task.id,
+                            artifact=Artifact(
+                                parts=[TextPart(text=chunk["content"])],
+                                append=True
+                            )
+                        )
+                    )
+                    continue
+
+                agent_message = Message(
+                    role="agent",
+                    parts=[TextPart(text=chunk["content"])]
+                )
+
+                # Stays "canceled" if tasks/cancel won the race against the last chunk
+                task = await self.complete_task(task.id, agent_message)
+                finished = True
+
+                yield SendTaskStreamingResponse(
+                    id=request.id,
+                    result=TaskStatusUpdateEvent(
+                        id=task.id,
+                        status=TaskStatus(state=task.status.state, message=agent_message),
+                        final=True
+                    )
+                )
+
+            await asyncio.wait([runner])
+            if finished:
+                return
+            if runner.cancelled():
+                # Stopped by tasks/cancel
+                task = await self.update_task(task.id, TaskState.CANCELED)
+            else:
+                runner.result()            # Re-raise the agent's error, if any
+                logger.warning(f"Agent stream for task {task.id} ended without a final answer")
+                task = await self.update_task(task.id, TaskState.FAILED)
+            finished = True
+            yield SendTaskStreamingResponse(
+                id=request.id,
+                result=TaskStatusUpdateEvent(id=task.id, status=task.status, final=True)
+            )
+        except Exception as e:
+            logger.error(f"Streaming task {task.id} failed: {e}")
+            task = await self.update_task(task.id, TaskState.FAILED)
+            finished = True
+            yield SendTaskStreamingResponse(
+                id=request.id,
+                result=TaskStatusUpdateEvent(id=task.id, status=task.status, final=True)
+            )
+        finally:
+            self._forget_runner(task.id, runner)
+            if not finished:
+                # The client went away mid-stream: stop the agent, nobody reads its answer
+                runner.cancel()
+                await asyncio.shield(self._cancel_unfinished(task.id))
+
+    async def _cancel_unfinished(self, task_id: str):
+        """Mark a task "canceled" unless it already reached a final state."""
+        task = await self.tasks.get(task_id)
+        if task is not None and task.status.state not in TERMINAL_STATES:
+            await self.update_task(task_id, TaskState.CANCELED)
@@ -1,44 +1,202 @@
 #agents.host_agent.agent_connect.py
 import uuid
+import random
+import asyncio
 import logging
 
+import httpx
+
 from client.client import A2AClient
 from models.task import Task
+from utilities.discovery import card_url
+from utilities.hash_ring import HashRing
 
 logger = logging.getLogger(__name__)
 
+
+class Replica:
+    """
+    One endpoint serving an agent, with its own pooled A2AClient.
+
+    Attributes:
+        url (str): The replica's A2A endpoint.
+        client (A2AClient): Pooled HTTP client for this replica.
+        outstanding (int): Requests to this replica currently in flight.
+        healthy (bool): False while the replica is ejected from balancing.
+    """
+
+    def __init__(self, url: str, **client_options):
+        self.url = url
+        self.client = A2AClient(url=url, **client_options)
+        self.outstanding = 0
+        self.healthy = True
+        self.failures = 0                          # Consecutive failed probes / connects
+        self.successes = 0                         # Consecutive passed probes while ejected
+        self._idle = asyncio.Event()               # Set whenever nothing is in flight
+        self._idle.set()
+
+    def acquire(self):
+        self.outstanding += 1
+        self._idle.clear()
+
+    def release(self):
+        self.outstanding -= 1
+        if self.outstanding == 0:
+            self._idle.set()
+
+    async def wait_idle(self):
+        await self._idle.wait()
+
+
 class AgentConnector:
     """
     Connects to a remote A2A agent and provides a uniform method to delegate tasks.
 
+    The agent may be served by several replicas (endpoints). Each request
+    goes to the less busy of two randomly picked healthy replicas ("power of
+    two choices" on outstanding requests). Agents that keep conversation
+    state per process need `session_affinity` instead: every turn of a
+    session then goes to the same replica, the one owning the sessionId on a
+    consistent-hash ring (when a replica joins or leaves, only the sessions
+    it gains or loses move). Replicas are probed on their agent-card endpoint;
+    one that fails `eject_after` checks in a row is taken out of rotation
+    (its sessions fall over to the next replica on the ring), and put back
+    after `readmit_after` passing probes.
+
     Attributes:
         name (str): Human-readable identifier of the remote agent.
-        client (A2AClient): HTTP client pointing at the agent's URL.
+        replicas (dict[str, Replica]): Endpoints serving the agent, by URL. Each
+            owns one pooled connection for the connector's whole lifetime.
+        outstanding (int): Requests to the agent currently in flight.
     """
 
-    def __init__(self, name: str, base_url: str):
+    def __init__(
+        self,
+        name: str,
+        base_url: str | list[str],
+        health_interval: float = 10.0,
+        probe_timeout: float = 2.0,
+        eject_after: int = 2,
+        readmit_after: int = 2,
+        session_affinity: bool = False,
+        **client_options
+    ):
         """
         Initialize the connector for a specific remote agent.
 
         Args:
             name (str): Identifier for the agent (e.g., "AIXpert").
-            base_url (str): The HTTP endpoint (e.g., "http://localhost:10000").
+            base_url (str | list[str]): The HTTP endpoint (e.g., "http://localhost:10000"),
+                or the endpoints of all its replicas.
+            health_interval: Seconds between health probes (only run with 2+ replicas)
+            probe_timeout: Timeout of one health probe in seconds
+            eject_after: Consecutive failures before a replica is ejected
+            readmit_after: Consecutive passing probes before it is readmitted
+            session_affinity: Route each sessionId to a fixed replica
+                (consistent hashing) instead of balancing every request; only
+                for agents keeping per-process conversation state
+            **client_options: Pool settings forwarded to A2AClient
+                (max_connections, keepalive_expiry, http2, ...).
         """
         self.name = name
-        self.client = A2AClient(url=base_url)
-        logger.info(f"AgentConnector: initialized for {self.name} at {base_url}")
+        self.health_interval = health_interval
+        self.probe_timeout = probe_timeout
+        self.eject_after = eject_after
+        self.readmit_after = readmit_after
+        self.session_affinity = session_affinity
+        self._client_options = client_options
+
+        self.replicas: dict[str, Replica] = {}
+        self._ring = HashRing()                    # Replica URLs, for session affinity
+        self._cancels: set[asyncio.Task] = set()   # Background tasks/cancel calls still running
+        self._retiring: set[asyncio.Task] = set()  # Removed replicas finishing their requests
+        self._health: asyncio.Task | None = None   # Started on first use, on the serving loop
+
+        urls = [base_url] if isinstance(base_url, str) else list(base_url)
+        for url in urls:
+            self.replicas[url] = Replica(url, **client_options)
+            self._ring.add(url)
+        logger.info(f"AgentConnector: initialized for {self.name} at {urls}")
+
+    @property
+    def outstanding(self) -> int:
+        return sum(replica.outstanding for replica in self.replicas.values())
+
+    # -------------------------------------------------------------------------
+    # Replica set
+    # -------------------------------------------------------------------------
+    def set_replicas(self, urls: list[str]):
+        """
+        Make `urls` the agent's replica set, in place: new endpoints are added,
+        existing ones keep their warm pools and health state, and removed ones
+        are drained in the background (their running requests finish first).
+        """
+        for url in urls:
+            if url not in self.replicas:
+                self.replicas[url] = Replica(url, **self._client_options)
+                self._ring.add(url)
+                logger.info(f"AgentConnector: added replica {url} to {self.name}")
+
+        for url in [url for url in self.replicas if url not in urls]:
+            replica = self.replicas.pop(url)
+            self._ring.remove(url)
+            logger.info(f"AgentConnector: removed replica {url} from {self.name}")
+            retiring = asyncio.create_task(self._drain_replica(replica))
+            self._retiring.add(retiring)
+            retiring.add_done_callback(self._retiring.discard)
+
+    def _pick(self, session_id: str | None = None, exclude: Replica | None = None) -> Replica:
+        """
+        With session affinity and a session ID: the first healthy replica on
+        the hash ring from the session's position (its owner, unless ejected).
+
+        Otherwise, power of two choices: the replica with fewer requests in
+        flight out of two random healthy ones.
+
+        If every replica is ejected, all are candidates (trying a suspect
+        replica beats failing outright).
+        """
+        replicas = [r for r in self.replicas.values() if r is not exclude]
+        candidates = [r for r in replicas if r.healthy] or replicas
+        if not candidates:
+            raise RuntimeError(f"No replicas available for agent {self.name}")
+
+        if self.session_affinity and session_id:
+            for url in self._ring.walk(session_id):
+                replica = self.replicas[url]
+                if replica in candidates:
+                    return replica
+
+        if len(candidates) == 1:
+            return candidates[0]
+        first, second = random.sample(candidates, 2)
+        return first if first.outstanding <= second.outstanding else second
 
-    async def send_task(self, message: str, session_id: str) -> Task:
+    # -------------------------------------------------------------------------
+    # send_task
+    # -------------------------------------------------------------------------
+    async def send_task(self, message: str, session_id: str, history_length: int | None = 1) -> Task:
         """
         Send a text task to the remote agent and return its completed Task.
 
         Args:
             message (str): What you want the agent to do (e.g., "What is topic modeling in NLP ?").
             session_id (str): Session identifier to group related calls.
+            history_length (int | None): History messages to get back; the default (1)
+                returns only the agent's reply, None returns the full history.
 
         Returns:
-            Task: The full Task object (including history) from the remote agent.
+            Task: The Task object from the remote agent, with the requested history.
+
+        The replica is chosen by session (see the class docstring). If it
+        refuses the connection, the task is sent once to another replica (it
+        never reached the first one, so this is safe).
+
+        If this call is cancelled (e.g., the caller's own task was canceled),
+        a `tasks/cancel` is sent for the remote task so the agent stops too.
         """
+        self._ensure_health_checks()
+
         task_id = uuid.uuid4().hex
         payload = {
             "id": task_id,
@@ -51,6 +209,122 @@ class AgentConnector:
             }
         }
 
-        task_result = await self.client.send_task(payload)
-        logger.info(f"AgentConnector: received response from {self.name} for task {task_id}")
-        return task_result
\ No newline at end of file
+        replica = self._pick(session_id)
+        try:
+            task_result = await self._send(replica, payload, history_length)
+        except httpx.ConnectError:
+            if len(self.replicas) < 2:
+                raise
+            replica = self._pick(session_id, exclude=replica)
+            logger.warning(f"AgentConnector: retrying task {task_id} for {self.name} on {replica.url}")
+            task_result = await self._send(replica, payload, history_length)
+        logger.info(f"AgentConnector: received response from {self.name} ({replica.url}) for task {task_id}")
+        return task_result
+
+    async def _send(self, replica: Replica, payload: dict, history_length: int | None) -> Task:
+        replica.acquire()
+        try:
+            task = await replica.client.send_task(payload, history_length=history_length)
+            self._record(replica, ok=True)
+            return task
+        except httpx.ConnectError:
+            self._record(replica, ok=False)
+            raise
+        except asyncio.CancelledError:
+            # Nobody will read the reply: release the remote agent's capacity as well
+            cancel = asyncio.create_task(self._cancel_remote(replica, payload["id"]))
+            self._cancels.add(cancel)
+            cancel.add_done_callback(self._cancels.discard)
+            raise
+        finally:
+            replica.release()
+
+    async def _cancel_remote(self, replica: Replica, task_id: str):
+        """
+        Send `tasks/cancel` for a task we stopped waiting on (to the replica running it).
+        """
+        try:
+            await replica.client.cancel_task(task_id)
+            logger.info(f"AgentConnector: canceled task {task_id} on {self.name}")
+        except Exception as e:
+            logger.warning(f"AgentConnector: could not cancel task {task_id} on {self.name}: {e}")
+
+    # -------------------------------------------------------------------------
+    # Health checks
+    # -------------------------------------------------------------------------
+    def _ensure_health_checks(self):
+        if self._health is None or self._health.done():
+            self._health = asyncio.create_task(self._health_loop())
+
+    async def _health_loop(self):
+        while True:
+            await asyncio.sleep(self.health_interval)
+            if len(self.replicas) > 1:              # With one replica there is nothing to balance
+                await asyncio.gather(*(self._probe(replica) for replica in list(self.replicas.values())))
+
+    async def _probe(self, replica: Replica):
+        """GET the replica's agent card; any answer below 400 counts as healthy."""
+        try:
+            response = await replica.client.client.get(card_url(replica.url), timeout=self.probe_timeout)
+            ok = response.status_code < 400
+        except httpx.HTTPError:
+            ok = False
+        self._record(replica, ok)
+
+    def _record(self, replica: Replica, ok: bool):
+        """Update a replica's health after a probe (or a refused connection)."""
+        if ok:
+            replica.failures = 0
+            if not replica.healthy:
+                replica.successes += 1
+                if replica.successes >= self.readmit_after:
+                    replica.healthy = True
+                    logger.info(f"AgentConnector: readmitted replica {replica.url} of {self.name}")
+            return
+
+        replica.successes = 0
+        replica.failures += 1
+        if replica.healthy and replica.failures >= self.eject_after:
+            replica.healthy = False
+            logger.warning(f"AgentConnector: ejected replica {replica.url} of {self.name}")
+
+    # -------------------------------------------------------------------------
+    # Shutdown
+    # -------------------------------------------------------------------------
+    async def _drain_replica(self, replica: Replica):
+        await replica.wait_idle()
+        await replica.client.close()
+
+    async def drain_and_close(self, timeout: float | None = None):
+        """
+        Wait until the requests in flight have finished, then close the
+        connector. Used when the agent is removed: callers that already hold
+        the connector keep their running requests.
+
+        Args:
+            timeout: Max seconds to wait (None = as long as the requests take;
+                each is bounded by the client's own timeout anyway)
+        """
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(replica.wait_idle() for replica in self.replicas.values())),
+                timeout
+            )
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"AgentConnector: closing {self.name} with {self.outstanding} requests still in flight"
+            )
+        await self.close()
+
+    async def close(self):
+        """
+        Close the pooled HTTP connections held for this agent.
+        """
+        if self._health is not None:
+            self._health.cancel()
+            await asyncio.gather(self._health, return_exceptions=True)
+            self._health = None
+        if self._cancels or self._retiring:
+            await asyncio.gather(*self._cancels, *self._retiring, return_exceptions=True)
+        await asyncio.gather(*(replica.client.close() for replica in self.replicas.values()))
+        logger.info(f"AgentConnector: closed connections to {self.name}")
@@ -1,10 +1,12 @@
 #agents.host_agent.entry.py
-import asyncio
 import logging
 import click
 
 from utilities.discovery import DiscoveryClient
 from server.server import A2AServer
+from server.sqlite_task_store import SqliteTaskStore
+from server.scheduler import PriorityScheduler
+from server.push_notifications import PushNotificationDispatcher
 from models.agent import AgentCard, AgentCapabilities, AgentSkill
 from agents.host_agent.orchestrator import (
     OrchestratorAgent,
@@ -31,26 +33,84 @@ logger = logging.getLogger(__name__)
         "Defaults to utilities/agent_registry.json"
     )
 )
-def main(host: str, port: int, registry: str):
+@click.option(
+    "--card-snapshot", default="agent_cards.snapshot.json",
+    help="File keeping the last good set of child-agent cards, used to start without waiting for discovery"
+)
+@click.option(
+    "--refresh-interval", default=30.0,
+    help="Seconds between background revalidations of the child-agent cards"
+)
+@click.option(
+    "--registry-poll-interval", default=2.0,
+    help="Seconds between checks of the registry file for added or removed agents"
+)
+@click.option(
+    "--task-db", default=None,
+    help="SQLite file to persist tasks in (default: in memory)"
+)
+@click.option(
+    "--async-workers", default=0,
+    help='Background workers for tasks sent with metadata {"async": true} (0 disables async mode)'
+)
+@click.option(
+    "--max-inflight", default=64,
+    help="Max tasks the orchestrator runs at once (0 disables admission control)"
+)
+@click.option(
+    "--queue-size", default=256,
+    help="Max tasks waiting per priority before new ones are rejected as busy"
+)
+@click.option(
+    "--batch-concurrency", default=16,
+    help="Max calls of one JSON-RPC batch request running at once"
+)
+@click.option(
+    "--processes", default=1,
+    help="Worker processes sharing the port (more than 1 requires --task-db)"
+)
+@click.option(
+    "--session-db", default=None,
+    help="ADK session database (SQLAlchemy URL or SQLite path) shared by all processes"
+)
+@click.option(
+    "--debug", is_flag=True,
+    help="Print every incoming JSON-RPC payload"
+)
+@click.option(
+    "--push-allow-host", "push_allow_hosts", multiple=True,
+    help="Webhook host accepted even if it is not public, e.g. localhost (repeatable)"
+)
+def main(host: str, port: int, registry: str, card_snapshot: str, refresh_interval: float,
+         registry_poll_interval: float,
+         task_db: str, async_workers: int,
+         max_inflight: int, queue_size: int, batch_concurrency: int, processes: int, session_db: str, debug: bool,
+         push_allow_hosts: tuple):
     """
     Entry point to start the OrchestratorAgent A2A server.
 
     Steps performed:
     1. Load child-agent URLs from the registry JSON file.
-    2. Fetch each agent's metadata via /.well-known/agent.json.
-    3. Instantiate an OrchestratorAgent with discovered AgentCards.
+    2. Load the agents' last known AgentCards from the snapshot file
+       (on the very first start, with no snapshot yet, start with no
+       agents: the first discovery runs once the server is up).
+    3. Instantiate an OrchestratorAgent with those AgentCards.
     4. Wrap it in an OrchestratorTaskManager for JSON-RPC handling.
-    5. Launch the A2AServer to listen for incoming tasks.
+    5. Launch the A2AServer to listen for incoming tasks; once it is up,
+       each agent's /.well-known/agent.json is fetched (or revalidated) in
+       the background and the orchestrator's
+       connectors are updated in place when they change. Edits to the
+       registry file are picked up without a restart.
     """
-    discovery = DiscoveryClient(registry_file=registry)
-    agent_cards = asyncio.run(discovery.list_agent_cards())
-
-    if not agent_cards:
-        logger.warning(
-            "No agents found in registry – the orchestrator will have nothing to call"
-        )
+    discovery = DiscoveryClient(registry_file=registry, snapshot_file=card_snapshot or None)
+    agent_cards = discovery.load_snapshot()
+    if agent_cards:
+        logger.info(f"Loaded {len(agent_cards)} agent cards from {card_snapshot}; revalidating in the background")
+    else:
+        # Don't delay binding the port: agents are added as soon as the first discovery answers
+        logger.info("No agent card snapshot yet; discovering agents in the background")
 
-    capabilities = AgentCapabilities(streaming=False)
+    capabilities = AgentCapabilities(streaming=True, pushNotifications=True)
     skill = AgentSkill(
         id="orchestrate",
         name="Orchestrate Tasks",
@@ -85,21 +145,44 @@ def main(host: str, port: int, registry: str):
         skills=[skill]
     )
 
-    orchestrator = OrchestratorAgent(agent_cards=agent_cards)
-    task_manager = OrchestratorTaskManager(agent=orchestrator)
+    orchestrator = OrchestratorAgent(agent_cards=agent_cards, session_db=session_db)
+    task_manager = OrchestratorTaskManager(
+        agent=orchestrator,
+        # Worker processes must not cache tasks: another process may change them
+        task_store=SqliteTaskStore(task_db, cache_size=0 if processes > 1 else 1024) if task_db else None,
+        async_workers=async_workers,
+        push_notifier=PushNotificationDispatcher(allowed_hosts=push_allow_hosts)
+    )
 
     server = A2AServer(
         host=host,
         port=port,
         agent_card=orchestrator_card,
-        task_manager=task_manager
+        task_manager=task_manager,
+        scheduler=PriorityScheduler(max_inflight, queue_size) if max_inflight > 0 else None,
+        batch_concurrency=batch_concurrency,
+        on_startup=[_start_refresh(discovery, orchestrator, refresh_interval, registry_poll_interval)],
+        on_shutdown=[discovery.close, orchestrator.close],
+        debug=debug
     )
 
     logger.info(
         f"Starting OrchestratorAgent with {len(agent_cards)} discovered agents: "
         f"AI Educator that teach about specific AI Topic"
     )
-    server.start()
+    server.start(workers=processes)
+
+def _start_refresh(discovery: DiscoveryClient, orchestrator: OrchestratorAgent, interval: float,
+                   watch_interval: float):
+    """Startup hook: keep the child-agent cards (and the registry) current on the serving event loop."""
+    def on_change(agent_cards):
+        if not agent_cards:
+            logger.warning("No agents found in registry – the orchestrator will have nothing to call")
+        orchestrator.update_agents(agent_cards)
+
+    async def start():
+        discovery.start_refresh(interval, on_change=on_change, watch_interval=watch_interval)
+    return start
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,6 +1,7 @@
 #agents.host_agent.orchestrator.py
 import os 
 import uuid
+import asyncio
 import logging
 from dotenv import load_dotenv
 
@@ -13,9 +14,6 @@ load_dotenv()
 from google.adk.agents.llm_agent import LlmAgent
 # LlmAgent: core class to define a Gemini-powered AI agent
 
-from google.adk.sessions import InMemorySessionService
-# InMemorySessionService: stores session state in memory (for simple demos)
-
 from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
 # InMemoryMemoryService: optional conversation memory stored in RAM
 
@@ -40,11 +38,8 @@ from google.genai import types
 from server.task_manager import InMemoryTaskManager
 # InMemoryTaskManager: base class providing in-memory task storage and locking
 
-from models.request import SendTaskRequest, SendTaskResponse
-# Data models for incoming task requests and outgoing responses
-
-from models.task import Message, TaskStatus, TaskState, TextPart
-# Message: encapsulates role+parts; TaskStatus/State: status enums; TextPart: text payload
+from models.request import SendTaskRequest
+# Data model for incoming task requests
 
 # -----------------------------------------------------------------------------
 # Connector to child A2A agents
@@ -55,9 +50,22 @@ from agents.host_agent.agent_connect import AgentConnector
 from models.agent import AgentCard
 # AgentCard: metadata structure for agent discovery results
 
+from utilities.single_flight import SingleFlight
+# SingleFlight: lets identical concurrent queries share one downstream call
+
+from utilities.cache import normalize_query
+# normalize_query: canonical query text (with the session ID) used as the coalescing key
+
+from utilities.sessions import build_session_service
+# build_session_service: picks the ADK session backend (in memory, or a database shared by worker processes)
+
 # Set up module-level logger for debug/info messages
 logger = logging.getLogger(__name__)
 
+# Agents that keep each session's conversation in the serving process: every
+# turn of a session must reach the same replica (see AgentConnector)
+SESSION_AFFINITY_AGENTS = {"SimpleAIExplainer"}
+
 
 class OrchestratorAgent:
     """
@@ -68,14 +76,18 @@ class OrchestratorAgent:
 
     SUPPORTED_CONTENT_TYPES = ["text", "text/plain"]
 
-    def __init__(self, agent_cards: list[AgentCard]):
-        # Build one AgentConnector per discovered AgentCard
+    def __init__(self, agent_cards: list[AgentCard], session_db: str | None = None):
+        # Build one AgentConnector per agent name; cards with the same name are
+        # replicas of one agent and share its connector (which balances them)
         # agent_cards is a list of AgentCard objects returned by discovery
         self.connectors = {
-            card.name: AgentConnector(card.name, card.url)
-            for card in agent_cards
+            name: _connector(name, urls)
+            for name, urls in _replica_urls(agent_cards).items()
         }
 
+        # Connectors of removed agents that are still finishing their requests
+        self._retiring: set[asyncio.Task] = set()
+
         # Log discovered agents for debugging
         agent_names = list(self.connectors.keys())
         logger.info(f"OrchestratorAgent initialized with agents: {agent_names}")
@@ -86,15 +98,60 @@ class OrchestratorAgent:
         # Static user ID for session tracking across calls
         self._user_id = "orchestrator_user"
 
+        # Identical queries arriving together are delegated only once
+        self._inflight = SingleFlight()
+
         # Runner wires up sessions, memory, artifacts, and handles agent.run()
+        # (sessions live in `session_db` if given, so every worker process shares them)
         self._runner = Runner(
             app_name=self._agent.name,
             agent=self._agent,
             artifact_service=InMemoryArtifactService(),
-            session_service=InMemorySessionService(),
+            session_service=build_session_service(session_db),
             memory_service=InMemoryMemoryService(),
         )
 
+    def update_agents(self, agent_cards: list[AgentCard]):
+        """
+        Bring `self.connectors` in line with freshly discovered cards, in
+        place (the map is never rebuilt):
+
+        - Connectors for new agents are added
+        - Existing connectors get the agent's current replica URLs (cards
+          sharing a name are replicas); they keep their warm connection
+          pools and the health state of replicas that stay
+        - Agents no longer in `agent_cards` (removed from the registry;
+          discovery keeps the last known card of an agent that is merely
+          down) are taken out of the map, then drained in the background:
+          requests already running finish normally, then the connector's
+          pooled connections are closed
+        """
+        replicas = _replica_urls(agent_cards)
+        for name in [name for name in self.connectors if name not in replicas]:
+            connector = self.connectors.pop(name)
+            logger.info(
+                f"OrchestratorAgent removed agent {name}; draining {connector.outstanding} requests in flight"
+            )
+            retiring = asyncio.create_task(connector.drain_and_close())
+            self._retiring.add(retiring)
+            retiring.add_done_callback(self._retiring.discard)
+
+        for name, urls in replicas.items():
+            connector = self.connectors.get(name)
+            if connector is None:
+                self.connectors[name] = _connector(name, urls)
+                logger.info(f"OrchestratorAgent discovered agent {name} ({len(urls)} replicas)")
+            else:
+                connector.set_replicas(urls)
+
+    async def close(self):
+        """Close the connection pools of every child-agent connector (including draining ones)."""
+        await asyncio.gather(
+            *(connector.close() for connector in self.connectors.values()),
+            *self._retiring,
+            return_exceptions=True
+        )
+
     def _build_agent(self) -> LlmAgent:
         """
         Construct the Gemini-based LlmAgent with:
@@ -184,7 +241,7 @@ class OrchestratorAgent:
         logger.info(f"Received response from {agent_name}")
 
         # Extract text from the last history entry if available
-        if child_task.history and len(child_task.history) > 1:
+        if child_task.history and child_task.history[-1].role == "agent":
             response = child_task.history[-1].parts[0].text
             logger.debug(f"Response from {agent_name}: '{response[:100]}...'")
             return response
@@ -193,9 +250,20 @@ class OrchestratorAgent:
         return ""
 
     async def invoke(self, query: str, session_id: str) -> str:
-
+        """
+        Route the query to SimpleAIExplainer. Concurrent identical queries
+        (after normalization) in the same session share one delegated call;
+        the answer depends on the session's conversation, so other sessions
+        never receive it.
+        """
         logger.info(f"OrchestratorAgent processing query: '{query[:50]}...'")
-        
+        return await self._inflight.do(
+            (session_id, normalize_query(query)),
+            lambda: self._route(query, session_id)
+        )
+
+    async def _route(self, query: str, session_id: str) -> str:
+        """Delegate one query to SimpleAIExplainer and return its reply text."""
         if "SimpleAIExplainer" in self.connectors:
             logger.info("🚀 Delegating directly to SimpleAIExplainer")
             connector = self.connectors["SimpleAIExplainer"]
@@ -203,7 +271,7 @@ class OrchestratorAgent:
             try:
                 child_task = await connector.send_task(query, session_id)
                 
-                if child_task.history and len(child_task.history) > 1:
+                if child_task.history and child_task.history[-1].role == "agent":
                     response = child_task.history[-1].parts[0].text
                     logger.info(f"SimpleAIExplainer response received: {len(response)} chars")
                     return response
@@ -221,14 +289,29 @@ class OrchestratorAgent:
             return f"SimpleAIExplainer not available. Available agents: {available}"
 
 
+def _connector(name: str, urls: list[str]) -> AgentConnector:
+    """Connector for one agent; sticky sessions only for agents that need them."""
+    return AgentConnector(name, urls, session_affinity=name in SESSION_AFFINITY_AGENTS)
+
+
+def _replica_urls(agent_cards: list[AgentCard]) -> dict[str, list[str]]:
+    """Group card URLs by agent name (several cards with one name are replicas)."""
+    replicas: dict[str, list[str]] = {}
+    for card in agent_cards:
+        urls = replicas.setdefault(card.name, [])
+        if card.url not in urls:
+            urls.append(card.url)
+    return replicas
+
+
 class OrchestratorTaskManager(InMemoryTaskManager):
     """
     🪄 TaskManager wrapper: exposes OrchestratorAgent.invoke() over the
     A2A JSON-RPC `tasks/send` endpoint, handling in-memory storage and
     response formatting.
     """
-    def __init__(self, agent: OrchestratorAgent):
-        super().__init__()       # Initialize base in-memory storage
+    def __init__(self, agent: OrchestratorAgent, **kwargs):
+        super().__init__(**kwargs)  # Initialize base in-memory storage (kwargs: store limits)
         self.agent = agent       # Store our orchestrator logic
 
     def _get_user_text(self, request: SendTaskRequest) -> str:
@@ -237,28 +320,14 @@ class OrchestratorTaskManager(InMemoryTaskManager):
         """
         return request.params.message.parts[0].text
 
-    async def on_send_task(self, request: SendTaskRequest) -> SendTaskResponse:
+    async def process_task(self, request: SendTaskRequest) -> str:
         """
-        Called by the A2A server when a new task arrives:
-        1. Store the incoming user message
-        2. Invoke the OrchestratorAgent to get a response
-        3. Append response to history, mark completed
-        4. Return a SendTaskResponse with the full Task
+        Called (through InMemoryTaskManager.on_send_task) when a new task arrives:
+        run the OrchestratorAgent on the user's text and return its reply.
+        The base class stores the message and the reply, marks the task
+        completed and returns only the history the caller asked for.
         """
         logger.info(f"OrchestratorTaskManager received task {request.params.id}")
 
-        # Step 1: save the initial message
-        task = await self.upsert_task(request.params)
-
-        # Step 2: run orchestration logic
         user_text = self._get_user_text(request)
-        response_text = await self.agent.invoke(user_text, request.params.sessionId)
-
-        # Step 3: wrap the LLM output into a Message
-        reply = Message(role="agent", parts=[TextPart(text=response_text)])
-        async with self.lock:
-            task.status = TaskStatus(state=TaskState.COMPLETED)
-            task.history.append(reply)
-
-        # Step 4: return structured response
-        return SendTaskResponse(id=request.id, result=task)
\ No newline at end of file
+        return await self.agent.invoke(user_text, request.params.sessionId)
@@ -12,6 +12,7 @@
 # - basic task sending via A2AClient
 # - session reuse
 # - optional task history printing
+# - optional streaming of the reply as it is generated (tasks/sendSubscribe)
 # =============================================================================
 
 import asyncclick as click        # click is a CLI tool; asyncclick supports async functions
@@ -22,7 +23,7 @@ from uuid import uuid4            # Used to generate unique task and session IDs
 from client.client import A2AClient
 
 # Import the Task model so we can handle and parse responses from the agent
-from models.task import Task
+from models.task import Task, TaskArtifactUpdateEvent
 
 
 # -----------------------------------------------------------------------------
@@ -40,7 +41,13 @@ from models.task import Task
 @click.option("--history", is_flag=True, help="Print full task history after receiving a response")
 # ^ This defines a --history flag (boolean). If passed, full conversation history is shown.
 
-async def cli(agent: str, session: str, history: bool):
+@click.option("--stream", is_flag=True, help="Stream the reply as it is generated (tasks/sendSubscribe)")
+# ^ This defines a --stream flag (boolean). If passed, partial replies are printed as they arrive.
+
+@click.option("--debug", is_flag=True, help="Print every JSON-RPC request sent to the agent")
+# ^ This defines a --debug flag (boolean). If passed, outgoing payloads are pretty-printed.
+
+async def cli(agent: str, session: str, history: bool, stream: bool, debug: bool):
     """
     CLI to send user messages to an A2A agent and display the response.
 
@@ -48,10 +55,12 @@ async def cli(agent: str, session: str, history: bool):
         agent (str): The base URL of the A2A agent server (e.g., http://localhost:10002)
         session (str): Either a string session ID or 0 to generate one
         history (bool): If true, prints the full task history
+        stream (bool): If true, prints the reply incrementally as it streams in
+        debug (bool): If true, prints each request payload before sending it
     """
 
     # Initialize the client by providing the full POST endpoint for sending tasks
-    client = A2AClient(url=f"{agent}")
+    client = A2AClient(url=f"{agent}", debug=debug)
 
     # Generate a new session ID if not provided (user passed 0)
     session_id = uuid4().hex if str(session) == "0" else str(session)
@@ -75,12 +84,35 @@ async def cli(agent: str, session: str, history: bool):
             }
         }
 
+        if stream:
+            try:
+                print("\nAgent says: ", end="", flush=True)
+                streamed = False
+                async for event in client.send_task_subscribe(payload):
+                    if event.error:
+                        print(f"\n❌ Error while streaming task: {event.error.message}")
+                        break
+                    update = event.result
+                    if isinstance(update, TaskArtifactUpdateEvent):
+                        # Partial output: print each chunk as soon as it arrives
+                        streamed = True
+                        print(update.artifact.parts[0].text, end="", flush=True)
+                    elif update.final:
+                        # Final status: print the whole reply unless we already streamed it
+                        if not streamed and update.status.message:
+                            print(update.status.message.parts[0].text, end="")
+                        print()
+            except Exception as e:
+                print(f"\n❌ Error while streaming task: {e}")
+            continue
+
         try:
             # Send the task to the agent and get a structured Task response
-            task: Task = await client.send_task(payload)
+            # Only the reply comes back unless the full history was asked for
+            task: Task = await client.send_task(payload, history_length=None if history else 1)
 
-            # Check if the agent responded (expecting at least 2 messages: user + agent)
-            if task.history and len(task.history) > 1:
+            # Check if the agent responded (the newest message should be the agent's)
+            if task.history and task.history[-1].role == "agent":
                 reply = task.history[-1]  # Last message is usually from the agent
                 print("\nAgent says:", reply.parts[0].text)  # Print agent's text reply
             else:
@@ -0,0 +1,136 @@
+# =============================================================================
+# benchmarks/concept_cache_lookup.py
+# =============================================================================
+# Purpose:
+# Measures ConceptCache lookup latency with a large number of cached entries
+# (100k by default), split into the time spent extracting the query's
+# concept and the time spent in the dictionary lookup.
+#
+# Cached questions are synthetic combinations of AI vocabulary; half of the
+# lookups are rewordings of cached questions (hits), half are new (misses).
+#
+# Before timing, a few hand-picked question pairs check answer quality:
+# rewordings must hit, look-alike questions about other concepts must miss
+# (the run stops if any pair gives the wrong result).
+#
+# Run:
+#   python -m benchmarks.concept_cache_lookup --entries 100000
+# =============================================================================
+
+import time
+import random
+import string
+import statistics
+
+import click
+
+from utilities.concept_cache import ConceptCache, extract_concept
+
+TOPICS = [
+    "machine learning", "neural networks", "transformers", "attention", "lora", "peft",
+    "fine tuning", "embeddings", "tokenization", "reinforcement learning", "gradient descent",
+    "backpropagation", "overfitting", "regularization", "diffusion models", "gans", "rag",
+    "vector databases", "quantization", "distillation", "convolution", "recurrent networks",
+    "decision trees", "random forests", "clustering", "dimensionality reduction", "bert",
+    "gpt", "llms", "prompt engineering", "agents", "evaluation metrics", "bias", "dropout",
+]
+ASPECTS = [
+    "basics", "history", "math", "training", "inference", "limitations", "use cases",
+    "hardware", "scaling", "datasets", "benchmarks", "architecture", "loss functions",
+    "optimizers", "deployment", "costs", "safety", "interpretability", "tooling", "research",
+]
+TEMPLATES = ["What is {} {} {}?", "Explain {} {} {}", "{} {} {} in simple terms", "How does {} {} {} work?"]
+
+# (cached question, new question, should the new one reuse the cached answer?)
+QUALITY_PAIRS = [
+    ("What is supervised learning?", "What is unsupervised learning?", False),
+    ("Explain neural networks", "Explain recurrent neural networks", False),
+    ("Explain dropout in CNNs", "Explain dropout in RNNs", False),
+    ("Explain LoRA", "What is LoRA in fine tuning?", True),
+    ("What is LoRA in fine tuning?", "Explain LoRA", True),
+    ("What are transformers?", "Explain transformers in simple terms", True),
+    ("How does backpropagation work?", "What is backpropagation?", True),
+]
+
+
+def check_quality():
+    """Fail loudly if any QUALITY_PAIRS question gets the wrong cache result."""
+    failures = 0
+    print(f"{'cached':<32} | {'asked':<38} | {'expected':>8} | {'got':>4}")
+    print("-" * 92)
+    for cached, asked, expected in QUALITY_PAIRS:
+        cache = ConceptCache(capacity=4, ttl=None)
+        cache.set(cached, "answer")
+        hit = cache.get(asked) is not None
+        failures += hit != expected
+        print(f"{cached:<32} | {asked:<38} | {'hit' if expected else 'miss':>8} | "
+              f"{'hit' if hit else 'miss':>4}{'' if hit == expected else '  ❌'}")
+    if failures:
+        raise SystemExit(f"\n{failures} question pair(s) got the wrong cache result")
+    print()
+
+
+def synthetic_question(rng: random.Random, i: int) -> tuple[str, tuple]:
+    """A unique question built from a topic, an aspect and a numeric tag."""
+    parts = (rng.choice(TOPICS), rng.choice(ASPECTS), f"case{i}")
+    return rng.choice(TEMPLATES).format(*parts), parts
+
+
+def unseen_question(rng: random.Random) -> str:
+    """A question made of words that never appear in the cache (should miss)."""
+    words = ["".join(rng.choices(string.ascii_lowercase, k=8)) for _ in range(3)]
+    return f"What is {' '.join(words)}?"
+
+
+def percentile(samples: list[float], q: float) -> float:
+    return sorted(samples)[min(len(samples) - 1, int(q * len(samples)))]
+
+
+@click.command()
+@click.option("--entries", default=100_000, help="Entries cached before measuring")
+@click.option("--lookups", default=2_000, help="Lookups to time")
+def main(entries: int, lookups: int):
+    check_quality()
+
+    rng = random.Random(42)
+    cache = ConceptCache(capacity=entries, ttl=None)
+
+    print(f"Filling cache with {entries:,} entries...")
+    questions = []
+    start = time.perf_counter()
+    for i in range(entries):
+        question, parts = synthetic_question(rng, i)
+        cache.set(question, f"answer {i}")
+        questions.append(parts)
+    print(f"  fill: {time.perf_counter() - start:.1f} s\n")
+
+    extract_times, lookup_times = [], []
+    hits = 0
+    for n in range(lookups):
+        if n % 2 == 0:
+            # Reworded version of a cached question (should hit)
+            parts = questions[rng.randrange(entries)]
+            query = rng.choice(TEMPLATES).format(*parts)
+        else:
+            query = unseen_question(rng)
+
+        t0 = time.perf_counter()
+        extract_concept(query)
+        t1 = time.perf_counter()
+        if cache.get(query) is not None:
+            hits += 1
+        t2 = time.perf_counter()
+
+        extract_times.append(t1 - t0)
+        lookup_times.append(t2 - t1)
+
+    print(f"{'':>10} | {'p50 (µs)':>9} | {'p99 (µs)':>9} | {'mean (µs)':>9}")
+    print("-" * 47)
+    for name, samples in (("extract", extract_times), ("get()", lookup_times)):
+        print(f"{name:>10} | {percentile(samples, 0.5) * 1e6:>9.1f} | "
+              f"{percentile(samples, 0.99) * 1e6:>9.1f} | {statistics.mean(samples) * 1e6:>9.1f}")
+    print(f"\nhit rate: {hits / lookups:.1%} (expected ~50%)")
+
+
+if __name__ == "__main__":
+    main()
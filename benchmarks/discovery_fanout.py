@@ -0,0 +1,141 @@
+# =============================================================================
+# benchmarks/discovery_fanout.py
+# =============================================================================
+# Purpose:
+# Measures how long DiscoveryClient takes to collect the agent cards of a
+# large registry (500 agents by default), each served by its own local stub
+# HTTP server that answers after a fixed delay.
+#
+#   old         = one agent after another (the previous list_agent_cards)
+#   cold        = concurrent fetches, empty cache
+#   warm        = every card still fresh in the cache (no requests)
+#   revalidate  = every card revalidated with If-None-Match (304 replies)
+#
+# The stubs send ETag and Cache-Control like A2AServer does, and count the
+# full (200) and not-modified (304) replies they send.
+#
+# Run:
+#   python -m benchmarks.discovery_fanout
+# =============================================================================
+
+import os
+import json
+import time
+import asyncio
+import tempfile
+
+import click
+import httpx
+
+from models.agent import AgentCard, AgentCapabilities
+from utilities.discovery import DiscoveryClient
+
+
+def card_body(port: int) -> bytes:
+    card = AgentCard(
+        name=f"agent-{port}",
+        description="Stub agent for the discovery benchmark",
+        url=f"http://127.0.0.1:{port}/",
+        version="1.0.0",
+        capabilities=AgentCapabilities(),
+        skills=[]
+    )
+    return card.model_dump_json(exclude_none=True).encode()
+
+
+async def start_stub(latency: float, replies: dict) -> asyncio.Server:
+    """A minimal keep-alive HTTP server that only serves /.well-known/agent.json."""
+    etag = None
+    body = b""
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                await asyncio.sleep(latency)
+                if etag.encode() in head:
+                    replies[304] += 1
+                    status, payload = b"304 Not Modified", b""
+                else:
+                    replies[200] += 1
+                    status, payload = b"200 OK", body
+                writer.write(
+                    b"HTTP/1.1 " + status + b"\r\n"
+                    b"Content-Type: application/json\r\n"
+                    b"ETag: " + etag.encode() + b"\r\n"
+                    b"Cache-Control: max-age=300\r\n"
+                    b"Content-Length: " + str(len(payload)).encode() + b"\r\n\r\n" + payload
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0, backlog=1024)
+    port = server.sockets[0].getsockname()[1]
+    body = card_body(port)
+    etag = f'"{port}"'
+    return server
+
+
+async def old_list_agent_cards(base_urls: list[str]) -> list[AgentCard]:
+    """The previous implementation: one agent after another."""
+    cards = []
+    async with httpx.AsyncClient() as client:
+        for base in base_urls:
+            url = base.rstrip("/") + "/.well-known/agent.json"
+            try:
+                response = await client.get(url, timeout=5.0)
+                response.raise_for_status()
+                cards.append(AgentCard.model_validate(response.json()))
+            except Exception:
+                pass
+    return cards
+
+
+async def run(agents: int, latency: float, concurrency: int, skip_old: bool):
+    replies = {200: 0, 304: 0}
+    servers = [await start_stub(latency, replies) for _ in range(agents)]
+    urls = [f"http://127.0.0.1:{s.sockets[0].getsockname()[1]}" for s in servers]
+
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+        json.dump(urls, f)
+    discovery = DiscoveryClient(registry_file=f.name, max_concurrency=concurrency)
+
+    print(f"{agents} agents, {latency * 1e3:.0f} ms per reply, max_concurrency={concurrency}\n")
+    print(f"{'':<12} {'seconds':>9} {'cards':>6} {'200s':>6} {'304s':>6}")
+    print("-" * 43)
+
+    async def measure(label, coro):
+        before = dict(replies)
+        start = time.perf_counter()
+        cards = await coro
+        elapsed = time.perf_counter() - start
+        print(f"{label:<12} {elapsed:>9.3f} {len(cards):>6} "
+              f"{replies[200] - before[200]:>6} {replies[304] - before[304]:>6}")
+
+    try:
+        if not skip_old:
+            await measure("old", old_list_agent_cards(urls))
+        await measure("cold", discovery.list_agent_cards())
+        await measure("warm", discovery.list_agent_cards())
+        await measure("revalidate", discovery.list_agent_cards(force=True))
+    finally:
+        await discovery.close()
+        for server in servers:
+            server.close()
+        os.unlink(f.name)
+
+
+@click.command()
+@click.option("--agents", default=500, help="Registry entries (one stub server each)")
+@click.option("--latency", default=0.02, help="Seconds each stub waits before replying")
+@click.option("--concurrency", default=32, help="DiscoveryClient max_concurrency")
+@click.option("--skip-old", is_flag=True, help="Don't time the sequential implementation")
+def main(agents: int, latency: float, concurrency: int, skip_old: bool):
+    asyncio.run(run(agents, latency, concurrency, skip_old))
+
+
+if __name__ == "__main__":
+    main()
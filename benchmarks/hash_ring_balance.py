@@ -0,0 +1,78 @@
+# =============================================================================
+# benchmarks/hash_ring_balance.py
+# =============================================================================
+# Purpose:
+# Shows how sessions spread over replicas with the consistent-hash ring used
+# for session affinity, and how many sessions move to another replica when a
+# replica joins or leaves, compared with plain `hash(session) % replicas`.
+#
+# For each replica count N (100,000 random session IDs):
+#   spread      = busiest / least busy replica share (1.00 = perfectly even)
+#   join moved  = sessions whose replica changes when replica N+1 is added
+#   leave moved = sessions whose replica changes when one replica is removed
+# Ideal movement is 1/(N+1) on join and 1/N on leave.
+#
+# Run:
+#   python -m benchmarks.hash_ring_balance
+# =============================================================================
+
+import uuid
+import hashlib
+import time
+from collections import Counter
+
+import click
+
+from utilities.hash_ring import HashRing
+
+
+def modulo(session: str, nodes: list[str]) -> str:
+    digest = int.from_bytes(hashlib.blake2b(session.encode(), digest_size=8).digest(), "big")
+    return nodes[digest % len(nodes)]
+
+
+def moved(before: dict[str, str], after: dict[str, str]) -> float:
+    return sum(before[s] != after[s] for s in before) / len(before)
+
+
+@click.command()
+@click.option("--sessions", default=100_000, help="Random session IDs to place")
+@click.option("--vnodes", default=160, help="Virtual nodes per replica")
+def main(sessions: int, vnodes: int):
+    ids = [uuid.uuid4().hex for _ in range(sessions)]
+
+    print(f"{sessions:,} sessions, {vnodes} virtual nodes per replica\n")
+    print(f"{'replicas':>8} | {'spread':>6} | {'ring join':>9} {'ring leave':>10} | "
+          f"{'mod join':>8} {'mod leave':>9} | {'ideal join':>10} {'ideal leave':>11}")
+    print("-" * 93)
+
+    for n in (2, 3, 4, 8, 16):
+        nodes = [f"http://replica-{i}:10001/" for i in range(n)]
+        ring = HashRing(nodes, vnodes=vnodes)
+        base = {s: ring.get(s) for s in ids}
+        counts = Counter(base.values())
+        spread = max(counts.values()) / min(counts.values())
+
+        ring.add("http://replica-new:10001/")
+        joined = {s: ring.get(s) for s in ids}
+        ring.remove("http://replica-new:10001/")
+        ring.remove(nodes[0])
+        left = {s: ring.get(s) for s in ids}
+
+        mod_base = {s: modulo(s, nodes) for s in ids}
+        mod_join = {s: modulo(s, nodes + ["http://replica-new:10001/"]) for s in ids}
+        mod_leave = {s: modulo(s, nodes[1:]) for s in ids}
+
+        print(f"{n:>8} | {spread:>6.2f} | {moved(base, joined):>9.1%} {moved(base, left):>10.1%} | "
+              f"{moved(mod_base, mod_join):>8.1%} {moved(mod_base, mod_leave):>9.1%} | "
+              f"{1 / (n + 1):>10.1%} {1 / n:>11.1%}")
+
+    ring = HashRing([f"http://replica-{i}:10001/" for i in range(8)], vnodes=vnodes)
+    start = time.perf_counter()
+    for s in ids:
+        ring.get(s)
+    print(f"\nLookup (8 replicas): {(time.perf_counter() - start) / len(ids) * 1e6:.2f} µs per session")
+
+
+if __name__ == "__main__":
+    main()
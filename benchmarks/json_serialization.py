@@ -0,0 +1,81 @@
+# =============================================================================
+# benchmarks/json_serialization.py
+# =============================================================================
+# Purpose:
+# Measures the cost of encoding and decoding a tasks/send response for Tasks
+# with 1, 100 and 1,000 history messages, comparing the old path with the
+# single-pass pydantic-core path A2AServer and A2AClient now use.
+#
+# Encode (server):
+#   old  = model_dump() -> jsonable_encoder() -> JSONResponse (json.dumps)
+#   new  = PydanticJSONResponse (pydantic-core straight to bytes)
+# Also shown: the pretty-printed payload log the server used to always do.
+#
+# Decode (client):
+#   old  = json.loads() -> Task(**result)
+#   new  = Task.model_validate_json() on the result
+#
+# Run:
+#   python -m benchmarks.json_serialization
+# =============================================================================
+
+import json
+import time
+import statistics
+
+import click
+from fastapi.encoders import jsonable_encoder
+from starlette.responses import JSONResponse
+
+from server.server import PydanticJSONResponse
+from models.request import SendTaskResponse
+from models.task import Task, TaskStatus, TaskState, Message, TextPart
+
+
+def make_response(history_size: int) -> SendTaskResponse:
+    """A completed task whose history alternates user / agent messages of ~400 chars."""
+    history = [
+        Message(
+            role="user" if i % 2 == 0 else "agent",
+            parts=[TextPart(text=f"Message {i}: " + "explain transformers and attention " * 12)]
+        )
+        for i in range(history_size)
+    ]
+    task = Task(id="task-1", status=TaskStatus(state=TaskState.COMPLETED), history=history, version=history_size)
+    return SendTaskResponse(id="req-1", result=task)
+
+
+def timed(fn, repeat: int) -> float:
+    """Median seconds per call over `repeat` calls."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+@click.command()
+@click.option("--repeat", default=50, help="Timed calls per measurement")
+def main(repeat: int):
+    print(f"{'history':>8} | {'bytes':>9} | {'encode old':>10} | {'encode new':>10} | "
+          f"{'debug log':>10} | {'decode old':>10} | {'decode new':>10}   (ms, median)")
+    print("-" * 94)
+
+    for size in (1, 100, 1000):
+        response = make_response(size)
+
+        encode_old = timed(lambda: JSONResponse(jsonable_encoder(response.model_dump(exclude_none=True))), repeat)
+        encode_new = timed(lambda: PydanticJSONResponse(response), repeat)
+        debug_log = timed(lambda: json.dumps(response.model_dump(mode="json"), indent=2), repeat)
+
+        body = PydanticJSONResponse(response).body
+        decode_old = timed(lambda: Task(**json.loads(body)["result"]), repeat)
+        decode_new = timed(lambda: SendTaskResponse.model_validate_json(body).result, repeat)
+
+        print(f"{size:>8} | {len(body):>9,} | {encode_old * 1e3:>10.3f} | {encode_new * 1e3:>10.3f} | "
+              f"{debug_log * 1e3:>10.3f} | {decode_old * 1e3:>10.3f} | {decode_new * 1e3:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
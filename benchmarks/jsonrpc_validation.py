@@ -0,0 +1,83 @@
+# =============================================================================
+# benchmarks/jsonrpc_validation.py
+# =============================================================================
+# Purpose:
+# Microbenchmark of per-request validation overhead on both ends of a
+# tasks/send call, in microseconds.
+#
+# Server, incoming request body:
+#   old  = json.loads(body) -> A2ARequest.validate_python(dict)
+#   new  = A2ARequest.validate_json(body)
+#
+# Server, building the response from a Task it already holds:
+#   SendTaskResponse(...)            (model instances are not re-validated)
+#   SendTaskResponse.model_construct(...)
+#
+# Client, reply body with 1 / 100 history messages:
+#   old  = json.loads(body) -> Task(**result)
+#   new  = SendTaskResponse.model_validate_json(body)
+#
+# Run:
+#   python -m benchmarks.jsonrpc_validation
+# =============================================================================
+
+import json
+import timeit
+
+import click
+
+from models.request import A2ARequest, SendTaskRequest, SendTaskResponse
+from models.task import Task, TaskStatus, TaskState, TaskSendParams, Message, TextPart
+
+
+def make_task(history_size: int) -> Task:
+    history = [
+        Message(role="user" if i % 2 == 0 else "agent", parts=[TextPart(text=f"message {i} " * 20)])
+        for i in range(history_size)
+    ]
+    return Task(id="task-1", status=TaskStatus(state=TaskState.COMPLETED), history=history, version=history_size)
+
+
+def usec(fn, number: int) -> float:
+    """Best-of-5 microseconds per call."""
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+@click.command()
+@click.option("--number", default=20_000, help="Calls per timing run")
+def main(number: int):
+    request = SendTaskRequest(
+        params=TaskSendParams(
+            id="task-1",
+            sessionId="session-1",
+            message=Message(role="user", parts=[TextPart(text="What is LoRA in simple terms?")]),
+            historyLength=1,
+            metadata={"priority": "high"}
+        )
+    )
+    body = request.model_dump_json(exclude_none=True).encode()
+
+    print(f"{'':<46} {'µs/call':>9}")
+    print("-" * 56)
+    print(f"{'server: json.loads + validate_python':<46} "
+          f"{usec(lambda: A2ARequest.validate_python(json.loads(body)), number):>9.2f}")
+    print(f"{'server: validate_json':<46} "
+          f"{usec(lambda: A2ARequest.validate_json(body), number):>9.2f}")
+
+    task = make_task(100)
+    print(f"{'server: SendTaskResponse(result=task)':<46} "
+          f"{usec(lambda: SendTaskResponse(id='r', result=task), number):>9.2f}")
+    print(f"{'server: SendTaskResponse.model_construct()':<46} "
+          f"{usec(lambda: SendTaskResponse.model_construct(id='r', result=task), number):>9.2f}")
+
+    for size in (1, 100):
+        reply = SendTaskResponse(id="r", result=make_task(size)).model_dump_json(exclude_none=True).encode()
+        runs = max(1, number // size)
+        print(f"{f'client ({size} msgs): json.loads + Task(**result)':<46} "
+              f"{usec(lambda: Task(**json.loads(reply)['result']), runs):>9.2f}")
+        print(f"{f'client ({size} msgs): model_validate_json':<46} "
+              f"{usec(lambda: SendTaskResponse.model_validate_json(reply), runs):>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
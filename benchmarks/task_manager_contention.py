@@ -0,0 +1,82 @@
+# =============================================================================
+# benchmarks/task_manager_contention.py
+# =============================================================================
+# Purpose:
+# Measures how well InMemoryTaskManager scales when many sessions update
+# their tasks at the same time.
+#
+# Each simulated session sends a task, then records several replies on it.
+# Tasks are kept in a real SqliteTaskStore (a fresh temporary database per
+# run): every update holds the task's lock while its rows are written, so
+# lock contention shows up as lost throughput. `--store memory` uses the
+# InMemoryTaskStore instead, whose writes never wait.
+#
+# `--stripes 1` reproduces the old single global lock; larger values spread
+# unrelated tasks over independent locks.
+#
+# Run:
+#   python -m benchmarks.task_manager_contention --sessions 1000
+# =============================================================================
+
+import os
+import time
+import asyncio
+import tempfile
+from uuid import uuid4
+
+import click
+
+from server.task_manager import InMemoryTaskManager
+from server.task_store import InMemoryTaskStore
+from server.sqlite_task_store import SqliteTaskStore
+from models.task import Message, TaskSendParams, TaskState, TextPart
+
+
+async def run_session(manager: InMemoryTaskManager, updates: int):
+    """One session: create a task and record `updates` agent replies on it."""
+    params = TaskSendParams(
+        id=uuid4().hex,
+        message=Message(role="user", parts=[TextPart(text="What is LoRA?")])
+    )
+    task = await manager.upsert_task(params)
+    reply = Message(role="agent", parts=[TextPart(text="LoRA is ...")])
+    for _ in range(updates):
+        await manager.update_task(task.id, TaskState.WORKING, reply)
+    await manager.update_task(task.id, TaskState.COMPLETED)
+
+
+async def measure(sessions: int, updates: int, stripes: int, store: str) -> float:
+    """Run all sessions concurrently and return updates per second."""
+    with tempfile.TemporaryDirectory() as tmp:
+        if store == "sqlite":
+            task_store = SqliteTaskStore(os.path.join(tmp, "tasks.db"))
+        else:
+            task_store = InMemoryTaskStore(max_tasks=None, completed_ttl=None, max_bytes=None)
+        manager = InMemoryTaskManager(task_store=task_store, lock_stripes=stripes)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(run_session(manager, updates) for _ in range(sessions)))
+        elapsed = time.perf_counter() - start
+
+        await task_store.close()
+    return sessions * (updates + 1) / elapsed
+
+
+@click.command()
+@click.option("--sessions", default=1000, help="Number of concurrent sessions")
+@click.option("--updates", default=5, help="Replies recorded per session")
+@click.option("--store", type=click.Choice(["sqlite", "memory"]), default="sqlite",
+              help="Task store the updates are written to")
+@click.option("--stripes", "stripe_counts", multiple=True, type=int, default=[1, 16, 64, 1024],
+              help="Lock stripe counts to compare (1 = single global lock)")
+def main(sessions: int, updates: int, store: str, stripe_counts: tuple[int, ...]):
+    print(f"{sessions} concurrent sessions, {updates + 1} updates each, {store} task store\n")
+    print(f"{'stripes':>8} | {'updates/s':>12}")
+    print("-" * 23)
+    for stripes in stripe_counts:
+        throughput = asyncio.run(measure(sessions, updates, stripes, store))
+        print(f"{stripes:>8} | {throughput:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
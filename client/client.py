@@ -7,30 +7,50 @@
 #
 # It supports:
 # - Sending tasks and receiving responses
-# - Getting task status or history
-# - (Streaming and canceling are not supported in this simplified version)
+# - Getting task status or history (optionally long-polling for changes)
+# - One pooled, long-lived HTTP connection pool per client (keep-alive, HTTP/2)
+# - Streaming task updates over Server-Sent Events
+# - Registering a webhook for a task's push notifications
+# - Canceling a queued or running task
+# - Sending many tasks in a few JSON-RPC batch requests
 # =============================================================================
 
 # -----------------------------------------------------------------------------
 # Imports
 # -----------------------------------------------------------------------------
 
-import json
+import asyncio                              # Sends the chunks of a large batch concurrently
+import logging
 from uuid import uuid4                                 # Used to encode/decode JSON data
 import httpx                                # Async HTTP client for making web requests
-from httpx_sse import connect_sse           # SSE client extension for httpx (not used currently)
-from typing import Any                      # Type hints for flexible input/output
+from httpx_sse import aconnect_sse          # SSE client extension for httpx (used for streaming)
+from typing import Any, AsyncIterator, TypeVar   # Type hints for flexible input/output
+from pydantic import ValidationError        # Raised when a reply doesn't match its model
+from pydantic import TypeAdapter            # Validates a batch reply (a JSON array) in one step
 
 # Import supported request types
-from models.request import SendTaskRequest, GetTaskRequest  # Removed CancelTaskRequest
+from models.request import SendTaskRequest, GetTaskRequest, CancelTaskRequest
+from models.request import SendTaskStreamingRequest, SendTaskStreamingResponse
+from models.request import SetTaskPushNotificationRequest, GetTaskPushNotificationRequest
+from models.request import SendTaskResponse, GetTaskResponse, CancelTaskResponse
+from models.request import SetTaskPushNotificationResponse, GetTaskPushNotificationResponse
 
-# Base request format for JSON-RPC 2.0
-from models.json_rpc import JSONRPCRequest
+# Base request/response formats for JSON-RPC 2.0
+from models.json_rpc import JSONRPCRequest, JSONRPCResponse
 
 # Models for task results and agent identity
-from models.task import Task, TaskSendParams
+from models.task import Task, TaskSendParams, TaskQueryParams, TaskIdParams
+from models.task import PushNotificationConfig, TaskPushNotificationConfig
 from models.agent import AgentCard
 
+logger = logging.getLogger(__name__)
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+R = TypeVar("R", bound=JSONRPCResponse)   # The response model a request expects
+
+SendTaskBatchResponse = TypeAdapter(list[SendTaskResponse])   # Reply to a batch of tasks/send
+
 
 # -----------------------------------------------------------------------------
 # Custom Error Classes
@@ -41,19 +61,50 @@ class A2AClientHTTPError(Exception):
     pass
 
 class A2AClientJSONError(Exception):
-    """Raised when the response is not valid JSON"""
+    """Raised when the response is not valid JSON (or doesn't match the expected reply)"""
     pass
 
+class A2AClientRPCError(Exception):
+    """Raised when the agent answers with a JSON-RPC error (e.g., task not found)"""
+
+    def __init__(self, code: int, message: str, data: Any = None):
+        super().__init__(f"{message} (code {code})")
+        self.code = code
+        self.message = message
+        self.data = data
+
 
 # -----------------------------------------------------------------------------
 # A2AClient: Main interface for talking to an A2A agent
 # -----------------------------------------------------------------------------
 
 class A2AClient:
-    def __init__(self, agent_card: AgentCard = None, url: str = None):
+    def __init__(
+        self,
+        agent_card: AgentCard = None,
+        url: str = None,
+        timeout: float = 300.0,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        debug: bool = False,
+    ):
         """
         Initializes the client using either an agent card or a direct URL.
         One of the two must be provided.
+
+        The client owns a single pooled `httpx.AsyncClient` for its whole
+        lifetime, so every request to the agent reuses warm keep-alive
+        connections instead of doing a fresh TCP handshake.
+
+        Args:
+            timeout: Per-request timeout in seconds
+            max_connections: Upper bound on open connections in the pool
+            max_keepalive_connections: Idle connections kept around for reuse
+            keepalive_expiry: Seconds an idle connection stays in the pool
+            http2: Multiplex requests over HTTP/2 (needs the `h2` package)
+            debug: Print every outgoing request payload (slow; for development only)
         """
         if agent_card:
             self.url = agent_card.url
@@ -62,51 +113,280 @@ class A2AClient:
         else:
             raise ValueError("Must provide either agent_card or url")
 
+        self.timeout = timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2 and _h2_available()
+        self.debug = debug
+
+        # Created lazily so the pool is bound to the event loop that uses it
+        self._client: httpx.AsyncClient | None = None
+
+
+    # -------------------------------------------------------------------------
+    # Connection pool lifecycle
+    # -------------------------------------------------------------------------
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Return the shared pooled HTTP client, creating it on first use."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=self.http2,
+            )
+        return self._client
+
+    async def close(self):
+        """Close the pooled HTTP client and release its connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def __aenter__(self) -> "A2AClient":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
 
     # -------------------------------------------------------------------------
     # send_task: Send a new task to the agent
     # -------------------------------------------------------------------------
-    async def send_task(self, payload: dict[str, Any]) -> Task:
+    async def send_task(self, payload: dict[str, Any], history_length: int | None = 1) -> Task:
+        """
+        Sends a task and returns the agent's Task.
+
+        By default only the newest history message (the agent's reply) is
+        returned; pass `history_length=None` for the full transcript, or set
+        "historyLength" in the payload yourself.
+        """
+        payload = {"historyLength": history_length, **payload}
 
         request = SendTaskRequest(
             id=uuid4().hex,
             params=TaskSendParams(**payload)  # ✅ Proper model wrapping
         )
 
-        print("\n📤 Sending JSON-RPC request:")
-        print(json.dumps(request.model_dump(), indent=2))
+        if self.debug:
+            print("\n📤 Sending JSON-RPC request:")
+            print(request.model_dump_json(indent=2))
+
+        response = await self._send_request(request, SendTaskResponse)
+        return response.result  # ✅ Extract just the 'result' field
+
+
+
+    # -------------------------------------------------------------------------
+    # send_tasks_batch: Send many tasks using JSON-RPC batch requests
+    # -------------------------------------------------------------------------
+    async def send_tasks_batch(
+        self,
+        payloads: list[dict[str, Any]],
+        history_length: int | None = 1,
+        batch_size: int = 100,
+    ) -> list[Task | A2AClientRPCError]:
+        """
+        Sends every payload as a `tasks/send` call, `batch_size` calls per
+        HTTP request (the chunks are sent concurrently; the agent runs the
+        calls of a batch concurrently too).
+
+        Returns one entry per payload, in the same order: the agent's Task,
+        or an A2AClientRPCError if that call failed (e.g., server busy).
+        A call failing doesn't fail the others; transport errors still raise.
+        """
+        requests = [
+            SendTaskRequest(id=uuid4().hex, params=TaskSendParams(**{"historyLength": history_length, **payload}))
+            for payload in payloads
+        ]
+        chunks = [requests[i:i + batch_size] for i in range(0, len(requests), batch_size)]
+        replies = await asyncio.gather(*(self._send_batch(chunk) for chunk in chunks))
+
+        # Match replies by id: JSON-RPC doesn't require them to come back in order
+        by_id = {reply.id: reply for chunk in replies for reply in chunk}
+        results: list[Task | A2AClientRPCError] = []
+        for request in requests:
+            reply = by_id.get(request.id)
+            if reply is None:
+                results.append(A2AClientRPCError(-32603, "No response for this call in the batch"))
+            elif reply.error is not None:
+                results.append(A2AClientRPCError(reply.error.code, reply.error.message, reply.error.data))
+            else:
+                results.append(reply.result)
+        return results
+
+    async def _send_batch(self, requests: list[SendTaskRequest]) -> list[SendTaskResponse]:
+        """POST one JSON-RPC batch and validate the reply array."""
+        body = b"[" + b",".join(
+            request.__pydantic_serializer__.to_json(request, exclude_none=True) for request in requests
+        ) + b"]"
+        if self.debug:
+            print(f"\n📤 Sending JSON-RPC batch of {len(requests)} calls")
+
+        try:
+            response = await self.client.post(self.url, content=body, headers=JSON_HEADERS)
+            response.raise_for_status()
+            return SendTaskBatchResponse.validate_json(response.content)
+
+        except httpx.HTTPStatusError as e:
+            # A rejected batch (e.g., too large) carries a single JSON-RPC error
+            raise _rpc_error(e.response) or A2AClientHTTPError(e.response.status_code, str(e)) from e
+
+        except ValidationError as e:
+            raise A2AClientJSONError(str(e)) from e
+
+
+
+    # -------------------------------------------------------------------------
+    # send_task_subscribe: Send a new task and stream its updates as they arrive
+    # -------------------------------------------------------------------------
+    async def send_task_subscribe(self, payload: dict[str, Any]) -> AsyncIterator[SendTaskStreamingResponse]:
+        """
+        Sends a `tasks/sendSubscribe` request and yields each Server-Sent Event
+        (status or artifact update) as soon as the agent emits it.
+        """
+        request = SendTaskStreamingRequest(
+            id=uuid4().hex,
+            params=TaskSendParams(**payload)
+        )
+
+        try:
+            async with aconnect_sse(
+                self.client, "POST", self.url,
+                content=request.__pydantic_serializer__.to_json(request, exclude_none=True), headers=JSON_HEADERS
+            ) as event_source:
+                if event_source.response.is_error:
+                    await event_source.response.aread()
+                event_source.response.raise_for_status()
+                async for sse in event_source.aiter_sse():
+                    yield SendTaskStreamingResponse.model_validate_json(sse.data)
 
-        response = await self._send_request(request)
-        return Task(**response["result"])  # ✅ Extract just the 'result' field
+        except httpx.HTTPStatusError as e:
+            raise _rpc_error(e.response) or A2AClientHTTPError(e.response.status_code, str(e)) from e
+
+        except ValidationError as e:
+            raise A2AClientJSONError(str(e)) from e
 
 
 
     # -------------------------------------------------------------------------
     # get_task: Retrieve the status or history of a previously sent task
     # -------------------------------------------------------------------------
-    async def get_task(self, payload: dict[str, Any]) -> Task:
-        request = GetTaskRequest(params=payload)
-        response = await self._send_request(request)
-        return Task(**response["result"])
+    async def get_task(self, payload: dict[str, Any], wait_timeout: float | None = None) -> Task:
+        """
+        Fetches a task by ID ("id" in the payload, plus optional "historyLength"
+        and "sinceVersion").
+
+        With `wait_timeout`, the agent holds the request (long-poll) for up to
+        that many seconds until the task changes: its version passes
+        "sinceVersion" or its state differs from "knownState" in the payload.
+        """
+        if wait_timeout is not None:
+            payload = {**payload, "waitTimeout": wait_timeout}
+
+        request = GetTaskRequest(id=uuid4().hex, params=TaskQueryParams(**payload))
+        response = await self._send_request(request, GetTaskResponse)
+        return response.result
+
+
+
+    # -------------------------------------------------------------------------
+    # cancel_task: Stop a task that is still queued or running
+    # -------------------------------------------------------------------------
+    async def cancel_task(self, task_id: str) -> Task:
+        """
+        Asks the agent to cancel the task; returns it in the "canceled" state.
+        Raises A2AClientRPCError if the task is unknown or already finished.
+        """
+        request = CancelTaskRequest(id=uuid4().hex, params=TaskIdParams(id=task_id))
+        response = await self._send_request(request, CancelTaskResponse)
+        return response.result
+
+
+
+    # -------------------------------------------------------------------------
+    # set/get_task_push_notification: Manage the webhook for a task's updates
+    # -------------------------------------------------------------------------
+    async def set_task_push_notification(
+        self, task_id: str, url: str, token: str | None = None
+    ) -> TaskPushNotificationConfig:
+        """
+        Asks the agent to POST the task to `url` whenever it changes
+        (with "Authorization: Bearer <token>" if a token is given).
+        """
+        request = SetTaskPushNotificationRequest(
+            id=uuid4().hex,
+            params=TaskPushNotificationConfig(
+                id=task_id,
+                pushNotificationConfig=PushNotificationConfig(url=url, token=token)
+            )
+        )
+        response = await self._send_request(request, SetTaskPushNotificationResponse)
+        return response.result
+
+    async def get_task_push_notification(self, task_id: str) -> TaskPushNotificationConfig:
+        """Returns the webhook registered for a task."""
+        request = GetTaskPushNotificationRequest(id=uuid4().hex, params=TaskIdParams(id=task_id))
+        response = await self._send_request(request, GetTaskPushNotificationResponse)
+        return response.result
 
 
 
     # -------------------------------------------------------------------------
     # _send_request: Internal helper to send a JSON-RPC request
     # -------------------------------------------------------------------------
-    async def _send_request(self, request: JSONRPCRequest) -> dict[str, Any]:
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    self.url,
-                    json=request.model_dump(),  # Convert Pydantic model to JSON
-                    timeout=300
-                )
-                response.raise_for_status()     # Raise error if status code is 4xx/5xx
-                return response.json()          # Return parsed response as a dict
-
-            except httpx.HTTPStatusError as e:
-                raise A2AClientHTTPError(e.response.status_code, str(e)) from e
-
-            except json.JSONDecodeError as e:
-                raise A2AClientJSONError(str(e)) from e
+    async def _send_request(self, request: JSONRPCRequest, response_model: type[R]) -> R:
+        """
+        POST a JSON-RPC request and validate the reply bytes straight into
+        `response_model` (no intermediate dict).
+
+        Raises:
+            A2AClientRPCError: if the agent answered with a JSON-RPC error
+        """
+        try:
+            response = await self.client.post(
+                self.url,
+                content=request.__pydantic_serializer__.to_json(request, exclude_none=True),  # One-pass encode to bytes
+                headers=JSON_HEADERS
+            )
+            response.raise_for_status()         # Raise error if status code is 4xx/5xx
+            result = response_model.model_validate_json(response.content)
+
+        except httpx.HTTPStatusError as e:
+            # Errors like "server busy" (503) still carry a JSON-RPC error body
+            raise _rpc_error(e.response) or A2AClientHTTPError(e.response.status_code, str(e)) from e
+
+        except ValidationError as e:
+            raise A2AClientJSONError(str(e)) from e
+
+        if result.error is not None:
+            raise A2AClientRPCError(result.error.code, result.error.message, result.error.data)
+        return result
+
+
+# -----------------------------------------------------------------------------
+# Helpers
+# -----------------------------------------------------------------------------
+
+def _rpc_error(response: httpx.Response) -> A2AClientRPCError | None:
+    """The JSON-RPC error carried in a response body, if it has one."""
+    try:
+        error = response.json().get("error")
+    except (ValueError, AttributeError):
+        return None
+    if not error:
+        return None
+    return A2AClientRPCError(error.get("code"), error.get("message"), error.get("data"))
+
+
+def _h2_available() -> bool:
+    """HTTP/2 support in httpx is optional and requires the `h2` package."""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        logger.warning("HTTP/2 requested but 'h2' is not installed; falling back to HTTP/1.1")
+        return False
@@ -14,6 +14,11 @@
 # - JSONRPCResponse: The reply to a request (either result or error)
 # - JSONRPCError: The structure of an error response
 # - InternalError: A predefined standard error for unexpected failures
+# - InvalidRequestError: The message is not a valid request (e.g., in a batch)
+# - TaskNotFoundError: Returned when a task ID is unknown to the agent
+# - TaskNotCancelableError: Returned when cancelling a task that already finished
+# - ServerBusyError: Returned when the agent sheds load (retry later)
+# - PushNotificationNotSupportedError: The agent can't deliver webhooks
 # =============================================================================
 
 # -----------------------------------------------------------------------------
@@ -95,3 +100,99 @@ class InternalError(JSONRPCError):
 
     # Optional debug details (e.g., traceback or context info)
     data: Any | None = None
+
+
+# -----------------------------------------------------------------------------
+# InvalidRequestError (subclass of JSONRPCError)
+# -----------------------------------------------------------------------------
+# The standard JSON-RPC error (-32600) for a message that is not a valid
+# request object, or a method that can't be used where it was sent (like a
+# streaming request inside a batch).
+class InvalidRequestError(JSONRPCError):
+    # Fixed error code for invalid requests
+    code: int = -32600
+
+    # Default error message describing the type of error
+    message: str = "Request payload validation error"
+
+    # Optional debug details (e.g., the validation errors)
+    data: Any | None = None
+
+
+# -----------------------------------------------------------------------------
+# InvalidParamsError (subclass of JSONRPCError)
+# -----------------------------------------------------------------------------
+# The standard JSON-RPC error (-32602) for parameters that are well formed but
+# not acceptable (like a push-notification webhook the agent refuses to call).
+class InvalidParamsError(JSONRPCError):
+    # Fixed error code for invalid method parameters
+    code: int = -32602
+
+    # Default error message describing the type of error
+    message: str = "Invalid parameters"
+
+    # Optional debug details
+    data: Any | None = None
+
+
+# -----------------------------------------------------------------------------
+# TaskNotFoundError (subclass of JSONRPCError)
+# -----------------------------------------------------------------------------
+# Returned when a request refers to a task ID the agent doesn't know
+# (never created, or already evicted from the task store).
+class TaskNotFoundError(JSONRPCError):
+    # A2A-specific error code for unknown tasks
+    code: int = -32001
+
+    # Default error message describing the type of error
+    message: str = "Task not found"
+
+    # Optional debug details
+    data: Any | None = None
+
+
+# -----------------------------------------------------------------------------
+# TaskNotCancelableError (subclass of JSONRPCError)
+# -----------------------------------------------------------------------------
+# Returned by "tasks/cancel" when the task has already completed, failed or
+# been canceled.
+class TaskNotCancelableError(JSONRPCError):
+    # A2A-specific error code
+    code: int = -32002
+
+    # Default error message describing the type of error
+    message: str = "Task cannot be canceled"
+
+    # Optional debug details
+    data: Any | None = None
+
+# -----------------------------------------------------------------------------
+# ServerBusyError (subclass of JSONRPCError)
+# -----------------------------------------------------------------------------
+# Returned when the agent is overloaded and rejects a task instead of queueing
+# it. `data` carries {"retryAfter": seconds}, also sent as a Retry-After header.
+class ServerBusyError(JSONRPCError):
+    # Implementation-defined server error code
+    code: int = -32000
+
+    # Default error message describing the type of error
+    message: str = "Server busy"
+
+    # {"retryAfter": seconds}
+    data: Any | None = None
+
+
+# -----------------------------------------------------------------------------
+# PushNotificationNotSupportedError (subclass of JSONRPCError)
+# -----------------------------------------------------------------------------
+# Returned when a webhook is registered with an agent that has no
+# push-notification dispatcher.
+class PushNotificationNotSupportedError(JSONRPCError):
+    # A2A-specific error code
+    code: int = -32003
+
+    # Default error message describing the type of error
+    message: str = "Push notification is not supported"
+
+    # Optional debug details
+    data: Any | None = None
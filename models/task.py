@@ -8,6 +8,8 @@
 # - What a task looks like (`Task`)
 # - The state of the task (`TaskStatus`, `TaskState`)
 # - The messages exchanged during a task (`Message`, `TextPart`)
+# - Outputs and incremental events produced while streaming (`Artifact`,
+#   `TaskStatusUpdateEvent`, `TaskArtifactUpdateEvent`)
 # - Parameters used when sending, querying, or canceling tasks
 # =============================================================================
 
@@ -51,6 +53,9 @@ class Message(BaseModel):
 
 class TaskStatus(BaseModel):
     state: str  # A string like "submitted", "working", etc. (defined more precisely in TaskState)
+
+    # Optional message attached to this status (e.g., the final agent reply when streaming)
+    message: Message | None = None
     
     # Automatically captures the time when the status is recorded
     timestamp: datetime = Field(default_factory=datetime.now)
@@ -65,6 +70,58 @@ class Task(BaseModel):
     status: TaskStatus         # The current state of the task
     history: List[Message]     # Conversation history for the task (what the user said, how the agent replied)
 
+    # Number of messages ever added to the history. Responses may carry only the
+    # tail of the history; clients can pass this back as `sinceVersion` to fetch
+    # just the messages added after it.
+    version: int = 0
+
+
+# -----------------------------------------------------------------------------
+# Artifact: Output produced by the agent while working on a task
+# -----------------------------------------------------------------------------
+
+class Artifact(BaseModel):
+    name: str | None = None                # Optional label for the output
+    parts: List[Part]                      # The content of this (piece of the) artifact
+    index: int = 0                         # Which artifact this chunk belongs to
+    append: bool | None = None             # True if this chunk extends earlier chunks
+    lastChunk: bool | None = None          # True on the final chunk of the artifact
+    metadata: dict[str, Any] | None = None
+
+
+# -----------------------------------------------------------------------------
+# Streaming Events: Sent over Server-Sent Events for tasks/sendSubscribe
+# -----------------------------------------------------------------------------
+
+# Sent whenever the task moves to a new state; `final` marks the last event of the stream
+class TaskStatusUpdateEvent(BaseModel):
+    id: str                                # The task ID
+    status: TaskStatus                     # The new status
+    final: bool = False                    # True if no more events will follow
+    metadata: dict[str, Any] | None = None
+
+
+# Sent whenever the agent produces (part of) an output
+class TaskArtifactUpdateEvent(BaseModel):
+    id: str                                # The task ID
+    artifact: Artifact                     # The new artifact chunk
+    metadata: dict[str, Any] | None = None
+
+
+# -----------------------------------------------------------------------------
+# Push Notifications: Where the agent should POST task updates
+# -----------------------------------------------------------------------------
+
+class PushNotificationConfig(BaseModel):
+    url: str                               # Webhook that receives the task on every state change
+    token: str | None = None               # Sent back as "Authorization: Bearer <token>"
+
+
+# Binds a push-notification config to one task
+class TaskPushNotificationConfig(BaseModel):
+    id: str                                # The task ID
+    pushNotificationConfig: PushNotificationConfig
+
 
 # -----------------------------------------------------------------------------
 # Parameter Models for API Requests
@@ -80,6 +137,13 @@ class TaskIdParams(BaseModel):
 # Useful when querying a task and controlling how much of the past you want back
 class TaskQueryParams(TaskIdParams):
     historyLength: int | None = None       # Limit the number of messages returned in the task's history
+    sinceVersion: int | None = None        # Only return messages added after this task version
+
+    # Long-poll: wait up to this many seconds for the task to change before answering.
+    # "Changed" means its version passed `sinceVersion`, or its state differs from
+    # `knownState` (if neither is given: any change since the request arrived).
+    waitTimeout: float | None = None
+    knownState: str | None = None          # A TaskState value, e.g. "working"
 
 
 # Parameters required to send a new task to an agent
@@ -90,7 +154,8 @@ class TaskSendParams(BaseModel):
     sessionId: str = Field(default_factory=lambda: uuid4().hex)
 
     message: Message                       # The message that initiates the task
-    historyLength: int | None = None       # Optional history length to return
+    historyLength: int | None = None       # Max history messages to return in the response (None = all)
+    pushNotification: PushNotificationConfig | None = None  # Optional webhook for this task's updates
     metadata: dict[str, Any] | None = None # Optional extra info (e.g., user role, priority)
 
 
@@ -0,0 +1,284 @@
+# =============================================================================
+# server/push_notifications.py
+# =============================================================================
+# 🎯 Purpose:
+# Delivers task updates to client webhooks ("push notifications"), so callers
+# don't have to keep polling `tasks/get`.
+#
+# ✅ How it works:
+# - Clients register a PushNotificationConfig (webhook URL + optional token)
+#   per task, either in `tasks/send` or with `tasks/pushNotification/set`;
+#   configs are kept in the task store, so with a store shared by several
+#   worker processes a webhook registered on one fires for updates on all
+# - Every task change calls `notify(task)`; deliveries run in the background
+#   and never slow down the request that changed the task
+# - Rapid updates to one task are coalesced: only the newest snapshot is
+#   sent, and a task never has more than one delivery in flight (so its
+#   notifications arrive in order)
+# - Failed deliveries (network errors, 429, 5xx) are retried with
+#   exponential backoff and jitter
+# - A semaphore caps outstanding HTTP deliveries across all tasks, and all
+#   deliveries share one pooled httpx client
+# - Webhook URLs come from clients, so they are checked before they are
+#   stored and again before every delivery: only http(s) URLs whose host
+#   resolves to public addresses (or is explicitly allowed) are called, so
+#   callers can't make the agent send requests into its own network
+# =============================================================================
+
+
+# -----------------------------------------------------------------------------
+# 📚 Standard Python Imports
+# -----------------------------------------------------------------------------
+
+import random                              # Jitter for retry backoff
+import socket                              # Address resolution of webhook hosts
+import asyncio                             # Background delivery tasks and the outstanding cap
+import logging                             # Logs failed deliveries
+import ipaddress                           # Classifies webhook addresses (loopback, private, ...)
+from collections import OrderedDict        # LRU-bounded map of registered webhooks
+from typing import Iterable
+from urllib.parse import urlsplit          # Scheme / host / port of webhook URLs
+
+import httpx                               # Pooled async HTTP client for webhook calls
+
+
+# -----------------------------------------------------------------------------
+# 📦 Project Imports
+# -----------------------------------------------------------------------------
+
+from models.task import Task, PushNotificationConfig
+from server.task_store import TaskStore
+
+logger = logging.getLogger(__name__)
+
+
+RETRY_STATUS = {408, 429, 500, 502, 503, 504}   # Worth trying again; other 4xx are not
+
+
+class InvalidWebhookError(ValueError):
+    """A webhook URL the dispatcher refuses to call (see `check_url`)."""
+
+
+# -----------------------------------------------------------------------------
+# 📬 PushNotificationDispatcher
+# -----------------------------------------------------------------------------
+
+class PushNotificationDispatcher:
+    """
+    📬 Background webhook sender with per-task coalescing and retries.
+
+    Counters are kept in `stats`: delivered, failed (gave up), retries and
+    coalesced (updates replaced by a newer one before being sent).
+    """
+
+    def __init__(
+        self,
+        max_outstanding: int = 100,
+        coalesce_delay: float = 0.1,
+        max_retries: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        timeout: float = 10.0,
+        max_configs: int = 10_000,
+        allowed_hosts: Iterable[str] = (),
+    ):
+        """
+        Args:
+            max_outstanding: Max webhook requests in flight at once
+            coalesce_delay: Seconds to wait for more updates before sending one
+            max_retries: Retries after the first failed attempt
+            backoff_base: First retry delay in seconds (doubles every retry)
+            backoff_max: Upper bound on a retry delay
+            timeout: Per-request timeout in seconds
+            max_configs: Webhooks remembered in this process (least recently used are
+                dropped; the task store bound with `bind_store` keeps all of them)
+            allowed_hosts: Webhook hosts accepted even though they are not public
+                (e.g., "localhost" or an internal service during development)
+        """
+        self.coalesce_delay = coalesce_delay
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.max_configs = max_configs
+        self.allowed_hosts = {host.lower() for host in allowed_hosts}
+
+        self._max_outstanding = max_outstanding
+        self._outstanding: asyncio.Semaphore | None = None   # Created on the serving event loop
+        self._client: httpx.AsyncClient | None = None
+
+        self._store: TaskStore | None = None            # Where configs live (see bind_store)
+        self._configs: "OrderedDict[str, PushNotificationConfig]" = OrderedDict()
+        self._pending: dict[str, Task] = {}             # Newest undelivered snapshot per task
+        self._senders: dict[str, asyncio.Task] = {}     # One delivery loop per task with pending work
+
+        self.stats = {"delivered": 0, "failed": 0, "retries": 0, "coalesced": 0}
+
+    # -------------------------------------------------------------------------
+    # 🔧 Webhook registration
+    # -------------------------------------------------------------------------
+    def bind_store(self, store: TaskStore):
+        """Keep webhooks in `store` (the task manager binds its task store)."""
+        self._store = store
+
+    @property
+    def _shared(self) -> bool:
+        """True if other processes may register webhooks this process doesn't know about."""
+        return self._store is not None and self._store.shared_across_processes
+
+    async def set_config(self, task_id: str, config: PushNotificationConfig):
+        """
+        Register (or replace) the webhook for `task_id`.
+
+        Raises:
+            InvalidWebhookError: if the URL may not be called (see `check_url`)
+        """
+        await self.check_url(config.url)
+        self._remember(task_id, config)
+        if self._store is not None:
+            await self._store.set_push_config(task_id, config)
+
+    async def get_config(self, task_id: str) -> PushNotificationConfig | None:
+        """The webhook for `task_id`: from this process unless another one may have set it."""
+        config = self._configs.get(task_id)
+        if (config is None or self._shared) and self._store is not None:
+            config = await self._store.get_push_config(task_id)
+            if config is not None:
+                self._remember(task_id, config)
+        return config
+
+    def _remember(self, task_id: str, config: PushNotificationConfig):
+        self._configs[task_id] = config
+        self._configs.move_to_end(task_id)
+        while len(self._configs) > self.max_configs:
+            self._configs.popitem(last=False)
+
+    async def check_url(self, url: str):
+        """
+        Raise InvalidWebhookError unless `url` is an http(s) URL whose host is
+        in `allowed_hosts` or resolves only to public addresses (no loopback,
+        private, link-local, multicast or reserved ones).
+        """
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise InvalidWebhookError(f"Webhook must be an http(s) URL: {url}")
+
+        host = parts.hostname.lower()
+        if host in self.allowed_hosts:
+            return
+
+        try:
+            addresses = {ipaddress.ip_address(host)}
+        except ValueError:
+            try:
+                infos = await asyncio.get_running_loop().getaddrinfo(
+                    host, parts.port or (443 if parts.scheme == "https" else 80), type=socket.SOCK_STREAM
+                )
+            except socket.gaierror as e:
+                raise InvalidWebhookError(f"Cannot resolve webhook host {host}: {e}") from e
+            addresses = {ipaddress.ip_address(info[4][0].split("%")[0]) for info in infos}
+
+        for address in addresses:
+            if address.version == 6 and address.ipv4_mapped is not None:
+                address = address.ipv4_mapped
+            if not address.is_global or address.is_multicast:
+                raise InvalidWebhookError(f"Webhook host {host} is not a public address ({address})")
+
+    # -------------------------------------------------------------------------
+    # 📣 notify: Queue a task snapshot for delivery
+    # -------------------------------------------------------------------------
+    def notify(self, task: Task):
+        """
+        Schedule delivery of `task` to its webhook, if it has one. Returns
+        immediately. `task` should be a snapshot that won't change later.
+
+        With a store shared across processes, the webhook may have been
+        registered elsewhere, so it is looked up when the update is sent.
+        """
+        if task.id not in self._configs and not self._shared:
+            return
+        if task.id in self._pending:
+            self.stats["coalesced"] += 1
+        self._pending[task.id] = task
+
+        if task.id not in self._senders:
+            self._senders[task.id] = asyncio.create_task(self._send_loop(task.id))
+
+    async def _send_loop(self, task_id: str):
+        """Deliver the task's newest snapshot until nothing is pending for it."""
+        try:
+            while task_id in self._pending:
+                await asyncio.sleep(self.coalesce_delay)    # Let rapid updates pile up
+                task = self._pending.pop(task_id)
+                config = await self.get_config(task_id)
+                if config is not None:
+                    await self._deliver(config, task)
+        finally:
+            del self._senders[task_id]
+
+    # -------------------------------------------------------------------------
+    # 📤 _deliver: POST one snapshot, retrying with exponential backoff
+    # -------------------------------------------------------------------------
+    async def _deliver(self, config: PushNotificationConfig, task: Task):
+        # Checked again: the host may resolve to another address than at registration
+        try:
+            await self.check_url(config.url)
+        except InvalidWebhookError as e:
+            self.stats["failed"] += 1
+            logger.warning(f"Push notification for task {task.id} not sent: {e}")
+            return
+
+        headers = {"Content-Type": "application/json"}
+        if config.token:
+            headers["Authorization"] = f"Bearer {config.token}"
+        body = task.model_dump_json(exclude_none=True)
+
+        for attempt in range(self.max_retries + 1):
+            async with self._semaphore():
+                try:
+                    response = await self.client.post(config.url, content=body, headers=headers)
+                    if response.status_code < 400:
+                        self.stats["delivered"] += 1
+                        return
+                    error = f"HTTP {response.status_code}"
+                    retryable = response.status_code in RETRY_STATUS
+                except httpx.HTTPError as e:
+                    error = f"{type(e).__name__}: {e}"
+                    retryable = True
+
+            if not retryable or attempt == self.max_retries:
+                break
+            self.stats["retries"] += 1
+            delay = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+            await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+
+        self.stats["failed"] += 1
+        logger.warning(f"Push notification for task {task.id} to {config.url} failed: {error}")
+
+    # -------------------------------------------------------------------------
+    # 🔌 Pooled HTTP client and lifecycle
+    # -------------------------------------------------------------------------
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Return the shared pooled HTTP client, creating it on first use."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self._max_outstanding)
+            )
+        return self._client
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        if self._outstanding is None:
+            self._outstanding = asyncio.Semaphore(self._max_outstanding)
+        return self._outstanding
+
+    async def close(self):
+        """Stop pending deliveries and close the HTTP client."""
+        for sender in list(self._senders.values()):
+            sender.cancel()
+        await asyncio.gather(*self._senders.values(), return_exceptions=True)
+        self._pending.clear()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
@@ -0,0 +1,196 @@
+# =============================================================================
+# server/scheduler.py
+# =============================================================================
+# 🎯 Purpose:
+# Admission control for A2AServer: caps how many tasks an agent runs at once
+# and decides who goes next when it is saturated.
+#
+# ✅ How it works:
+# - Each task gets a priority from `TaskSendParams.metadata["priority"]`
+#   ("high", "normal" or "low"; anything else counts as the default)
+# - Up to `max_concurrency` tasks run at once; the rest wait in one bounded
+#   FIFO queue per priority, and a freed slot always goes to the oldest
+#   waiter of the highest non-empty priority
+# - When a priority's queue is full the task is rejected immediately with
+#   `SchedulerBusy`, carrying a Retry-After estimate, instead of making every
+#   request slower
+# - Queue depths, wait times and rejections are kept in `stats()`
+# =============================================================================
+
+
+# -----------------------------------------------------------------------------
+# 📚 Standard Python Imports
+# -----------------------------------------------------------------------------
+
+import math                                # Rounding the Retry-After hint up
+import time                                # Monotonic clock for wait times
+import asyncio                             # Futures that waiting tasks sleep on
+import logging                             # Logs rejected tasks
+from collections import deque              # FIFO queue per priority
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+
+# -----------------------------------------------------------------------------
+# 📦 Project Imports
+# -----------------------------------------------------------------------------
+
+from models.task import TaskSendParams
+
+logger = logging.getLogger(__name__)
+
+
+PRIORITIES = ("high", "normal", "low")     # Served in this order
+
+
+# -----------------------------------------------------------------------------
+# 🚫 SchedulerBusy: Raised when a task can't even be queued
+# -----------------------------------------------------------------------------
+
+class SchedulerBusy(Exception):
+    """The queue for this priority is full; try again after `retry_after` seconds."""
+
+    def __init__(self, priority: str, retry_after: int):
+        super().__init__(f"Server busy: {priority} priority queue is full")
+        self.priority = priority
+        self.retry_after = retry_after
+
+
+# -----------------------------------------------------------------------------
+# 🚦 PriorityScheduler
+# -----------------------------------------------------------------------------
+
+class PriorityScheduler:
+    """
+    🚦 Bounded, priority-aware concurrency limiter.
+
+    Usage:
+        async with scheduler.slot(scheduler.priority_of(params)):
+            ...  # run the task
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 64,
+        queue_size: int | dict[str, int] = 256,
+        default_priority: str = "normal",
+    ):
+        """
+        Args:
+            max_concurrency: Max tasks running at once
+            queue_size: Max waiting tasks per priority (one number for all, or per priority)
+            default_priority: Priority of tasks that don't ask for a known one
+        """
+        if default_priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority: {default_priority}")
+
+        self.max_concurrency = max_concurrency
+        self.default_priority = default_priority
+        self.queue_sizes = (
+            dict(queue_size) if isinstance(queue_size, dict)
+            else {p: queue_size for p in PRIORITIES}
+        )
+
+        self._queues: dict[str, deque[asyncio.Future]] = {p: deque() for p in PRIORITIES}
+        self._running = 0
+        self._avg_run_seconds = 1.0        # Moving average used for Retry-After hints
+
+        self.metrics = {
+            p: {"admitted": 0, "rejected": 0, "total_wait_seconds": 0.0, "max_wait_seconds": 0.0}
+            for p in PRIORITIES
+        }
+
+    # -------------------------------------------------------------------------
+    # 🏷️ priority_of: Read the priority a task asked for
+    # -------------------------------------------------------------------------
+    def priority_of(self, params: TaskSendParams) -> str:
+        priority = (params.metadata or {}).get("priority")
+        return priority if priority in PRIORITIES else self.default_priority
+
+    # -------------------------------------------------------------------------
+    # 🎟️ slot: Hold one execution slot for the duration of a task
+    # -------------------------------------------------------------------------
+    @asynccontextmanager
+    async def slot(self, priority: str) -> AsyncIterator[None]:
+        """
+        Wait for an execution slot (in priority order) and hold it while the
+        `async with` body runs.
+
+        Raises:
+            SchedulerBusy: if the queue for `priority` is already full
+        """
+        await self.acquire(priority)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.release(time.monotonic() - started)
+
+    async def acquire(self, priority: str):
+        """Take an execution slot, waiting in the `priority` queue if none is free."""
+        queued = time.monotonic()
+
+        if self._running < self.max_concurrency and not any(self._queues.values()):
+            self._running += 1
+        else:
+            queue = self._queues[priority]
+            if len(queue) >= self.queue_sizes.get(priority, 0):
+                self.metrics[priority]["rejected"] += 1
+                retry_after = self.retry_after()
+                logger.warning(f"Rejecting {priority} priority task: queue full (retry after {retry_after}s)")
+                raise SchedulerBusy(priority, retry_after)
+
+            waiter = asyncio.get_running_loop().create_future()
+            queue.append(waiter)
+            try:
+                await waiter               # Resolved by release(), which hands us its slot
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    self.release(0.0)      # We were handed a slot but nobody will use it
+                elif waiter in queue:
+                    queue.remove(waiter)
+                raise
+
+        wait = time.monotonic() - queued
+        stats = self.metrics[priority]
+        stats["admitted"] += 1
+        stats["total_wait_seconds"] += wait
+        stats["max_wait_seconds"] = max(stats["max_wait_seconds"], wait)
+
+    def release(self, run_seconds: float):
+        """Give the slot back, handing it straight to the next waiter if there is one."""
+        if run_seconds > 0:
+            self._avg_run_seconds = 0.9 * self._avg_run_seconds + 0.1 * run_seconds
+
+        for priority in PRIORITIES:
+            queue = self._queues[priority]
+            while queue:
+                waiter = queue.popleft()
+                if not waiter.done():
+                    waiter.set_result(None)    # The slot passes on; _running is unchanged
+                    return
+        self._running -= 1
+
+    # -------------------------------------------------------------------------
+    # 📊 Metrics
+    # -------------------------------------------------------------------------
+    def retry_after(self) -> int:
+        """Rough seconds until queued work drains, for the Retry-After hint."""
+        queued = sum(len(q) for q in self._queues.values())
+        return max(1, math.ceil((queued + 1) * self._avg_run_seconds / self.max_concurrency))
+
+    def stats(self) -> dict:
+        """Running count, queue depth per priority and admission/wait counters."""
+        return {
+            "running": self._running,
+            "max_concurrency": self.max_concurrency,
+            "queue_depth": {p: len(q) for p, q in self._queues.items()},
+            "avg_run_seconds": round(self._avg_run_seconds, 3),
+            "priorities": {
+                p: {
+                    **m,
+                    "avg_wait_seconds": m["total_wait_seconds"] / m["admitted"] if m["admitted"] else 0.0,
+                }
+                for p, m in self.metrics.items()
+            },
+        }
@@ -5,8 +5,16 @@
 # This file defines a very simple A2A (Agent-to-Agent) server.
 # It supports:
 # - Receiving task requests via POST ("/")
-# - Letting clients discover the agent's details via GET ("/.well-known/agent.json")
-# NOTE: It does not support streaming or push notifications in this version.
+# - Fetching task status/history ("tasks/get"), optionally long-polling for changes
+# - Optional admission control: a PriorityScheduler caps concurrent tasks and
+#   sheds load with a "server busy" error when its queues are full ("/metrics")
+# - Streaming task updates as Server-Sent Events ("tasks/sendSubscribe")
+# - Letting clients discover the agent's details via GET ("/.well-known/agent.json"),
+#   cacheable (ETag + Cache-Control max-age, 304 on If-None-Match)
+# - Registering webhooks for push notifications ("tasks/pushNotification/set|get")
+# - Cancelling queued or running tasks ("tasks/cancel")
+# - Serving from several pre-forked worker processes sharing one port
+# - JSON-RPC batches: an array of calls in one POST, run concurrently
 # =============================================================================
 
 
@@ -17,24 +25,42 @@
 # 🌐 Starlette is a lightweight web framework for building ASGI applications
 from starlette.applications import Starlette            # To create our web app
 from starlette.responses import JSONResponse            # To send responses as JSON
+from starlette.responses import Response                # Base class for the raw-bytes JSON response
+from starlette.responses import StreamingResponse       # To stream Server-Sent Events
 from starlette.requests import Request                  # Represents incoming HTTP requests
 
 # 📦 Importing our custom models and logic
 from models.agent import AgentCard                      # Describes the agent's identity and skills
 from models.request import A2ARequest, SendTaskRequest  # Request models for tasks
+from models.request import GetTaskRequest               # Task status/history queries
+from models.request import SetTaskPushNotificationRequest, GetTaskPushNotificationRequest
+from models.request import CancelTaskRequest            # Stops a queued or running task
+from models.request import SendTaskStreamingRequest     # Streaming (SSE) task requests
 from models.json_rpc import JSONRPCResponse, InternalError  # JSON-RPC utilities for structured messaging
+from models.json_rpc import JSONRPCMessage              # Responses must always carry their "id"
+from models.json_rpc import ServerBusyError             # Returned when the scheduler sheds load
+from models.json_rpc import InvalidRequestError         # A batch item that isn't a valid request
+from server.scheduler import PriorityScheduler, SchedulerBusy  # Admission control for tasks
 from server import task_manager              # Our actual task handling logic (Gemini agent)
 
 # 🛠️ General utilities
-import json                                              # Used for printing the request payloads (for debugging)
+import json                                              # Splitting batches; printing request payloads (for debugging)
+import asyncio                                           # Runs the calls of a batch concurrently
+import time                                              # Measures how long streams hold a scheduler slot
+import os                                                # fork() for multi-process serving
+import signal                                            # Forwarding shutdown to worker processes
+import socket                                            # The listening socket shared by workers
+import hashlib                                           # ETag of the agent card
 import logging                                           # Used to log errors and info messages
 logger = logging.getLogger(__name__)                     # Setup logger for this file
 
 # 🕒 datetime import for serialization
 from datetime import datetime
+from typing import AsyncIterable, Awaitable, Callable
+from contextlib import asynccontextmanager
 
-# 📦 Encoder to help convert complex data like datetime into JSON
-from fastapi.encoders import jsonable_encoder
+# ⚡ Pydantic models serialize themselves straight to JSON bytes
+from pydantic import BaseModel, ValidationError
 
 
 # -----------------------------------------------------------------------------
@@ -50,11 +76,58 @@ def json_serializer(obj):
     raise TypeError(f"Type {type(obj)} not serializable")
 
 
+# -----------------------------------------------------------------------------
+# ⚡ encode_json: Serialize a model to JSON bytes, leaving out None fields
+# -----------------------------------------------------------------------------
+def encode_json(content: BaseModel) -> bytes:
+    """
+    Encode a Pydantic model in one pass by pydantic-core, leaving out None
+    fields, except the "id" of a JSON-RPC message: JSON-RPC 2.0 requires it
+    in every response, as null when the request's ID is unknown.
+    """
+    if isinstance(content, JSONRPCMessage) and content.id is None:
+        data = content.model_dump(mode="json", exclude_none=True)
+        data = {"jsonrpc": data.pop("jsonrpc"), "id": None, **data}
+        return json.dumps(data, separators=(",", ":")).encode()
+    return content.__pydantic_serializer__.to_json(content, exclude_none=True)
+
+
+# -----------------------------------------------------------------------------
+# ⚡ PydanticJSONResponse: Encode a model straight to JSON bytes
+# -----------------------------------------------------------------------------
+class PydanticJSONResponse(Response):
+    """
+    JSON response for Pydantic models, encoded in one pass by pydantic-core
+    (no intermediate dict, no `jsonable_encoder`, no re-encoding by `json`).
+    None fields are left out, except a JSON-RPC response's "id" (see
+    `encode_json`). A list of models (a batch reply) becomes a JSON array.
+    """
+    media_type = "application/json"
+
+    def render(self, content: BaseModel | list[BaseModel]) -> bytes:
+        if isinstance(content, list):
+            return b"[" + b",".join(self.render(item) for item in content) + b"]"
+        return encode_json(content)
+
+
 # -----------------------------------------------------------------------------
 # 🚀 A2AServer Class: The Core Server Logic
 # -----------------------------------------------------------------------------
 class A2AServer:
-    def __init__(self, host="0.0.0.0", port=5000, agent_card: AgentCard = None, task_manager: task_manager = None):
+    def __init__(
+        self,
+        host="0.0.0.0",
+        port=5000,
+        agent_card: AgentCard = None,
+        task_manager: task_manager = None,
+        scheduler: PriorityScheduler | None = None,
+        batch_concurrency: int = 16,
+        max_batch_size: int = 1000,
+        card_max_age: int = 300,
+        on_startup: list[Callable[[], Awaitable[None]]] | None = None,
+        on_shutdown: list[Callable[[], Awaitable[None]]] | None = None,
+        debug: bool = False
+    ):
         """
         🔧 Constructor for our A2AServer
 
@@ -63,14 +136,31 @@ class A2AServer:
             port: Port number to listen on (default is 5000)
             agent_card: Metadata that describes our agent (name, skills, capabilities)
             task_manager: Logic to handle the task (using Gemini agent here)
+            scheduler: Optional admission control for tasks/send and tasks/sendSubscribe
+                (None = run every request as soon as it arrives)
+            batch_concurrency: Max calls of one JSON-RPC batch running at once
+            max_batch_size: Max calls accepted in one batch
+            card_max_age: Seconds clients may cache the agent card before revalidating
+            on_startup: Coroutines awaited (in each worker) before serving starts,
+                e.g. to start background tasks on the serving event loop
+            on_shutdown: Coroutines awaited when the server stops, before the
+                task manager is closed
+            debug: Print every incoming request payload (slow; for development only)
         """
         self.host = host
         self.port = port
         self.agent_card = agent_card
         self.task_manager = task_manager
+        self.scheduler = scheduler
+        self.batch_concurrency = batch_concurrency
+        self.max_batch_size = max_batch_size
+        self.card_max_age = card_max_age
+        self.on_startup = on_startup or []
+        self.on_shutdown = on_shutdown or []
+        self.debug = debug
 
-        # 🌐 Starlette app initialization
-        self.app = Starlette()
+        # 🌐 Starlette app initialization (lifespan closes the task manager on shutdown)
+        self.app = Starlette(lifespan=self._lifespan)
 
         # 📥 Register a route to handle task requests (JSON-RPC POST)
         self.app.add_route("/", self._handle_request, methods=["POST"])
@@ -78,32 +168,162 @@ class A2AServer:
         # 🔎 Register a route for agent discovery (metadata as JSON)
         self.app.add_route("/.well-known/agent.json", self._get_agent_card, methods=["GET"])
 
+        # 📊 Register a route reporting scheduler queue depth and wait times
+        self.app.add_route("/metrics", self._get_metrics, methods=["GET"])
+
     # -----------------------------------------------------------------------------
     # ▶️ start(): Launch the web server using uvicorn
     # -----------------------------------------------------------------------------
-    def start(self):
+    def start(self, workers: int = 1):
         """
         Starts the A2A server using uvicorn (ASGI web server).
         This function will block and run the server forever.
+
+        Args:
+            workers: Number of worker processes. With more than one, the
+                listening socket is opened once and N workers are forked to
+                share it (POSIX only). Task state must then live in a store
+                shared across processes, e.g. SqliteTaskStore(path, cache_size=0):
+                tasks, push-notification webhooks and cancellations go through
+                it, so any worker can serve any request. Answer caches and
+                request coalescing stay per process (they only affect hit rates).
         """
         if not self.agent_card or not self.task_manager:
             raise ValueError("Agent card and task manager are required")
 
         # Dynamically import uvicorn so it’s only loaded when needed
         import uvicorn
-        uvicorn.run(self.app, host=self.host, port=self.port)
+
+        if workers <= 1:
+            uvicorn.run(self.app, host=self.host, port=self.port)
+            return
+
+        if not hasattr(os, "fork"):
+            raise RuntimeError("Multiple workers need os.fork() (POSIX only)")
+        store = getattr(self.task_manager, "tasks", None)
+        if not getattr(store, "shared_across_processes", False):
+            raise ValueError(
+                "Multiple workers need a task store shared across processes "
+                "(e.g., SqliteTaskStore(path, cache_size=0))"
+            )
+
+        # One listening socket, opened before forking; the kernel spreads connections
+        family = socket.AF_INET6 if ":" in self.host else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        sock.listen(2048)
+        sock.set_inheritable(True)
+
+        def serve():
+            config = uvicorn.Config(self.app, host=self.host, port=self.port)
+            uvicorn.Server(config).run(sockets=[sock])
+
+        self._supervise(serve, workers)
+
+    # -----------------------------------------------------------------------------
+    # 👷 _supervise(): Fork worker processes and keep them running
+    # -----------------------------------------------------------------------------
+    def _supervise(self, serve, workers: int):
+        """
+        Fork `workers` processes that each run `serve()`, replace any that
+        die unexpectedly, and stop them all on SIGINT/SIGTERM.
+        """
+        children: dict[int, int] = {}          # pid -> worker number
+        stopping = False
+
+        def spawn(number: int):
+            pid = os.fork()
+            if pid == 0:
+                # 👶 Worker: restore default signal handling and serve until told to stop
+                signal.signal(signal.SIGINT, signal.SIG_DFL)
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                try:
+                    serve()
+                finally:
+                    os._exit(0)
+            children[pid] = number
+            logger.info(f"Started worker {number} (pid {pid}) on {self.host}:{self.port}")
+
+        def stop(signum, frame):
+            nonlocal stopping
+            stopping = True
+            for pid in children:
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                except ProcessLookupError:
+                    pass
+
+        signal.signal(signal.SIGINT, stop)
+        signal.signal(signal.SIGTERM, stop)
+
+        for number in range(workers):
+            spawn(number)
+
+        while children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            number = children.pop(pid, None)
+            if number is not None and not stopping:
+                logger.warning(f"Worker {number} (pid {pid}) exited with status {status}; restarting it")
+                time.sleep(1.0)                    # Don't spin if a worker keeps crashing at startup
+                spawn(number)
+
+    # -----------------------------------------------------------------------------
+    # 🔁 _lifespan(): Startup/shutdown hooks for the ASGI app
+    # -----------------------------------------------------------------------------
+    @asynccontextmanager
+    async def _lifespan(self, app: Starlette):
+        """
+        Runs while the server is up. Awaits the startup hooks first; on
+        shutdown, awaits the shutdown hooks and then gives the task manager a
+        chance to flush and close its storage.
+        """
+        for hook in self.on_startup:
+            await hook()
+        yield
+        for hook in self.on_shutdown:
+            try:
+                await hook()
+            except Exception as e:
+                logger.error(f"Shutdown hook {getattr(hook, '__name__', hook)} failed: {e}")
+        if self.task_manager is not None:
+            await self.task_manager.close()
 
     # -----------------------------------------------------------------------------
     # 🔎 _get_agent_card(): Return the agent’s metadata (GET request)
     # -----------------------------------------------------------------------------
-    def _get_agent_card(self, request: Request) -> JSONResponse:
+    def _get_agent_card(self, request: Request) -> Response:
         """
         Endpoint for agent discovery (GET /.well-known/agent.json)
 
+        The card is sent with an ETag and `Cache-Control: max-age`, so
+        discovery clients can cache it and later revalidate it cheaply:
+        a matching If-None-Match gets an empty 304 reply.
+
         Returns:
-            JSONResponse: Agent metadata as a dictionary
+            Response: Agent metadata as JSON (or 304 Not Modified)
+        """
+        body = PydanticJSONResponse(self.agent_card).body
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        headers = {"ETag": etag, "Cache-Control": f"max-age={self.card_max_age}"}
+
+        known = {tag.strip().removeprefix("W/") for tag in request.headers.get("If-None-Match", "").split(",")}
+        if etag in known or "*" in known:
+            return Response(status_code=304, headers=headers)
+        return Response(body, media_type="application/json", headers=headers)
+
+    # -----------------------------------------------------------------------------
+    # 📊 _get_metrics(): Report scheduler statistics (GET request)
+    # -----------------------------------------------------------------------------
+    def _get_metrics(self, request: Request) -> JSONResponse:
         """
-        return JSONResponse(self.agent_card.model_dump(exclude_none=True))
+        Endpoint for monitoring (GET /metrics): running tasks, queue depth per
+        priority and wait-time counters. Empty if no scheduler is configured.
+        """
+        return JSONResponse({"scheduler": self.scheduler.stats() if self.scheduler else None})
 
     # -----------------------------------------------------------------------------
     # 📥 _handle_request(): Handle incoming POST requests for tasks
@@ -116,31 +336,137 @@ class A2AServer:
         - Validates the JSON-RPC message
         - For supported task types, delegates to the task manager
         - Returns a response or error
+        - A JSON array is handled as a JSON-RPC batch (see `_handle_batch`)
         """
+        json_rpc = None
         try:
-            # Step 1: Parse incoming JSON body
-            body = await request.json()
-            print("\n🔍 Incoming JSON:", json.dumps(body, indent=2))  # Log input for visibility
+            # Step 1: Read the raw body (parsed only once, in step 2)
+            body = await request.body()
+            if self.debug:
+                print("\n🔍 Incoming JSON:", json.dumps(json.loads(body), indent=2))  # Log input for visibility
+
+            if body.lstrip()[:1] == b"[":
+                return await self._handle_batch(body)
 
-            # Step 2: Parse and validate request using discriminated union
-            json_rpc = A2ARequest.validate_python(body)
+            # Step 2: Parse and validate the bytes in one step using the discriminated union
+            json_rpc = A2ARequest.validate_json(body)
 
-            # Step 3: If it’s a send-task request, call the task manager to handle it
-            if isinstance(json_rpc, SendTaskRequest):
-                result = await self.task_manager.on_send_task(json_rpc)
-            else:
-                raise ValueError(f"Unsupported A2A method: {type(json_rpc)}")
+            # Step 3: Streaming requests are answered with a Server-Sent-Events stream
+            # (the scheduler slot is held until the stream ends)
+            if isinstance(json_rpc, SendTaskStreamingRequest):
+                if self.scheduler is not None:
+                    priority = self.scheduler.priority_of(json_rpc.params)
+                    await self.scheduler.acquire(priority)
+                return self._create_stream_response(
+                    json_rpc.id,
+                    self.task_manager.on_send_task_subscribe(json_rpc),
+                    on_close=self.scheduler.release if self.scheduler is not None else None
+                )
 
-            # Step 4: Convert the result into a proper JSON response
-            return self._create_response(result)
+            # Step 4: Everything else gets a single JSON response
+            return self._create_response(await self._dispatch(json_rpc))
+
+        except SchedulerBusy as e:
+            # Shed load right away and tell the client when to come back
+            return PydanticJSONResponse(
+                self._busy_response(json_rpc.id, e),
+                status_code=503,
+                headers={"Retry-After": str(e.retry_after)}
+            )
 
         except Exception as e:
             logger.error(f"Exception: {e}")
             # Return a JSON-RPC compliant error response if anything fails
-            return JSONResponse(
-                JSONRPCResponse(id=None, error=InternalError(message=str(e))).model_dump(),
+            return PydanticJSONResponse(
+                JSONRPCResponse(id=None, error=InternalError(message=str(e))),
+                status_code=400
+            )
+
+    # -----------------------------------------------------------------------------
+    # 🔀 _dispatch(): Route one validated request to the task manager
+    # -----------------------------------------------------------------------------
+    async def _dispatch(self, json_rpc) -> JSONRPCResponse:
+        """
+        Runs a non-streaming request and returns its JSON-RPC response.
+        Raises SchedulerBusy if the scheduler rejects a tasks/send.
+        """
+        if isinstance(json_rpc, SendTaskRequest):
+            if self.scheduler is None:
+                return await self.task_manager.on_send_task(json_rpc)
+            async with self.scheduler.slot(self.scheduler.priority_of(json_rpc.params)):
+                return await self.task_manager.on_send_task(json_rpc)
+        if isinstance(json_rpc, GetTaskRequest):
+            # May wait (long-poll) if the request sets waitTimeout
+            return await self.task_manager.on_get_task(json_rpc)
+        if isinstance(json_rpc, SetTaskPushNotificationRequest):
+            return await self.task_manager.on_set_task_push_notification(json_rpc)
+        if isinstance(json_rpc, GetTaskPushNotificationRequest):
+            return await self.task_manager.on_get_task_push_notification(json_rpc)
+        if isinstance(json_rpc, CancelTaskRequest):
+            return await self.task_manager.on_cancel_task(json_rpc)
+        raise ValueError(f"Unsupported A2A method: {type(json_rpc)}")
+
+    # -----------------------------------------------------------------------------
+    # 📦 _handle_batch(): Run a JSON-RPC batch concurrently
+    # -----------------------------------------------------------------------------
+    async def _handle_batch(self, body: bytes) -> PydanticJSONResponse:
+        """
+        Handles a JSON-RPC 2.0 batch (an array of requests in one POST).
+
+        - Calls run concurrently, at most `batch_concurrency` at a time
+          (tasks/send calls still go through the scheduler one by one)
+        - Responses come back as an array in the same order as the calls
+        - Each call succeeds or fails on its own: an invalid call, a busy
+          scheduler or a failing task only produces an error for that item
+        - Streaming (tasks/sendSubscribe) can't be batched
+        """
+        items = json.loads(body)
+        if not items:
+            return PydanticJSONResponse(
+                JSONRPCResponse(id=None, error=InvalidRequestError(message="Empty batch")),
                 status_code=400
             )
+        if len(items) > self.max_batch_size:
+            return PydanticJSONResponse(
+                JSONRPCResponse(
+                    id=None,
+                    error=InvalidRequestError(message=f"Batch too large (max {self.max_batch_size} calls)")
+                ),
+                status_code=400
+            )
+
+        limit = asyncio.Semaphore(self.batch_concurrency)
+
+        async def run(item) -> JSONRPCResponse:
+            request_id = item.get("id") if isinstance(item, dict) else None
+            try:
+                json_rpc = A2ARequest.validate_python(item)
+            except ValidationError as e:
+                return JSONRPCResponse(id=request_id, error=InvalidRequestError(data=e.errors(include_url=False)))
+            if isinstance(json_rpc, SendTaskStreamingRequest):
+                return JSONRPCResponse(
+                    id=request_id, error=InvalidRequestError(message="tasks/sendSubscribe can't be batched")
+                )
+
+            async with limit:
+                try:
+                    return await self._dispatch(json_rpc)
+                except SchedulerBusy as e:
+                    return self._busy_response(json_rpc.id, e)
+                except Exception as e:
+                    logger.error(f"Exception in batch call {json_rpc.id}: {e}")
+                    return JSONRPCResponse(id=json_rpc.id, error=InternalError(message=str(e)))
+
+        return PydanticJSONResponse(list(await asyncio.gather(*(run(item) for item in items))))
+
+    # -----------------------------------------------------------------------------
+    # 🚦 _busy_response(): The error returned when the scheduler sheds load
+    # -----------------------------------------------------------------------------
+    def _busy_response(self, request_id, error: SchedulerBusy) -> JSONRPCResponse:
+        return JSONRPCResponse(
+            id=request_id,
+            error=ServerBusyError(message=str(error), data={"retryAfter": error.retry_after})
+        )
 
     # -----------------------------------------------------------------------------
     # 🧾 _create_response(): Converts result object to JSONResponse
@@ -153,10 +479,53 @@ class A2AServer:
             result: The response object (must be a JSONRPCResponse)
 
         Returns:
-            JSONResponse: Starlette-compatible HTTP response with JSON body
+            PydanticJSONResponse: HTTP response whose body is encoded in a single pass
         """
         if isinstance(result, JSONRPCResponse):
-            # jsonable_encoder automatically handles datetime and UUID
-            return JSONResponse(content=jsonable_encoder(result.model_dump(exclude_none=True)))
+            # pydantic-core handles datetime and UUID while encoding to bytes
+            return PydanticJSONResponse(result)
         else:
             raise ValueError("Invalid response type")
+
+    # -----------------------------------------------------------------------------
+    # 📡 _create_stream_response(): Converts an async generator into an SSE stream
+    # -----------------------------------------------------------------------------
+    def _create_stream_response(
+        self,
+        request_id,
+        events: AsyncIterable[JSONRPCResponse],
+        on_close: Callable[[float], None] | None = None
+    ) -> StreamingResponse:
+        """
+        Wraps the task manager's async generator in a `text/event-stream` response.
+
+        Each JSONRPCResponse yielded by the task manager is sent to the client as
+        soon as it is produced, as one `data:` line of a Server-Sent Event.
+
+        Args:
+            request_id: ID of the JSON-RPC request (used if the stream fails)
+            events: Async generator of JSONRPCResponse objects
+            on_close: Called with the stream's duration in seconds once it ends
+                (used to release the scheduler slot)
+
+        Returns:
+            StreamingResponse: SSE response that stays open until the stream ends
+        """
+        async def event_stream():
+            started = time.monotonic()
+            try:
+                async for event in events:
+                    yield f"data: {encode_json(event).decode()}\n\n"
+            except Exception as e:
+                logger.error(f"Exception while streaming: {e}")
+                error = JSONRPCResponse(id=request_id, error=InternalError(message=str(e)))
+                yield f"data: {encode_json(error).decode()}\n\n"
+            finally:
+                if on_close is not None:
+                    on_close(time.monotonic() - started)
+
+        return StreamingResponse(
+            event_stream(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
@@ -0,0 +1,324 @@
+# =============================================================================
+# server/sqlite_task_store.py
+# =============================================================================
+# 🎯 Purpose:
+# A persistent TaskStore backed by SQLite in WAL (write-ahead log) mode, so
+# tasks and their conversation histories survive restarts.
+#
+# ✅ How it works:
+# - Each task is one row in `tasks`; each history message is one row in
+#   `messages`. Appending a message inserts a single row and bumps the task's
+#   version, without reading or rewriting the rest of the task.
+# - Creating a task never replaces one that already exists (possibly created
+#   meanwhile by another process): the stored task is read back instead.
+# - Writes are batched: concurrent writers are grouped into one transaction
+#   (group commit), and each caller returns once its write is durable.
+# - Tasks are loaded lazily on first access and kept in a small LRU cache.
+# - All SQLite work runs on one dedicated thread, keeping the event loop free.
+# - With the cache disabled (cache_size=0) every read goes to the database,
+#   so several worker processes can share one file (A2AServer.start(workers=N)).
+# - Push-notification webhooks live in `push_configs`, so every process
+#   sharing the file can deliver a task's updates.
+# =============================================================================
+
+
+# -----------------------------------------------------------------------------
+# 📚 Standard Python Imports
+# -----------------------------------------------------------------------------
+
+import json                                # Stores message parts / status as JSON text
+import asyncio                             # Futures used to wait for batched commits
+import logging                             # Used to log store lifecycle events
+import sqlite3                             # The embedded database engine
+from collections import OrderedDict        # LRU cache of loaded tasks
+from concurrent.futures import ThreadPoolExecutor   # One thread owns the connection
+
+
+# -----------------------------------------------------------------------------
+# 📦 Project Imports
+# -----------------------------------------------------------------------------
+
+from server.task_store import TaskStore
+from models.task import Task, TaskStatus, Message, PushNotificationConfig
+
+logger = logging.getLogger(__name__)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id         TEXT PRIMARY KEY,
+    status     TEXT NOT NULL,
+    version    INTEGER NOT NULL          -- Number of messages in the history
+);
+CREATE TABLE IF NOT EXISTS messages (
+    task_id    TEXT NOT NULL,
+    seq        INTEGER NOT NULL,
+    role       TEXT NOT NULL,
+    parts      TEXT NOT NULL,
+    PRIMARY KEY (task_id, seq)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS push_configs (
+    task_id    TEXT PRIMARY KEY,
+    config     TEXT NOT NULL
+);
+"""
+
+INSERT_TASK = "INSERT INTO tasks (id, status, version) VALUES (?, ?, ?) ON CONFLICT (id) DO NOTHING"
+INSERT_MESSAGE = "INSERT INTO messages (task_id, seq, role, parts) VALUES (?, ?, ?, ?)"
+# The newest message of a task, returned with its status / version by the updates below
+LATEST_MESSAGE = (
+    "(SELECT role FROM messages WHERE task_id = tasks.id AND seq = tasks.version - 1), "
+    "(SELECT parts FROM messages WHERE task_id = tasks.id AND seq = tasks.version - 1)"
+)
+UPDATE_STATUS = f"UPDATE tasks SET status = ? WHERE id = ? RETURNING version, {LATEST_MESSAGE}"
+APPEND_MESSAGE = (
+    "INSERT INTO messages (task_id, seq, role, parts) "
+    "SELECT id, version, ?, ? FROM tasks WHERE id = ?"
+)
+BUMP_VERSION = "UPDATE tasks SET version = version + 1 WHERE id = ? RETURNING status, version"
+DELETE_TASK = "DELETE FROM tasks WHERE id = ?"
+DELETE_MESSAGES = "DELETE FROM messages WHERE task_id = ?"
+SET_PUSH_CONFIG = "INSERT OR REPLACE INTO push_configs (task_id, config) VALUES (?, ?)"
+DELETE_PUSH_CONFIG = "DELETE FROM push_configs WHERE task_id = ?"
+
+
+# -----------------------------------------------------------------------------
+# 🗄️ SqliteTaskStore
+# -----------------------------------------------------------------------------
+
+class SqliteTaskStore(TaskStore):
+    """
+    💾 TaskStore that persists tasks to a SQLite database in WAL mode.
+    """
+
+    def __init__(self, path: str, batch_size: int = 256, cache_size: int = 1024):
+        """
+        Args:
+            path: File path of the SQLite database (created if missing)
+            batch_size: Max writes grouped into one transaction
+            cache_size: Number of loaded tasks kept in memory (0 disables the cache)
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.cache_size = cache_size
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-task-store")
+        self._conn: sqlite3.Connection | None = None   # Opened lazily on the store thread
+
+        self._cache: "OrderedDict[str, Task]" = OrderedDict()
+        self._pending: list[tuple[str, tuple, asyncio.Future]] = []
+        self._flusher: asyncio.Task | None = None
+
+    @property
+    def shared_across_processes(self) -> bool:
+        """Cached tasks could be stale if another process writes, so only without a cache."""
+        return self.cache_size == 0
+
+    # -------------------------------------------------------------------------
+    # 🔌 Connection (store thread only)
+    # -------------------------------------------------------------------------
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA busy_timeout=5000")
+            self._conn.executescript(SCHEMA)
+            logger.info(f"Opened SQLite task store at {self.path}")
+        return self._conn
+
+    def _commit(self, statements: list[tuple[str, tuple]]) -> list[tuple | None]:
+        """Run `statements` in one transaction; return each one's first row (RETURNING)."""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = [conn.execute(sql, params).fetchone() for sql, params in statements]
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return rows
+
+    def _insert(self, task: Task) -> Task:
+        """
+        Store a new task and its history, unless a task with its ID already
+        exists; return the stored task either way.
+        """
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            inserted = conn.execute(
+                INSERT_TASK, (task.id, task.status.model_dump_json(), len(task.history))
+            ).rowcount == 1
+            if inserted:
+                conn.executemany(INSERT_MESSAGE, [
+                    (task.id, seq, m.role, json.dumps([p.model_dump() for p in m.parts]))
+                    for seq, m in enumerate(task.history)
+                ])
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return self._load(task.id)
+
+    def _load(self, task_id: str) -> Task | None:
+        conn = self._connection()
+        row = conn.execute("SELECT status, version FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        if row is None:
+            return None
+        messages = conn.execute(
+            "SELECT role, parts FROM messages WHERE task_id = ? ORDER BY seq", (task_id,)
+        ).fetchall()
+        return Task(
+            id=task_id,
+            status=TaskStatus.model_validate_json(row[0]),
+            history=[Message(role=role, parts=json.loads(parts)) for role, parts in messages],
+            version=row[1]
+        )
+
+    def _load_push_config(self, task_id: str) -> PushNotificationConfig | None:
+        row = self._connection().execute(
+            "SELECT config FROM push_configs WHERE task_id = ?", (task_id,)
+        ).fetchone()
+        return PushNotificationConfig.model_validate_json(row[0]) if row is not None else None
+
+    def _close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    # -------------------------------------------------------------------------
+    # 📝 Batched writes (group commit)
+    # -------------------------------------------------------------------------
+    async def _write(self, *statements: tuple[str, tuple]) -> tuple | None:
+        """
+        Queue statements for the next batch and wait until they are committed.
+        Returns the first row produced by the last statement (None without one).
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        for i, (sql, params) in enumerate(statements):
+            # Only the last statement resolves the future; all of them share one batch
+            self._pending.append((sql, params, future if i == len(statements) - 1 else None))
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush())
+        return await future
+
+    async def _flush(self):
+        """Commit queued writes, `batch_size` statements per transaction, until none are left."""
+        loop = asyncio.get_running_loop()
+        while self._pending:
+            cut = self.batch_size
+            # Never split the statements of one write across two transactions
+            while cut < len(self._pending) and self._pending[cut - 1][2] is None:
+                cut += 1
+            batch, self._pending = self._pending[:cut], self._pending[cut:]
+            try:
+                rows = await loop.run_in_executor(
+                    self._executor, self._commit, [(sql, params) for sql, params, _ in batch]
+                )
+            except Exception as e:
+                logger.error(f"SQLite task store write failed: {e}")
+                for _, _, future in batch:
+                    if future is not None and not future.done():
+                        future.set_exception(e)
+            else:
+                for (_, _, future), row in zip(batch, rows):
+                    if future is not None and not future.done():
+                        future.set_result(row)
+
+    # -------------------------------------------------------------------------
+    # 🧠 Cache
+    # -------------------------------------------------------------------------
+    def _remember(self, task: Task) -> Task:
+        if self.cache_size > 0:
+            self._cache[task.id] = task
+            self._cache.move_to_end(task.id)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return task
+
+    # -------------------------------------------------------------------------
+    # 📥 TaskStore interface
+    # -------------------------------------------------------------------------
+    async def get(self, task_id: str) -> Task | None:
+        task = self._cache.get(task_id)
+        if task is not None:
+            self._cache.move_to_end(task_id)
+            return task
+
+        # Lazy load: make sure queued writes are visible, then read the task's rows
+        task = await self._read(self._load, task_id)
+        return self._remember(task) if task is not None else None
+
+    async def _read(self, fn, *args):
+        """Run `fn` on the store thread once queued writes are committed."""
+        if self._flusher is not None and not self._flusher.done():
+            await asyncio.shield(self._flusher)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+    async def create(self, task: Task) -> Task:
+        """
+        Store a new task. If another process created a task with the same ID
+        first, that one is kept and returned instead.
+        """
+        # Its own transaction: the history is only written if the task row was
+        return self._remember(await self._read(self._insert, task))
+
+    async def append_message(self, task_id: str, message: Message) -> Task:
+        """
+        Append `message` with a single insert and version bump. Unless the task
+        is cached, the returned Task's history holds only `message`.
+        """
+        parts = json.dumps([p.model_dump() for p in message.parts])
+        row = await self._write(
+            (APPEND_MESSAGE, (message.role, parts, task_id)), (BUMP_VERSION, (task_id,))
+        )
+        if row is None:
+            raise KeyError(task_id)
+        status, version = TaskStatus.model_validate_json(row[0]), row[1]
+
+        task = self._cache.get(task_id)
+        if task is None:
+            return Task(id=task_id, status=status, history=[message], version=version)
+        task.history.append(message)
+        task.version = version
+        return task
+
+    async def set_status(self, task_id: str, status: TaskStatus) -> Task:
+        """
+        Replace the status with a single update. Unless the task is cached,
+        the returned Task's history holds only its newest message.
+        """
+        row = await self._write((UPDATE_STATUS, (status.model_dump_json(), task_id)))
+        if row is None:
+            raise KeyError(task_id)
+        version, role, parts = row
+
+        task = self._cache.get(task_id)
+        if task is None:
+            history = [Message(role=role, parts=json.loads(parts))] if role is not None else []
+            return Task(id=task_id, status=status, history=history, version=version)
+        task.status = status
+        return task
+
+    async def delete(self, task_id: str) -> None:
+        self._cache.pop(task_id, None)
+        await self._write(
+            (DELETE_MESSAGES, (task_id,)), (DELETE_PUSH_CONFIG, (task_id,)), (DELETE_TASK, (task_id,))
+        )
+
+    async def set_push_config(self, task_id: str, config: PushNotificationConfig) -> None:
+        await self._write((SET_PUSH_CONFIG, (task_id, config.model_dump_json())))
+
+    async def get_push_config(self, task_id: str) -> PushNotificationConfig | None:
+        return await self._read(self._load_push_config, task_id)
+
+    async def close(self) -> None:
+        """Commit all queued writes and close the database."""
+        if self._flusher is not None and not self._flusher.done():
+            await self._flusher
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._close)
+        self._executor.shutdown(wait=True)
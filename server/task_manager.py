@@ -6,12 +6,24 @@
 #
 # ✅ Includes:
 # - A base abstract class `TaskManager` that outlines required methods
-# - A simple `InMemoryTaskManager` that keeps tasks temporarily in memory
+# - A simple `InMemoryTaskManager` that keeps tasks temporarily in memory,
+#   in a bounded store (see server/task_store.py) so memory use stays capped,
+#   or in any other `TaskStore` (e.g., SQLite) passed to it
 #
-# ❌ Does not include:
-# - Cancel task functionality
-# - Push notifications or real-time updates
-# - Persistent storage (like a database)
+# - A streaming hook (`on_send_task_subscribe`) that task managers implement
+#   as an async generator of Server-Sent-Event updates
+#
+# - Long-polling for `tasks/get`: a request can wait until the task changes
+#   instead of the client polling in a tight loop
+#
+# - An optional asynchronous mode: `tasks/send` returns right away and a pool
+#   of background workers runs the task (results via `tasks/get` or streaming)
+#
+# - Push notifications: task changes are handed to a PushNotificationDispatcher,
+#   which POSTs them to the webhook registered for the task
+#
+# - Cancellation (`tasks/cancel`): the coroutine running a task is cancelled,
+#   which also cancels the calls it made to other agents
 # =============================================================================
 
 
@@ -20,8 +32,9 @@
 # -----------------------------------------------------------------------------
 
 from abc import ABC, abstractmethod        # Lets us define abstract base classes (like an interface)
-from typing import Dict                    # Dict is a dictionary type for storing key-value pairs
+from typing import AsyncIterable           # Return type for streaming (async generator) methods
 import asyncio                             # Used here for locks to safely handle concurrency (async operations)
+import logging                             # Used to log background task failures
 
 
 # -----------------------------------------------------------------------------
@@ -30,14 +43,35 @@ import asyncio                             # Used here for locks to safely handl
 
 from models.request import (
     SendTaskRequest, SendTaskResponse,    # For sending tasks to the agent
-    GetTaskRequest, GetTaskResponse       # For querying task info from the agent
+    GetTaskRequest, GetTaskResponse,      # For querying task info from the agent
+    SendTaskStreamingRequest,             # For sending tasks and streaming updates back
+    SendTaskStreamingResponse,
+    SetTaskPushNotificationRequest, SetTaskPushNotificationResponse,   # Webhook registration
+    GetTaskPushNotificationRequest, GetTaskPushNotificationResponse,
+    CancelTaskRequest, CancelTaskResponse  # For stopping a queued or running task
 )
 
+from server.task_store import TaskStore, InMemoryTaskStore   # Pluggable storage; default is bounded RAM
+from server.task_store import TERMINAL_STATES                 # States a task can't be canceled from
+from server.push_notifications import PushNotificationDispatcher   # Webhook delivery
+from server.push_notifications import InvalidWebhookError          # Raised for webhooks we won't call
+
+from models.json_rpc import TaskNotFoundError   # Error returned for unknown task IDs
+from models.json_rpc import InternalError       # Error returned when the task queue is full
+from models.json_rpc import PushNotificationNotSupportedError
+from models.json_rpc import InvalidParamsError  # Error returned for a refused webhook URL
+from models.json_rpc import TaskNotCancelableError   # Error returned when a task already finished
+
 from models.task import (
     Task, TaskSendParams, TaskQueryParams,  # Task and input models
-    TaskStatus, TaskState, Message          # Task metadata and history objects
+    TaskStatus, TaskState, Message,         # Task metadata and history objects
+    TaskStatusUpdateEvent,                  # Streaming status events
+    TextPart,
+    TaskPushNotificationConfig              # A task's webhook
 )
 
+logger = logging.getLogger(__name__)
+
 
 # -----------------------------------------------------------------------------
 # 🧩 TaskManager (Abstract Base Class)
@@ -51,6 +85,9 @@ class TaskManager(ABC):
     - on_send_task(): to receive and process new tasks
     - on_get_task(): to fetch the current status or conversation history of a task
 
+    Task Managers that can report progress incrementally also implement:
+    - on_send_task_subscribe(): an async generator of streaming updates
+
     This makes sure all implementations follow a consistent structure.
     """
 
@@ -64,6 +101,44 @@ class TaskManager(ABC):
         """📤 This method will return task details by task ID."""
         pass
 
+    async def close(self):
+        """🔌 Release resources (e.g., flush storage) when the server shuts down."""
+        pass
+
+    async def on_set_task_push_notification(
+        self, request: SetTaskPushNotificationRequest
+    ) -> SetTaskPushNotificationResponse:
+        """🔔 Register a webhook that receives the task's updates."""
+        return SetTaskPushNotificationResponse(id=request.id, error=PushNotificationNotSupportedError())
+
+    async def on_get_task_push_notification(
+        self, request: GetTaskPushNotificationRequest
+    ) -> GetTaskPushNotificationResponse:
+        """🔔 Return the webhook registered for a task."""
+        return GetTaskPushNotificationResponse(id=request.id, error=PushNotificationNotSupportedError())
+
+    async def on_cancel_task(self, request: CancelTaskRequest) -> CancelTaskResponse:
+        """🛑 Stop a queued or running task."""
+        return CancelTaskResponse(id=request.id, error=TaskNotCancelableError())
+
+    def on_send_task_subscribe(
+        self, request: SendTaskStreamingRequest
+    ) -> AsyncIterable[SendTaskStreamingResponse]:
+        """📡 This method will stream status/artifact updates for a new task."""
+        raise NotImplementedError("Streaming is not supported by this task manager")
+
+
+# -----------------------------------------------------------------------------
+# 👀 _TaskWatch: Wakes long-poll requests waiting on one task
+# -----------------------------------------------------------------------------
+
+class _TaskWatch:
+    """An event set on the next change to a task, and how many requests wait on it."""
+
+    def __init__(self):
+        self.event = asyncio.Event()
+        self.waiters = 0
+
 
 # -----------------------------------------------------------------------------
 # 🧠 InMemoryTaskManager
@@ -78,12 +153,108 @@ class InMemoryTaskManager(TaskManager):
     - Local development
     - Single-session interactions
 
-    ❗ Not for production: Data is lost when the app stops or restarts.
+    Tasks are kept in a bounded `InMemoryTaskStore`: finished tasks are
+    evicted by count, by TTL, and by an approximate memory budget (running
+    tasks are kept even past those limits).
+
+    Subclasses implement `process_task()` (turn a request into the agent's
+    reply text); `on_send_task()` takes care of storing the task and the
+    reply. With `async_workers > 0`, tasks sent with `"metadata": {"async": true}`
+    (or every task, if `async_by_default`) are queued and answered right away
+    with their "submitted" status; a pool of background workers runs them.
+
+    ❗ Not for production: Data is lost when the app stops or restarts,
+    unless a persistent `task_store` (e.g., SqliteTaskStore) is passed in.
     """
 
-    def __init__(self):
-        self.tasks: Dict[str, Task] = {}   # 🗃️ Dictionary where key = task ID, value = Task object
-        self.lock = asyncio.Lock()         # 🔐 Async lock to ensure two requests don't modify data at the same time
+    def __init__(
+        self,
+        lock_stripes: int = 64,
+        max_tasks: int | None = 10_000,
+        completed_ttl: float | None = 3600.0,
+        max_bytes: int | None = 256 * 1024 * 1024,
+        task_store: TaskStore | None = None,
+        max_wait_timeout: float = 60.0,
+        poll_interval: float = 1.0,
+        async_workers: int = 0,
+        async_queue_size: int = 1000,
+        async_by_default: bool = False,
+        push_notifier: PushNotificationDispatcher | None = None,
+        cancel_timeout: float = 5.0,
+    ):
+        """
+        Args:
+            lock_stripes: Number of per-task locks (tasks hash onto them)
+            max_tasks, completed_ttl, max_bytes: Limits of the default in-memory store
+            task_store: Storage backend to use instead of the default in-memory store
+            max_wait_timeout: Upper bound, in seconds, on a long-poll `waitTimeout`
+            poll_interval: How often a long-poll (or, with a shared store, a running
+                task watching for tasks/cancel) re-reads the store, so changes made
+                by other processes sharing the store are noticed too
+            async_workers: Background workers running queued tasks (0 = no async mode)
+            async_queue_size: Max tasks waiting for a worker
+            async_by_default: Run every task asynchronously unless its metadata says
+                `"async": false`
+            push_notifier: Delivers task changes to registered webhooks
+                (None = push notifications are not supported)
+            cancel_timeout: Seconds `tasks/cancel` waits for a running task to stop
+        """
+        # 🗃️ Task storage, key = task ID, value = Task object (bounded RAM unless a store is given)
+        self.tasks: TaskStore = task_store if task_store is not None else InMemoryTaskStore(
+            max_tasks=max_tasks,
+            completed_ttl=completed_ttl,
+            max_bytes=max_bytes
+        )
+        # 🔐 Task IDs whose get-or-create is in progress; the future is done once it finished.
+        # Claimed and released without awaiting, so this needs no lock and never waits on the store
+        self._creating: dict[str, asyncio.Future] = {}
+
+        # 🔐 Striped per-task locks: a task always maps to the same lock, so updates
+        # to one task are serialized while unrelated tasks almost never contend
+        self._task_locks = [asyncio.Lock() for _ in range(max(1, lock_stripes))]
+
+        # 👀 Long-poll bookkeeping: task ID -> watch set on that task's next change
+        self.max_wait_timeout = max_wait_timeout
+        self.poll_interval = poll_interval
+        self._watches: dict[str, _TaskWatch] = {}
+
+        # ⚙️ Async mode: queued (task ID, request) pairs drained by `async_workers` workers
+        self.async_workers = async_workers
+        self.async_by_default = async_by_default
+        self.async_queue: asyncio.Queue[tuple[str, SendTaskRequest]] = asyncio.Queue(maxsize=async_queue_size)
+        self._workers: list[asyncio.Task] = []
+
+        # 📬 Webhook delivery for push notifications (webhooks are kept in the task store)
+        self.push_notifier = push_notifier
+        if push_notifier is not None:
+            push_notifier.bind_store(self.tasks)
+
+        # 🛑 Running process_task() coroutines (and streaming relays) by task ID, so tasks/cancel can stop them
+        self.cancel_timeout = cancel_timeout
+        self._running: dict[str, asyncio.Task] = {}
+
+    # -------------------------------------------------------------------------
+    # 🔐 task_lock: The lock guarding a single task's status and history
+    # -------------------------------------------------------------------------
+    def task_lock(self, task_id: str) -> asyncio.Lock:
+        """
+        Return the striped lock for `task_id`. Hold it while reading or
+        changing that task's status or history.
+        """
+        return self._task_locks[hash(task_id) % len(self._task_locks)]
+
+    # -------------------------------------------------------------------------
+    # 🔌 close: Flush and close the task store
+    # -------------------------------------------------------------------------
+    async def close(self):
+        """Stop the background workers, then flush pending writes and close the task store."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+        if self.push_notifier is not None:
+            await self.push_notifier.close()
+        await self.tasks.close()
 
     # -------------------------------------------------------------------------
     # 💾 upsert_task: Create or update a task in memory
@@ -97,9 +268,22 @@ class InMemoryTaskManager(TaskManager):
 
         Returns:
             Task – the newly created or updated task
+
+        Raises:
+            InvalidWebhookError: if `params.pushNotification` names a webhook
+                the dispatcher refuses to call (nothing is stored then)
         """
-        async with self.lock:
-            task = self.tasks.get(params.id)  # Try to find an existing task with this ID
+        if params.pushNotification is not None and self.push_notifier is not None:
+            await self.push_notifier.set_config(params.id, params.pushNotification)
+
+        # Only one request per task ID looks it up / creates it at a time; requests
+        # for other tasks don't wait, and the store I/O runs without any shared lock
+        while (pending := self._creating.get(params.id)) is not None:
+            await asyncio.wait([pending])
+
+        claim = self._creating[params.id] = asyncio.get_running_loop().create_future()
+        try:
+            task = await self.tasks.get(params.id)  # Try to find an existing task with this ID
 
             if task is None:
                 # If task doesn't exist, create it with a "submitted" status
@@ -108,25 +292,360 @@ class InMemoryTaskManager(TaskManager):
                     status=TaskStatus(state=TaskState.SUBMITTED),
                     history=[params.message]
                 )
-                self.tasks[params.id] = task
-            else:
-                # If task exists, add the new message to its history
-                task.history.append(params.message)
+                created = await self.tasks.create(task)
+                # Unless another process sharing the store created it first:
+                # then our message is appended to that task below
+                if created.history == task.history:
+                    self._task_changed(created)
+                    return created
+        finally:
+            del self._creating[params.id]
+            claim.set_result(None)
+
+        # If task exists, add the new message to its history (only this task is locked)
+        async with self.task_lock(params.id):
+            task = await self.tasks.append_message(params.id, params.message)
+        self._task_changed(task)
+        return task
+
+    # -------------------------------------------------------------------------
+    # 🔄 update_task: Change a task's state and optionally record a reply
+    # -------------------------------------------------------------------------
+    async def update_task(self, task_id: str, state: TaskState, message: Message | None = None) -> Task:
+        """
+        Set the task's status and append `message` (e.g., the agent's reply)
+        to its history, holding only that task's lock.
+
+        Args:
+            task_id: ID of an existing task
+            state: The new TaskState
+            message: Optional message to append to the history
 
-            return task
+        Returns:
+            Task – the updated task
+        """
+        async with self.task_lock(task_id):
+            task = await self.tasks.set_status(task_id, TaskStatus(state=state))
+            if message is not None:
+                task = await self.tasks.append_message(task_id, message)
+        self._task_changed(task)
+        return task
 
     # -------------------------------------------------------------------------
-    # 🚫 on_send_task: Must be implemented by any subclass
+    # ✅ complete_task: Record the agent's reply, unless the task was canceled
     # -------------------------------------------------------------------------
-    async def on_send_task(self, request: SendTaskRequest) -> SendTaskResponse:
+    async def complete_task(self, task_id: str, reply: Message) -> Task:
         """
-        This method is intentionally not implemented here.
-        Subclasses like `AgentTaskManager` should override it.
+        Mark the task "completed" with `reply` appended to its history. A task
+        that was canceled meanwhile (by tasks/cancel, possibly in another
+        process sharing the store) stays canceled and is returned unchanged.
+        """
+        async with self.task_lock(task_id):
+            task = await self.tasks.get(task_id)
+            if task is not None and task.status.state == TaskState.CANCELED:
+                return task
+            task = await self.tasks.set_status(task_id, TaskStatus(state=TaskState.COMPLETED))
+            task = await self.tasks.append_message(task_id, reply)
+        self._task_changed(task)
+        return task
+
+    # -------------------------------------------------------------------------
+    # 📣 _task_changed: Tell long-polls and webhooks about a change
+    # -------------------------------------------------------------------------
+    def _task_changed(self, task: Task):
+        """Wake long-poll requests and queue a push notification (with the newest message)."""
+        self._notify(task.id)
+        if self.push_notifier is not None:
+            self.push_notifier.notify(self._history_view(task, 1))
+
+    # -------------------------------------------------------------------------
+    # 👀 Long-poll: wait for a task to change
+    # -------------------------------------------------------------------------
+    def _notify(self, task_id: str):
+        """Wake every long-poll request waiting on `task_id`."""
+        watch = self._watches.pop(task_id, None)
+        if watch is not None:
+            watch.event.set()
+
+    async def wait_for_change(
+        self,
+        task_id: str,
+        timeout: float,
+        since_version: int | None = None,
+        known_state: str | None = None,
+    ) -> Task | None:
+        """
+        Wait until the task's version passes `since_version` or its state
+        differs from `known_state`, or until `timeout` seconds have passed
+        (capped at `max_wait_timeout`). If neither condition is given, wait
+        for any change from the task as it is now.
+
+        Returns:
+            Task – the task as it is when the wait ends (changed or not),
+            or None if the task doesn't exist
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + min(timeout, self.max_wait_timeout)
+
+        task = await self.tasks.get(task_id)
+        if task is None:
+            return None
+        if since_version is None and known_state is None:
+            since_version, known_state = task.version, task.status.state
+
+        def changed(task: Task) -> bool:
+            return (
+                (since_version is not None and task.version > since_version)
+                or (known_state is not None and task.status.state != known_state)
+            )
+
+        while not changed(task):
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+
+            watch = self._watches.setdefault(task_id, _TaskWatch())
+            watch.waiters += 1
+            try:
+                # Woken by _notify(); the periodic timeout re-reads the store anyway
+                await asyncio.wait_for(watch.event.wait(), min(remaining, self.poll_interval))
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                watch.waiters -= 1
+                if watch.waiters == 0 and self._watches.get(task_id) is watch:
+                    del self._watches[task_id]
+
+            task = await self.tasks.get(task_id)
+            if task is None:
+                return None
+
+        return task
+
+    # -------------------------------------------------------------------------
+    # ✂️ _history_view: Copy of a task carrying only part of its history
+    # -------------------------------------------------------------------------
+    def _history_view(
+        self, task: Task, history_length: int | None = None, since_version: int | None = None
+    ) -> Task:
+        """
+        Return a copy of `task` whose history holds only the requested messages,
+        so responses don't re-send the whole transcript every turn.
+
+        Args:
+            task: The stored task (left untouched)
+            history_length: Keep at most the last N messages (None = no limit)
+            since_version: Keep only messages added after this task version
+
+        Returns:
+            Task – a copy with the trimmed history and the task's current version
+        """
+        history = task.history
+        if since_version is not None:
+            # Version N starts at message N; `history` may lack the oldest messages
+            history = history[max(0, since_version - (task.version - len(history))):]
+        if history_length is not None:
+            history = history[max(0, len(history) - history_length):]
+        return task.model_copy(update={"history": list(history)})
+
+    # -------------------------------------------------------------------------
+    # 🚫 process_task: Must be implemented by any subclass
+    # -------------------------------------------------------------------------
+    async def process_task(self, request: SendTaskRequest) -> str:
+        """
+        Produce the agent's reply text for a task. Subclasses like
+        `AgentTaskManager` implement this by calling their agent.
 
         Raises:
             NotImplementedError: if someone tries to use it directly
         """
-        raise NotImplementedError("on_send_task() must be implemented in subclass")
+        raise NotImplementedError("process_task() must be implemented in subclass")
+
+    # -------------------------------------------------------------------------
+    # 📥 on_send_task: Store the task, run it (now or in the background), reply
+    # -------------------------------------------------------------------------
+    async def on_send_task(self, request: SendTaskRequest) -> SendTaskResponse:
+        """
+        Handle `tasks/send`:
+
+        1. Save the task (or append the new message to an existing one)
+        2. Synchronous mode: run `process_task()` and store the reply
+           Async mode: queue the task and return its "submitted" status
+        3. Return the task with only the history the caller asked for
+        """
+        try:
+            task = await self.upsert_task(request.params)
+        except InvalidWebhookError as e:
+            return SendTaskResponse(id=request.id, error=InvalidParamsError(message=str(e)))
+
+        if self._run_async(request):
+            task = await self.update_task(task.id, TaskState.SUBMITTED)
+            try:
+                self._enqueue(task.id, request)
+            except asyncio.QueueFull:
+                await self.update_task(task.id, TaskState.FAILED)
+                return SendTaskResponse(id=request.id, error=InternalError(message="Task queue is full"))
+        else:
+            task = await self._execute(task.id, request)
+
+        history_length = request.params.historyLength
+        wanted = task.version if history_length is None else min(history_length, task.version)
+        if len(task.history) < wanted:
+            # The store returned only the newest messages: read the history asked for
+            task = await self.tasks.get(task.id) or task
+
+        return SendTaskResponse(
+            id=request.id,
+            result=self._history_view(task, request.params.historyLength)
+        )
+
+    # -------------------------------------------------------------------------
+    # ▶️ _execute: Run one task to completion
+    # -------------------------------------------------------------------------
+    async def _execute(self, task_id: str, request: SendTaskRequest) -> Task:
+        """
+        Move the task to "working", run `process_task()` and record the reply
+        as "completed". If it raises, the task is marked "failed" and the
+        exception propagates.
+
+        `process_task()` runs in its own asyncio task so `tasks/cancel` can
+        stop it; the task is then marked "canceled" and returned as such.
+        """
+        await self.update_task(task_id, TaskState.WORKING)
+
+        runner = self._start_runner(task_id, self.process_task(request))
+        try:
+            reply_text = await runner
+        except asyncio.CancelledError:
+            task = await asyncio.shield(self.update_task(task_id, TaskState.CANCELED))
+            if asyncio.current_task().cancelling():
+                raise                      # We were cancelled ourselves (e.g., shutdown)
+            return task                    # Only the runner was cancelled, by tasks/cancel
+        except Exception:
+            await asyncio.shield(self.update_task(task_id, TaskState.FAILED))
+            raise
+        finally:
+            self._forget_runner(task_id, runner)
+
+        # tasks/cancel may have been handled by another process sharing the store
+        # just before we finished: complete_task keeps its verdict
+        reply = Message(role="agent", parts=[TextPart(text=reply_text)])
+        return await self.complete_task(task_id, reply)
+
+    # -------------------------------------------------------------------------
+    # 🛑 Runners: coroutines that tasks/cancel can stop
+    # -------------------------------------------------------------------------
+    def _start_runner(self, task_id: str, coro) -> asyncio.Task:
+        """
+        Run `coro` (the work behind a task) in its own asyncio task, registered
+        so `tasks/cancel` can stop it. With a store shared across processes,
+        the cancel may reach another process: the stored status is then polled
+        every `poll_interval` seconds and the runner stopped once it is "canceled".
+        """
+        runner = asyncio.ensure_future(coro)
+        self._running[task_id] = runner
+        if self.tasks.shared_across_processes:
+            watcher = asyncio.create_task(self._watch_for_cancel(task_id, runner))
+            runner.add_done_callback(lambda _: watcher.cancel())
+        return runner
+
+    def _forget_runner(self, task_id: str, runner: asyncio.Task):
+        if self._running.get(task_id) is runner:
+            del self._running[task_id]
+
+    async def _watch_for_cancel(self, task_id: str, runner: asyncio.Task):
+        while not runner.done():
+            await asyncio.sleep(self.poll_interval)
+            task = await self.tasks.get(task_id)
+            if task is not None and task.status.state == TaskState.CANCELED:
+                logger.info(f"Task {task_id} was canceled by another process, stopping it")
+                runner.cancel()
+                return
+
+    # -------------------------------------------------------------------------
+    # ⚙️ Async mode: task queue and background workers
+    # -------------------------------------------------------------------------
+    def _run_async(self, request: SendTaskRequest) -> bool:
+        """True if this task should run on the background workers."""
+        if self.async_workers <= 0:
+            return False
+        metadata = request.params.metadata or {}
+        return bool(metadata.get("async", self.async_by_default))
+
+    def _enqueue(self, task_id: str, request: SendTaskRequest):
+        """Queue a task for the workers (starting them on first use)."""
+        if not self._workers:
+            self._workers = [
+                asyncio.create_task(self._worker(), name=f"task-worker-{i}")
+                for i in range(self.async_workers)
+            ]
+        self.async_queue.put_nowait((task_id, request))
+
+    async def _worker(self):
+        """Run queued tasks one at a time, forever."""
+        while True:
+            task_id, request = await self.async_queue.get()
+            try:
+                task = await self.tasks.get(task_id)
+                if task is None or task.status.state == TaskState.CANCELED:
+                    continue               # Canceled (or evicted) while waiting in the queue
+                await self._execute(task_id, request)
+            except Exception as e:
+                logger.error(f"Background task {task_id} failed: {e}")
+            finally:
+                self.async_queue.task_done()
+
+    # -------------------------------------------------------------------------
+    # 📡 on_send_task_subscribe: Default (non-incremental) streaming
+    # -------------------------------------------------------------------------
+    async def on_send_task_subscribe(
+        self, request: SendTaskStreamingRequest
+    ) -> AsyncIterable[SendTaskStreamingResponse]:
+        """
+        Stream a task's progress as Server-Sent-Event updates.
+
+        This default runs the regular `on_send_task` and reports it as a
+        "working" event followed by a final event carrying the reply.
+        Subclasses that can produce partial output should override it with
+        their own async generator.
+
+        Yields:
+            SendTaskStreamingResponse – one status or artifact update per event
+        """
+        params = request.params
+
+        yield SendTaskStreamingResponse(
+            id=request.id,
+            result=TaskStatusUpdateEvent(
+                id=params.id,
+                status=TaskStatus(state=TaskState.WORKING)
+            )
+        )
+
+        # Only the reply is needed for the final event; the stream itself waits for it
+        metadata = {**(params.metadata or {}), "async": False}
+        response = await self.on_send_task(
+            SendTaskRequest(
+                id=request.id,
+                params=params.model_copy(update={"historyLength": 1, "metadata": metadata})
+            )
+        )
+        if response.error:
+            yield SendTaskStreamingResponse(id=request.id, error=response.error)
+            return
+
+        task = response.result
+        yield SendTaskStreamingResponse(
+            id=request.id,
+            result=TaskStatusUpdateEvent(
+                id=task.id,
+                status=TaskStatus(
+                    state=task.status.state,
+                    message=task.history[-1] if task.history else None
+                ),
+                final=True
+            )
+        )
 
     # -------------------------------------------------------------------------
     # 📥 on_get_task: Fetch a task by its ID
@@ -135,25 +654,112 @@ class InMemoryTaskManager(TaskManager):
         """
         Look up a task using its ID, and optionally return only recent messages.
 
+        If `waitTimeout` is set, the response is held (long-poll) until the
+        task changes or the timeout expires; see `wait_for_change`.
+
         Args:
             request: A GetTaskRequest with an ID and optional history length
 
         Returns:
             GetTaskResponse – contains the task if found, or an error message
         """
-        async with self.lock:
-            query: TaskQueryParams = request.params
-            task = self.tasks.get(query.id)
+        query: TaskQueryParams = request.params
+        if query.waitTimeout:
+            task = await self.wait_for_change(
+                query.id, query.waitTimeout, query.sinceVersion, query.knownState
+            )
+        else:
+            task = await self.tasks.get(query.id)
+
+        if not task:
+            # If task not found, return a structured error
+            return GetTaskResponse(id=request.id, error=TaskNotFoundError())
+
+        async with self.task_lock(query.id):
+            # Optional: Only return messages after `sinceVersion` and/or the last N messages
+            task_copy = self._history_view(task, query.historyLength, query.sinceVersion)
+
+        return GetTaskResponse(id=request.id, result=task_copy)
+
+    # -------------------------------------------------------------------------
+    # 🔔 Push notifications: register / read a task's webhook
+    # -------------------------------------------------------------------------
+    async def on_set_task_push_notification(
+        self, request: SetTaskPushNotificationRequest
+    ) -> SetTaskPushNotificationResponse:
+        """
+        Register the webhook that receives this task's updates from now on.
+
+        Returns:
+            SetTaskPushNotificationResponse – the stored config, or an error if
+            push notifications are disabled, the task doesn't exist or the
+            webhook URL is refused
+        """
+        if self.push_notifier is None:
+            return SetTaskPushNotificationResponse(id=request.id, error=PushNotificationNotSupportedError())
+
+        params: TaskPushNotificationConfig = request.params
+        if await self.tasks.get(params.id) is None:
+            return SetTaskPushNotificationResponse(id=request.id, error=TaskNotFoundError())
+
+        try:
+            await self.push_notifier.set_config(params.id, params.pushNotificationConfig)
+        except InvalidWebhookError as e:
+            return SetTaskPushNotificationResponse(id=request.id, error=InvalidParamsError(message=str(e)))
+        return SetTaskPushNotificationResponse(id=request.id, result=params)
+
+    async def on_get_task_push_notification(
+        self, request: GetTaskPushNotificationRequest
+    ) -> GetTaskPushNotificationResponse:
+        """
+        Return the webhook registered for a task.
+
+        Returns:
+            GetTaskPushNotificationResponse – the config, or an error if push
+            notifications are disabled or no webhook is registered
+        """
+        if self.push_notifier is None:
+            return GetTaskPushNotificationResponse(id=request.id, error=PushNotificationNotSupportedError())
+
+        config = await self.push_notifier.get_config(request.params.id)
+        if config is None:
+            return GetTaskPushNotificationResponse(id=request.id, error=TaskNotFoundError())
+
+        return GetTaskPushNotificationResponse(
+            id=request.id,
+            result=TaskPushNotificationConfig(id=request.params.id, pushNotificationConfig=config)
+        )
+
+    # -------------------------------------------------------------------------
+    # 🛑 on_cancel_task: Stop a queued or running task
+    # -------------------------------------------------------------------------
+    async def on_cancel_task(self, request: CancelTaskRequest) -> CancelTaskResponse:
+        """
+        Cancel a task: a running `process_task()` coroutine (or a streaming
+        relay registered by a subclass) is cancelled, which also cancels the
+        requests it sent to other agents, and a queued task is skipped by the
+        workers.
+
+        Returns:
+            CancelTaskResponse – the canceled task, or an error if it doesn't
+            exist or has already finished
+        """
+        task_id = request.params.id
+        task = await self.tasks.get(task_id)
+
+        if task is None:
+            return CancelTaskResponse(id=request.id, error=TaskNotFoundError())
+        if task.status.state in TERMINAL_STATES:
+            return CancelTaskResponse(id=request.id, error=TaskNotCancelableError())
 
-            if not task:
-                # If task not found, return a structured error
-                return GetTaskResponse(id=request.id, error={"message": "Task not found"})
+        runner = self._running.get(task_id)
+        if runner is not None:
+            runner.cancel()
+            # _execute() (or the stream) marks the task canceled once the coroutine has stopped
+            await asyncio.wait([runner], timeout=self.cancel_timeout)
 
-            # Optional: Trim the history to only show the last N messages
-            task_copy = task.model_copy()  # Make a copy so we don't affect the original
-            if query.historyLength is not None:
-                task_copy.history = task_copy.history[-query.historyLength:]  # Get last N messages
-            else:
-                task_copy.history = task_copy.history
+        task = await self.tasks.get(task_id)
+        if task is not None and task.status.state != TaskState.CANCELED:
+            task = await self.update_task(task_id, TaskState.CANCELED)
 
-            return GetTaskResponse(id=request.id, result=task_copy)
+        return CancelTaskResponse(id=request.id, result=self._history_view(task, 1))
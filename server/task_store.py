@@ -0,0 +1,280 @@
+# =============================================================================
+# server/task_store.py
+# =============================================================================
+# 🎯 Purpose:
+# Storage for the tasks handled by a task manager.
+#
+# ✅ Includes:
+# - `TaskStore`: the interface every storage backend implements, so task
+#   managers can keep tasks in memory, in SQLite (server/sqlite_task_store.py)
+#   or anywhere else without changing their logic
+# - `InMemoryTaskStore`: a bounded in-memory store that evicts tasks so a
+#   long-running agent does not grow without limit:
+#     • max number of tasks (least-recently-used tasks are evicted first)
+#     • time-to-live for finished (completed/failed/canceled) tasks
+#     • approximate byte budget across all tasks and their histories
+#   Only finished tasks are evicted: a running task is still being updated,
+#   so the limits are soft and may be exceeded while every task is running.
+# =============================================================================
+
+
+# -----------------------------------------------------------------------------
+# 📚 Standard Python Imports
+# -----------------------------------------------------------------------------
+
+import time                                # Monotonic clock for TTLs
+from abc import ABC, abstractmethod        # For the TaskStore interface
+import logging                             # Used to warn when running tasks exceed the limits
+from collections import OrderedDict        # Keeps tasks in least-recently-used order
+
+
+# -----------------------------------------------------------------------------
+# 📦 Project Imports: Task Models
+# -----------------------------------------------------------------------------
+
+from models.task import Task, TaskStatus, TaskState, Message, PushNotificationConfig
+
+logger = logging.getLogger(__name__)
+
+
+# States after which a task will not change anymore (eligible for TTL eviction)
+TERMINAL_STATES = {TaskState.COMPLETED, TaskState.FAILED, TaskState.CANCELED}
+
+# Rough per-object overheads used for memory accounting (bytes)
+TASK_OVERHEAD_BYTES = 512
+MESSAGE_OVERHEAD_BYTES = 128
+
+
+def estimate_message_size(message: Message) -> int:
+    """Approximate memory used by one message: fixed overhead + text length."""
+    return MESSAGE_OVERHEAD_BYTES + sum(len(part.text) for part in message.parts)
+
+
+def estimate_task_size(task: Task) -> int:
+    """Approximate memory used by a task and its whole history."""
+    return TASK_OVERHEAD_BYTES + sum(estimate_message_size(m) for m in task.history)
+
+
+# -----------------------------------------------------------------------------
+# 🧩 TaskStore (Abstract Base Class)
+# -----------------------------------------------------------------------------
+
+class TaskStore(ABC):
+    """
+    🔧 Interface for task storage backends.
+
+    Tasks are created once and then changed only by appending messages or
+    replacing their status, so backends can store histories as append-only
+    rows. Methods that change a task return the up-to-date Task, whose
+    `version` is the number of messages in its history. To avoid reloading
+    the task, a backend may return it with only the newest message(s) in
+    `history`; `get()` always returns the whole history.
+    """
+
+    # True if several processes can use the store at once and always see each
+    # other's changes (required to serve one agent from several worker processes)
+    shared_across_processes: bool = False
+
+    @abstractmethod
+    async def get(self, task_id: str) -> Task | None:
+        """📤 Return the task, or None if it is unknown."""
+        pass
+
+    @abstractmethod
+    async def create(self, task: Task) -> Task:
+        """💾 Store a new task, or return the existing one if its ID is already taken."""
+        pass
+
+    @abstractmethod
+    async def append_message(self, task_id: str, message: Message) -> Task:
+        """➕ Append one message to the task's history."""
+        pass
+
+    @abstractmethod
+    async def set_status(self, task_id: str, status: TaskStatus) -> Task:
+        """🔄 Replace the task's status."""
+        pass
+
+    @abstractmethod
+    async def delete(self, task_id: str) -> None:
+        """🗑️ Remove the task (and its webhook), if present."""
+        pass
+
+    @abstractmethod
+    async def set_push_config(self, task_id: str, config: PushNotificationConfig) -> None:
+        """🔔 Register (or replace) the webhook receiving the task's updates."""
+        pass
+
+    @abstractmethod
+    async def get_push_config(self, task_id: str) -> PushNotificationConfig | None:
+        """🔔 Return the task's webhook, or None if it has none."""
+        pass
+
+    async def close(self) -> None:
+        """🔌 Flush pending writes and release resources (no-op by default)."""
+        pass
+
+
+# -----------------------------------------------------------------------------
+# 🧠 InMemoryTaskStore
+# -----------------------------------------------------------------------------
+
+class InMemoryTaskStore(TaskStore):
+    """
+    🗃️ Bounded in-memory task storage with LRU, TTL and memory-budget eviction.
+
+    Eviction counters are available in `stats` (by reason: "capacity",
+    "ttl" and "memory").
+
+    Only finished tasks are evicted, so the limits are soft: while every
+    task is still running, the store grows past them (with a warning).
+    """
+
+    def __init__(
+        self,
+        max_tasks: int | None = 10_000,
+        completed_ttl: float | None = 3600.0,
+        max_bytes: int | None = 256 * 1024 * 1024,
+    ):
+        """
+        Args:
+            max_tasks: Max number of tasks kept, running tasks excepted (None = unbounded)
+            completed_ttl: Seconds a finished task is kept (None = forever)
+            max_bytes: Approximate memory budget for all tasks (None = unbounded)
+        """
+        self.max_tasks = max_tasks
+        self.completed_ttl = completed_ttl
+        self.max_bytes = max_bytes
+
+        self._tasks: "OrderedDict[str, Task]" = OrderedDict()     # LRU order: oldest first
+        self._sizes: dict[str, int] = {}                          # Approximate bytes per task
+        self._finished: "OrderedDict[str, float]" = OrderedDict() # Finished tasks by finish time
+        self._push_configs: dict[str, PushNotificationConfig] = {}  # Webhooks by task ID
+        self.bytes = 0
+        self._over_budget = False                                 # Warned that running tasks exceed the limits
+
+        self.stats = {"capacity": 0, "ttl": 0, "memory": 0}
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._tasks
+
+    # -------------------------------------------------------------------------
+    # 📥 Reads
+    # -------------------------------------------------------------------------
+    async def get(self, task_id: str) -> Task | None:
+        """Return the task (marking it recently used), or None if unknown or expired."""
+        self._expire()
+        task = self._tasks.get(task_id)
+        if task is not None:
+            self._tasks.move_to_end(task_id)
+        return task
+
+    # -------------------------------------------------------------------------
+    # 💾 Writes
+    # -------------------------------------------------------------------------
+    async def create(self, task: Task) -> Task:
+        """Store a new task, evicting older ones if the store is over budget."""
+        if task.id in self._tasks:
+            return await self.get(task.id)
+        task.version = len(task.history)
+        self._tasks[task.id] = task
+        self._sizes[task.id] = estimate_task_size(task)
+        self.bytes += self._sizes[task.id]
+        self._track_finished(task)
+        self._enforce_limits()
+        return task
+
+    async def append_message(self, task_id: str, message: Message) -> Task:
+        """Append `message` to the task's history."""
+        task = self._tasks[task_id]
+        task.history.append(message)
+        task.version += 1
+        self._tasks.move_to_end(task_id)
+
+        size = estimate_message_size(message)
+        self._sizes[task_id] += size
+        self.bytes += size
+        self._enforce_limits()
+        return task
+
+    async def set_status(self, task_id: str, status: TaskStatus) -> Task:
+        """Replace the task's status (starting its TTL once it is finished)."""
+        task = self._tasks[task_id]
+        task.status = status
+        self._tasks.move_to_end(task_id)
+        self._track_finished(task)
+        return task
+
+    async def delete(self, task_id: str) -> None:
+        """Remove a task from the store, if present."""
+        if task_id in self._tasks:
+            self._remove(task_id)
+
+    async def set_push_config(self, task_id: str, config: PushNotificationConfig) -> None:
+        """Register the task's webhook (dropped together with the task)."""
+        self._push_configs[task_id] = config
+
+    async def get_push_config(self, task_id: str) -> PushNotificationConfig | None:
+        return self._push_configs.get(task_id)
+
+    # -------------------------------------------------------------------------
+    # 🧹 Eviction
+    # -------------------------------------------------------------------------
+    def _track_finished(self, task: Task):
+        """Remember when a task reached a terminal state (its TTL starts then)."""
+        if task.status.state in TERMINAL_STATES:
+            self._finished[task.id] = time.monotonic()
+            self._finished.move_to_end(task.id)
+        else:
+            self._finished.pop(task.id, None)
+
+    def _expire(self):
+        """Drop finished tasks whose TTL has passed (oldest first, stops at the first fresh one)."""
+        if self.completed_ttl is None:
+            return
+        cutoff = time.monotonic() - self.completed_ttl
+        while self._finished:
+            task_id, finished_at = next(iter(self._finished.items()))
+            if finished_at > cutoff:
+                break
+            self._remove(task_id)
+            self.stats["ttl"] += 1
+
+    def _enforce_limits(self):
+        """
+        Evict finished tasks, least recently used first, until both the
+        task-count and byte budgets are respected, or until only running
+        tasks are left.
+        """
+        self._expire()
+        while self._tasks:
+            if self.max_tasks is not None and len(self._tasks) > self.max_tasks:
+                reason = "capacity"
+            elif self.max_bytes is not None and self.bytes > self.max_bytes and len(self._tasks) > 1:
+                reason = "memory"
+            else:
+                self._over_budget = False
+                return
+            # Walk from the least recently used end; running tasks are skipped
+            victim = next((task_id for task_id in self._tasks if task_id in self._finished), None)
+            if victim is None:
+                break
+            self._remove(victim)
+            self.stats[reason] += 1
+
+        # Running tasks are never evicted (their next update would find nothing)
+        if not self._over_budget:
+            self._over_budget = True
+            logger.warning(
+                f"Task store over budget with {len(self._tasks)} running tasks: "
+                "keeping them until they finish"
+            )
+
+    def _remove(self, task_id: str):
+        self._tasks.pop(task_id, None)
+        self._finished.pop(task_id, None)
+        self._push_configs.pop(task_id, None)
+        self.bytes -= self._sizes.pop(task_id, 0)
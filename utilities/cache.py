@@ -0,0 +1,82 @@
+# utilities/cache.py
+# =============================================================================
+# 🎯 Purpose:
+# Small in-process caching helpers shared by the agents.
+#
+# - normalize_query(): canonical form of a user question, so trivially
+#   different spellings ("What is ML?" vs "what is ml") share a cache key
+# - TTLCache: a size-bounded LRU cache whose entries expire after a TTL,
+#   with hit/miss/eviction counters
+# =============================================================================
+
+import re                            # Regular expressions for query normalization
+import time                          # Monotonic clock for expiry
+from collections import OrderedDict  # Keeps entries in least-recently-used order
+from typing import Any, Hashable
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(text: str) -> str:
+    """
+    Normalize a query for exact-match lookups: lowercase, drop punctuation
+    and collapse runs of whitespace.
+
+    Example: "  What is   Machine-Learning?? " -> "what is machinelearning"
+    """
+    text = _PUNCTUATION.sub("", text.lower())
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+class TTLCache:
+    """
+    🗃️ Size-bounded LRU cache with per-entry time-to-live.
+
+    Counters are kept in `stats`: hits, misses, evictions (LRU, to stay under
+    `max_entries`) and expirations (entries older than `ttl`).
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float | None = 3600.0):
+        """
+        Args:
+            max_entries: Max number of cached entries
+            ttl: Seconds an entry stays valid (None = until evicted)
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any | None:
+        """Return the cached value for `key`, or None on a miss or expired entry."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+
+        stored_at, value = entry
+        if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+            del self._entries[key]
+            self.stats["expirations"] += 1
+            self.stats["misses"] += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        """Store `value`, evicting the least recently used entries if full."""
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def clear(self):
+        """Drop every entry (counters are kept)."""
+        self._entries.clear()
@@ -0,0 +1,145 @@
+# utilities/concept_cache.py
+# =============================================================================
+# 🎯 Purpose:
+# A response cache keyed on what a question is about rather than its exact
+# wording: "explain LoRA" and "what is LoRA?" share one cached answer.
+#
+# - Concept: the terms a question is about ("lora"), plus the optional
+#   context it is asked in ("in fine tuning"); filler words and simple
+#   plurals are folded away
+# - ConceptCache: LRU dictionary keyed on the concept, with a TTL; a lookup
+#   is O(1) whatever the number of cached answers
+#
+# ⚠️ Matching is exact on the concept terms: look-alike questions about
+# different things ("supervised" / "unsupervised learning") never share an
+# answer, and neither do synonyms ("neural nets" / "neural networks").
+# =============================================================================
+
+import re                            # Tokenization
+import time                          # Monotonic clock for expiry
+from collections import OrderedDict  # Keeps entries in least-recently-used order
+from typing import Any, NamedTuple
+
+_WORD = re.compile(r"\w+")
+
+# Words that carry no meaning for "which concept is being asked about"
+STOPWORDS = {
+    "a", "an", "the", "is", "are", "was", "what", "whats", "how", "why", "do", "does",
+    "explain", "describe", "define", "tell", "me", "about", "please", "can", "you",
+    "in", "of", "for", "to", "and", "or", "simple", "terms", "simply", "like", "im",
+    "i", "it", "its", "work", "works", "break", "down", "mean", "means",
+}
+
+# Words that start the context a concept is asked in ("LoRA in fine tuning")
+CONTEXT_WORDS = {"in", "within", "for"}
+
+
+# -----------------------------------------------------------------------------
+# 🎯 Concept extraction
+# -----------------------------------------------------------------------------
+
+class Concept(NamedTuple):
+    """What a question is about: its head terms and the context it is asked in."""
+    terms: frozenset[str]
+    context: frozenset[str]
+
+
+def _normalize(word: str) -> str:
+    """Fold simple plurals ("networks" -> "network")."""
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def extract_concept(text: str) -> Concept:
+    """
+    Split a question into its concept terms and context terms (the words
+    after the first "in"/"for"/"within" that follows a concept term),
+    ignoring stopwords.
+    """
+    terms: set[str] = set()
+    context: set[str] = set()
+    target = terms
+    for word in _WORD.findall(text.lower()):
+        if word in CONTEXT_WORDS and terms:
+            target = context
+        elif word not in STOPWORDS:
+            target.add(_normalize(word))
+    return Concept(frozenset(terms), frozenset(context))
+
+
+# -----------------------------------------------------------------------------
+# 🧠 ConceptCache
+# -----------------------------------------------------------------------------
+
+class ConceptCache:
+    """
+    🗃️ Cache that returns a stored answer when a new query has the same
+    concept terms as a cached one, and the same context unless one of the two
+    gives none ("explain LoRA" matches "LoRA in fine tuning", "dropout in
+    CNNs" doesn't match "dropout in RNNs").
+
+    Counters are kept in `stats`: hits, misses, evictions and expirations.
+    """
+
+    def __init__(self, capacity: int = 10_000, ttl: float | None = 24 * 3600.0):
+        """
+        Args:
+            capacity: Max cached entries; the least recently used is evicted beyond it
+            ttl: Seconds an entry stays valid (None = until evicted)
+        """
+        self.capacity = capacity
+        self.ttl = ttl
+        self._entries: "OrderedDict[Concept, tuple[float, Any]]" = OrderedDict()
+        self._contexts: dict[frozenset[str], set[frozenset[str]]] = {}   # Terms -> contexts cached for them
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, query: str) -> Any | None:
+        """Return the answer cached for a query about the same concept, or None."""
+        concept = extract_concept(query)
+        for key in self._candidates(concept):
+            stored_at, value = self._entries[key]
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                self._remove(key)
+                self.stats["expirations"] += 1
+                continue
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return value
+
+        self.stats["misses"] += 1
+        return None
+
+    def set(self, query: str, value: Any):
+        """Cache `value` for `query`, evicting the least recently used entries if full."""
+        concept = extract_concept(query)
+        if not concept.terms:
+            return                          # Nothing to recognize the question by
+
+        self._entries[concept] = (time.monotonic(), value)
+        self._entries.move_to_end(concept)
+        self._contexts.setdefault(concept.terms, set()).add(concept.context)
+        while len(self._entries) > self.capacity:
+            self._remove(next(iter(self._entries)))
+            self.stats["evictions"] += 1
+
+    def _candidates(self, concept: Concept) -> list[Concept]:
+        """Cached keys matching `concept`: the exact one first, then other compatible contexts."""
+        contexts = self._contexts.get(concept.terms)
+        if not contexts:
+            return []
+        if concept.context:
+            compatible = [c for c in (concept.context, frozenset()) if c in contexts]
+        else:
+            compatible = sorted(contexts, key=len)    # No context asked: prefer the general answer
+        return [Concept(concept.terms, context) for context in compatible]
+
+    def _remove(self, key: Concept):
+        del self._entries[key]
+        contexts = self._contexts[key.terms]
+        contexts.discard(key.context)
+        if not contexts:
+            del self._contexts[key.terms]
@@ -5,12 +5,40 @@
 # It reads a registry of agent base URLs (from a JSON file) and fetches
 # each agent's metadata (AgentCard) from the standard discovery endpoint.
 # This allows any client or agent to dynamically learn about available agents.
+#
+# ⚡ Performance:
+# - Cards are fetched concurrently (capped by a semaphore) over one pooled
+#   HTTP client, so startup takes about as long as the slowest agent instead
+#   of the sum of all of them
+# - Cards are cached in memory per URL. A cached card is reused while its
+#   Cache-Control max-age lasts, then revalidated with If-None-Match (a 304
+#   reply only refreshes its lifetime)
+# - If an agent can't be reached, its last known card is kept (stale) rather
+#   than dropped
+# - `start_refresh()` revalidates expired cards in the background
+#
+# 🔁 Hot reload:
+# - The background refresh also watches the registry file (mtime + size)
+#   and applies edits right away: new URLs are discovered, removed URLs are
+#   dropped from the cache and from the returned card list
+#
+# 💾 Snapshot:
+# - With `snapshot_file`, the last good card set is saved to disk (written
+#   to a temp file, then renamed over the old one, so it is never half
+#   written). `load_snapshot()` reads it back, so a process can start with
+#   the cards it knew last time, even if some agents are down, and then
+#   revalidate them in the background
 # =============================================================================
 
 import os                            # os provides functions for interacting with the operating system, such as file paths
+import re                            # Parses max-age out of Cache-Control headers
 import json                          # json allows encoding and decoding JSON data
+import time                          # Monotonic clock for cache expiry
+import asyncio                       # Concurrent fetches and the background refresh task
 import logging                       # logging is used to record warning/error/info messages
-from typing import List             # List is a type hint for functions that return lists
+import tempfile                      # Temp file for atomic snapshot writes
+from dataclasses import dataclass    # Cache entries
+from typing import Callable, List   # List is a type hint for functions that return lists
 
 import httpx                         # httpx is an async HTTP client library for sending requests
 from models.agent import AgentCard   # AgentCard is a Pydantic model representing an agent's metadata
@@ -18,6 +46,21 @@ from models.agent import AgentCard   # AgentCard is a Pydantic model representin
 # Create a named logger for this module; __name__ is the module's name
 logger = logging.getLogger(__name__)
 
+MAX_AGE = re.compile(r"max-age\s*=\s*(\d+)")
+
+
+def card_url(base_url: str) -> str:
+    """Normalize an agent's base URL (remove trailing slash) and append the discovery path."""
+    return base_url.rstrip("/") + "/.well-known/agent.json"
+
+
+@dataclass
+class CachedCard:
+    """One cached discovery response."""
+    card: AgentCard
+    etag: str | None          # Validator sent back as If-None-Match
+    expires_at: float         # time.monotonic() after which the card must be revalidated
+
 
 class DiscoveryClient:
     """
@@ -29,13 +72,25 @@ class DiscoveryClient:
         base_urls (List[str]): Loaded list of agent base URLs.
     """
 
-    def __init__(self, registry_file: str = None):
+    def __init__(
+        self,
+        registry_file: str = None,
+        max_concurrency: int = 32,
+        timeout: float = 5.0,
+        default_ttl: float = 60.0,
+        snapshot_file: str | None = None,
+    ):
         """
         Initialize the DiscoveryClient.
 
         Args:
             registry_file (str, optional): Path to the registry JSON. If None,
                 defaults to 'agent_registry.json' in this utilities folder.
+            max_concurrency: Max discovery requests in flight at once
+            timeout: Per-request timeout in seconds
+            default_ttl: Seconds a card stays fresh when the agent sends no
+                Cache-Control max-age
+            snapshot_file: Where to save the last good card set (None = don't)
         """
         # If the caller provided a custom path, use it; otherwise, build the default path
         if registry_file:
@@ -49,8 +104,20 @@ class DiscoveryClient:
             )
 
         # Immediately load the registry file into memory
+        self._registry_signature = self._registry_stat()
         self.base_urls = self._load_registry()
 
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.default_ttl = default_ttl
+        self.snapshot_file = snapshot_file
+
+        self._cache: dict[str, CachedCard] = {}           # Discovery URL -> last good card
+        self._client: httpx.AsyncClient | None = None     # Created on first use
+        self._limit: asyncio.Semaphore | None = None      # Created on the event loop that uses it
+        self._refresher: asyncio.Task | None = None
+        self._snapshot: bytes | None = None               # Contents of the snapshot file as last read/written
+
     def _load_registry(self) -> List[str]:
         """
         Load and parse the registry JSON file into a list of URLs.
@@ -59,14 +126,7 @@ class DiscoveryClient:
             List[str]: The list of agent base URLs, or empty list on error.
         """
         try:
-            # Open the file at self.registry_file in read mode
-            with open(self.registry_file, "r") as f:
-                # Parse the entire file as JSON
-                data = json.load(f)
-            # Ensure the JSON is a list, not an object or other type
-            if not isinstance(data, list):
-                raise ValueError("Registry file must contain a JSON list of URLs.")
-            return data
+            return self._read_registry()
         except FileNotFoundError:
             # If the file doesn't exist, log a warning and return an empty list
             logger.warning(f"Registry file not found: {self.registry_file}")
@@ -76,33 +136,269 @@ class DiscoveryClient:
             logger.error(f"Error parsing registry file: {e}")
             return []
 
-    async def list_agent_cards(self) -> List[AgentCard]:
+    def _read_registry(self) -> List[str]:
+        """Parse the registry file; raises if it is missing or invalid."""
+        # Open the file at self.registry_file in read mode
+        with open(self.registry_file, "r") as f:
+            # Parse the entire file as JSON
+            data = json.load(f)
+        # Ensure the JSON is a list, not an object or other type
+        if not isinstance(data, list):
+            raise ValueError("Registry file must contain a JSON list of URLs.")
+        return data
+
+    def _registry_stat(self) -> tuple[int, int] | None:
+        """(mtime, size) of the registry file, or None if it doesn't exist."""
+        try:
+            stat = os.stat(self.registry_file)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def reload_registry(self) -> bool:
+        """
+        Re-read the registry file if it changed since it was last read.
+
+        Removed URLs are dropped from the card cache, so they disappear from
+        `list_agent_cards()`; added URLs are fetched by its next call. An
+        edit that leaves the file invalid (or deletes it) is ignored and the
+        current agents are kept.
+
+        Returns:
+            bool: True if the list of agent URLs changed.
+        """
+        signature = self._registry_stat()
+        if signature is None or signature == self._registry_signature:
+            return False
+        self._registry_signature = signature
+
+        try:
+            base_urls = self._read_registry()
+        except (OSError, ValueError) as e:        # json.JSONDecodeError is a ValueError
+            logger.warning(f"Ignoring invalid registry update in {self.registry_file}: {e}")
+            return False
+        if base_urls == self.base_urls:
+            return False
+
+        added = [url for url in base_urls if url not in self.base_urls]
+        removed = [url for url in self.base_urls if url not in base_urls]
+        for url in removed:
+            self._cache.pop(card_url(url), None)
+        self.base_urls = base_urls
+        logger.info(f"Registry {self.registry_file} reloaded: added {added}, removed {removed}")
+        return True
+
+    async def list_agent_cards(self, force: bool = False) -> List[AgentCard]:
         """
         Asynchronously fetch the discovery endpoint from each registered URL
         and parse the returned JSON into AgentCard objects.
 
+        Fetches run concurrently (at most `max_concurrency` at once); fresh
+        cached cards are returned without a request.
+
+        Args:
+            force: Revalidate every card, even the ones that are still fresh
+
+        Returns:
+            List[AgentCard]: Successfully retrieved agent cards, in registry order.
+        """
+        cards = await asyncio.gather(*(self.get_agent_card(base, force) for base in self.base_urls))
+        if self.snapshot_file:
+            self._save_snapshot()
+        # Drop the agents that couldn't be reached (and were never cached)
+        return [card for card in cards if card is not None]
+
+    async def get_agent_card(self, base_url: str, force: bool = False) -> AgentCard | None:
+        """
+        Return the AgentCard of the agent at `base_url`, from the cache while
+        it is fresh, otherwise from its /.well-known/agent.json endpoint.
+
+        Returns:
+            AgentCard | None: The card (possibly stale if the agent is down),
+            or None if it couldn't be fetched and was never cached.
+        """
+        url = card_url(base_url)
+        cached = self._cache.get(url)
+        if cached is not None and not force and time.monotonic() < cached.expires_at:
+            return cached.card
+
+        # Revalidate instead of re-downloading when we have a validator
+        headers = {"If-None-Match": cached.etag} if cached is not None and cached.etag else {}
+        try:
+            async with self._semaphore():
+                response = await self.client.get(url, headers=headers)
+
+            if response.status_code == 304 and cached is not None:
+                # Unchanged: keep the card, just extend its lifetime
+                cached.expires_at = self._expires_at(response)
+                return cached.card
+
+            # Raise an exception if the response status is 4xx or 5xx
+            response.raise_for_status()
+            # Validate the JSON bytes straight into an AgentCard
+            card = AgentCard.model_validate_json(response.content)
+
+        except Exception as e:
+            if cached is not None:
+                logger.warning(f"Failed to refresh agent card at {url}, keeping the cached one: {e}")
+                return cached.card
+            # If anything goes wrong, log which URL failed and why
+            logger.warning(f"Failed to discover agent at {url}: {e}")
+            return None
+
+        if "no-store" in response.headers.get("Cache-Control", ""):
+            self._cache.pop(url, None)
+        else:
+            self._cache[url] = CachedCard(card, response.headers.get("ETag"), self._expires_at(response))
+        return card
+
+    def _expires_at(self, response: httpx.Response) -> float:
+        """When a response stops being fresh, from its Cache-Control header."""
+        cache_control = response.headers.get("Cache-Control", "")
+        if "no-cache" in cache_control:
+            ttl = 0.0                                  # Cache, but revalidate on every use
+        elif (match := MAX_AGE.search(cache_control)) is not None:
+            ttl = float(match.group(1))
+        else:
+            ttl = self.default_ttl
+        return time.monotonic() + ttl
+
+    # -------------------------------------------------------------------------
+    # 💾 Snapshot of the last good card set
+    # -------------------------------------------------------------------------
+    def load_snapshot(self) -> List[AgentCard]:
+        """
+        Read the snapshot file and seed the cache with it.
+
+        The loaded cards count as expired, so the next `list_agent_cards()`
+        revalidates them (with their saved ETags, so unchanged cards cost a
+        304). Agents that are no longer in the registry are ignored.
+
         Returns:
-            List[AgentCard]: Successfully retrieved agent cards.
+            List[AgentCard]: The saved cards, in registry order (empty if
+            there is no usable snapshot).
         """
-        cards: List[AgentCard] = []  # Prepare an empty list to collect AgentCard instances
-
-        # Create a new AsyncClient and ensure it's closed when done
-        async with httpx.AsyncClient() as client:
-            # Iterate through each base URL in the registry
-            for base in self.base_urls:
-                # Normalize URL (remove trailing slash) and append the discovery path
-                url = base.rstrip("/") + "/.well-known/agent.json"
-                try:
-                    # Send a GET request to the discovery endpoint with a timeout
-                    response = await client.get(url, timeout=5.0)
-                    # Raise an exception if the response status is 4xx or 5xx
-                    response.raise_for_status()
-                    # Convert the JSON response into an AgentCard Pydantic model
-                    card = AgentCard.model_validate(response.json())
-                    # Add the valid AgentCard to our list
-                    cards.append(card)
-                except Exception as e:
-                    # If anything goes wrong, log which URL failed and why
-                    logger.warning(f"Failed to discover agent at {url}: {e}")
-        # Return the list of successfully fetched AgentCards
-        return cards
+        if not self.snapshot_file:
+            return []
+        try:
+            with open(self.snapshot_file, "rb") as f:
+                raw = f.read()
+            entries = {entry["url"]: entry for entry in json.loads(raw)["cards"]}
+            for url in map(card_url, self.base_urls):
+                if url in entries:
+                    card = AgentCard.model_validate(entries[url]["card"])
+                    self._cache[url] = CachedCard(card, entries[url].get("etag"), expires_at=0.0)
+        except FileNotFoundError:
+            return []
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable agent card snapshot {self.snapshot_file}: {e}")
+            return []
+
+        self._snapshot = raw
+        return [self._cache[url].card for url in map(card_url, self.base_urls) if url in self._cache]
+
+    def _save_snapshot(self):
+        """Write the cached cards of the registered agents, if they changed."""
+        entries = []
+        for url in map(card_url, self.base_urls):
+            if url in self._cache:
+                cached = self._cache[url]
+                entries.append({"url": url, "etag": cached.etag, "card": cached.card.model_dump(exclude_none=True)})
+        if not entries:
+            return                                   # Never replace a good snapshot with an empty one
+
+        raw = json.dumps({"cards": entries}, indent=2).encode()
+        if raw == self._snapshot:
+            return
+
+        # Write a temp file next to the snapshot, then atomically rename it over
+        # the old one: readers (and a crash) never see a half-written file
+        directory = os.path.dirname(os.path.abspath(self.snapshot_file))
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".agent_cards.", suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(raw)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.snapshot_file)
+            self._snapshot = raw
+        except OSError as e:
+            logger.warning(f"Could not save agent card snapshot {self.snapshot_file}: {e}")
+
+    # -------------------------------------------------------------------------
+    # 🔄 Background refresh
+    # -------------------------------------------------------------------------
+    def start_refresh(
+        self,
+        interval: float = 30.0,
+        on_change: Callable[[List[AgentCard]], None] | None = None,
+        watch_interval: float = 2.0,
+    ):
+        """
+        Revalidate expired cards right away, then every `interval` seconds,
+        in the background, so `list_agent_cards()` keeps answering from a
+        current cache. The registry file is checked every `watch_interval`
+        seconds and an edit triggers a refresh at once. Must be called from
+        a running event loop; `close()` stops it.
+
+        Args:
+            interval: Seconds between refreshes
+            on_change: Called with the card list after the first refresh and
+                whenever a later refresh returns different cards (including
+                agents added to or removed from the registry)
+            watch_interval: Seconds between checks of the registry file
+        """
+        if self._refresher is None or self._refresher.done():
+            self._refresher = asyncio.create_task(self._refresh_loop(interval, on_change, watch_interval))
+
+    async def _refresh_loop(
+        self,
+        interval: float,
+        on_change: Callable[[List[AgentCard]], None] | None,
+        watch_interval: float,
+    ):
+        previous = None
+        next_refresh = 0.0
+        while True:
+            try:
+                if self.reload_registry() or time.monotonic() >= next_refresh:
+                    next_refresh = time.monotonic() + interval
+                    cards = await self.list_agent_cards()
+                    if on_change is not None and cards != previous:
+                        on_change(cards)
+                    previous = cards
+            except Exception as e:
+                logger.warning(f"Agent card refresh failed: {e}")
+            await asyncio.sleep(min(interval, watch_interval))
+
+    # -------------------------------------------------------------------------
+    # 🔌 Pooled HTTP client and lifecycle
+    # -------------------------------------------------------------------------
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Return the shared pooled HTTP client, creating it on first use."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                # Every request goes to a different agent, so idle connections
+                # would never be reused; keeping none saves the pool from
+                # scanning them on every request
+                limits=httpx.Limits(max_connections=self.max_concurrency, max_keepalive_connections=0)
+            )
+        return self._client
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        if self._limit is None:
+            self._limit = asyncio.Semaphore(self.max_concurrency)
+        return self._limit
+
+    async def close(self):
+        """Stop the background refresh and close the HTTP client."""
+        if self._refresher is not None:
+            self._refresher.cancel()
+            await asyncio.gather(self._refresher, return_exceptions=True)
+            self._refresher = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        self._limit = None
@@ -0,0 +1,101 @@
+# utilities/hash_ring.py
+# =============================================================================
+# 🎯 Purpose:
+# Consistent hashing: maps keys (e.g., session IDs) to nodes (e.g., replica
+# URLs) so that the same key keeps landing on the same node, and adding or
+# removing a node only moves the keys that node gains or loses (about 1/N of
+# them) instead of reshuffling everything.
+#
+# - Each node is placed on the ring at `vnodes` pseudo-random points
+#   ("virtual nodes"), which evens out how many keys each node owns
+# - A key belongs to the first point clockwise from its own hash
+# - Hashes come from blake2b, so every process (and every restart) builds
+#   the same ring; Python's built-in hash() is randomized per process
+# =============================================================================
+
+import bisect                        # Binary search over the sorted ring points
+import hashlib                       # Stable 64-bit hashes
+from typing import Iterable, Iterator
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """
+    💍 Consistent-hash ring with virtual nodes.
+
+    Lookups are O(log(nodes × vnodes)); adding or removing a node rebuilds
+    the sorted point list (fine for the handful of replicas an agent has).
+    """
+
+    def __init__(self, nodes: Iterable[str] = (), vnodes: int = 160):
+        """
+        Args:
+            nodes: Initial nodes
+            vnodes: Points per node on the ring (more = more even spread)
+        """
+        self.vnodes = vnodes
+        self._nodes: set[str] = set()
+        self._points: list[int] = []           # Sorted hashes of every virtual node
+        self._owners: list[str] = []           # Node owning the point at the same index
+        for node in nodes:
+            self.add(node)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, node: str) -> bool:
+        return node in self._nodes
+
+    @property
+    def nodes(self) -> set[str]:
+        return set(self._nodes)
+
+    def add(self, node: str):
+        """Place `node` on the ring (no-op if it is already there)."""
+        if node in self._nodes:
+            return
+        self._nodes.add(node)
+        self._rebuild()
+
+    def remove(self, node: str):
+        """Take `node` off the ring; its keys move to the next nodes clockwise."""
+        if node not in self._nodes:
+            return
+        self._nodes.remove(node)
+        self._rebuild()
+
+    def _rebuild(self):
+        points = sorted(
+            (_hash(f"{node}#{i}"), node)
+            for node in self._nodes
+            for i in range(self.vnodes)
+        )
+        self._points = [point for point, _ in points]
+        self._owners = [node for _, node in points]
+
+    def get(self, key: str) -> str | None:
+        """The node that owns `key`, or None if the ring is empty."""
+        if not self._points:
+            return None
+        index = bisect.bisect(self._points, _hash(key)) % len(self._points)
+        return self._owners[index]
+
+    def walk(self, key: str) -> Iterator[str]:
+        """
+        Every node, in the order they take over `key`: its owner first, then
+        the next distinct nodes clockwise (the fallbacks if the owner is down).
+        """
+        if not self._points:
+            return
+        start = bisect.bisect(self._points, _hash(key))
+        seen: set[str] = set()
+        for offset in range(len(self._points)):
+            node = self._owners[(start + offset) % len(self._points)]
+            if node not in seen:
+                seen.add(node)
+                yield node
+                if len(seen) == len(self._nodes):
+                    return
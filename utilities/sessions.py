@@ -0,0 +1,35 @@
+# utilities/sessions.py
+# =============================================================================
+# 🎯 Purpose:
+# Chooses the ADK session backend for the LLM agents.
+#
+# - In memory (default): fastest, but a conversation only exists in the
+#   process that started it
+# - Database: every worker process reads and writes the same sessions, so an
+#   agent served by several processes keeps each conversation's context no
+#   matter which worker a request lands on (needs `pip install google-adk[db]`
+#   and, for SQLite, `aiosqlite`)
+# =============================================================================
+
+from google.adk.sessions import BaseSessionService, InMemorySessionService
+
+
+def build_session_service(session_db: str | None = None) -> BaseSessionService:
+    """
+    Return an ADK session service for `session_db`.
+
+    Args:
+        session_db: None for in-memory sessions, a SQLAlchemy URL
+            (e.g., "postgresql+asyncpg://host/db"), or a path to a SQLite file
+
+    Returns:
+        BaseSessionService – the session backend to hand to the ADK Runner
+    """
+    if not session_db:
+        return InMemorySessionService()
+
+    # Imported lazily: the database backend is an optional extra of google-adk
+    from google.adk.sessions import DatabaseSessionService
+
+    url = session_db if "://" in session_db else f"sqlite+aiosqlite:///{session_db}"
+    return DatabaseSessionService(db_url=url)
@@ -0,0 +1,83 @@
+# utilities/single_flight.py
+# =============================================================================
+# 🎯 Purpose:
+# Request coalescing ("single flight"): when several coroutines ask for the
+# same thing at the same time, only the first one starts the downstream call
+# and the others wait for its result.
+#
+# - A waiter that is cancelled simply stops waiting; the shared call keeps
+#   running for everyone else.
+# - Only when every waiter has gone away is the shared call cancelled too,
+#   so no capacity is spent on an answer nobody will read.
+# =============================================================================
+
+import asyncio                       # Tasks and shielding
+import logging                       # Debug logging of coalesced calls
+from typing import Any, Awaitable, Callable, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    """One in-flight downstream call and the number of coroutines waiting on it."""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    🛫 Shares one in-flight call between concurrent callers using the same key.
+
+    Counters are kept in `stats`: "calls" (downstream calls started) and
+    "coalesced" (callers that joined a call already in flight).
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, _Call] = {}
+        self.stats = {"calls": 0, "coalesced": 0}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the result of `fn()`, sharing it with every concurrent caller
+        that uses the same `key`.
+
+        Args:
+            key: Identifies identical requests (e.g., normalized query text)
+            fn: Zero-argument coroutine function that performs the call
+
+        Returns:
+            The shared call's result (or raises its exception)
+        """
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+            self.stats["calls"] += 1
+        else:
+            self.stats["coalesced"] += 1
+            logger.debug(f"Coalescing request into in-flight call: {key!r}")
+
+        call.waiters += 1
+        try:
+            # shield(): cancelling this waiter must not cancel the shared call
+            return await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            if call.waiters == 1 and not call.task.done():
+                # Last waiter gone: nobody needs the result anymore. Forget the
+                # call first, so a new caller starts a fresh one instead of
+                # joining the cancelled call (its done-callback runs later)
+                self._forget(key, call)
+                call.task.cancel()
+            raise
+        finally:
+            call.waiters -= 1
+
+    def _forget(self, key: Hashable, call: _Call):
+        if self._calls.get(key) is call:
+            del self._calls[key]